@@ -1,25 +1,47 @@
+import asyncio
+import logging
 import os
-from fasthtml.common import fast_app, serve, Div
-from monsterui.all import *
+import time
+import uuid
+from fasthtml.common import fast_app, serve, Div, Beforeware
+from starlette.responses import JSONResponse
+from starlette.middleware import Middleware
+from starlette.routing import Mount
+from monsterui.all import Theme
 
 # API routes
 from routes.api_update_policy import rt as update_policy_rt
 from routes.api_load_scenario import rt as load_scenario_rt
 from routes.data_export import rt as data_export_rt
+from routes.fragments import rt as fragments_rt
+from routes.stream import rt as stream_rt
+from routes.api_autorun import rt as autorun_rt
+from routes.api_charts import rt as charts_rt
+from routes.compression import CompressionMiddleware
+from routes.static_assets import ASSET_PREFIX, CHART_JS_VENDOR_PATH, STATIC_ASSETS
+from ui.components.layout import LAYOUT_ASSETS
 
 # Page routes
 from routes.dashboard import rt as dashboard_rt
 from routes.governance_lab import rt as governance_lab_rt
-from simulation import *
-from ui import *
 
 
 # Simulation environment & agent bootstrapping
-from simulation.environment import GLOBAL_ENVIRONMENT
+from simulation.environment import GLOBAL_ENVIRONMENT, Environment, bind_environment, close_history
+from simulation.content_generator import get_content_generator
+from simulation.content_worker import content_worker_for
+from simulation.session_pool import EnvironmentPool
 from simulation.agents.agent import Agent
 from simulation.agents.profile import AgentProfile
 from simulation.scenarios import load_scenario
 
+logger = logging.getLogger(__name__)
+
+# Ticks simulated on the session template at startup and replayed by each new
+# session under its own seed, so sessions open on an established run instead
+# of Day 0 (0 = start fresh)
+WARMUP_TICKS = int(os.getenv("SIMULATION_WARMUP_TICKS", "0"))
+
 
 def bootstrap_simulation(env, num_agents=5, default_scenario="Creator-First Platform"):
     """Initialize demo agents and load default scenario.
@@ -31,26 +53,85 @@ def bootstrap_simulation(env, num_agents=5, default_scenario="Creator-First Plat
     """
     if not env.agents:
         env.agents.extend(
-            [Agent(AgentProfile(id=i)) for i in range(num_agents)]
+            [Agent(AgentProfile(id=i, rng=env.rng)) for i in range(num_agents)]
         )
         # Load default scenario to apply initial agent traits
         load_scenario(env, default_scenario)
 
 
+def build_session_template():
+    """Pre-warmed environment that each new session's environment is copied from."""
+    env = Environment()
+    bootstrap_simulation(env)
+    if WARMUP_TICKS:
+        env.run(WARMUP_TICKS)
+    return env
+
+
+# One isolated simulation per browser session, created lazily from the template
+SESSION_POOL = EnvironmentPool(build_session_template)
+
+
+async def bind_session_environment(req, sess):
+    """Beforeware: make the session's own Environment the current one for this request."""
+    session_id = sess.get("sim_session")
+    if session_id is None:
+        session_id = sess["sim_session"] = uuid.uuid4().hex
+    # Misses copy, restore or spill environments; keep every lookup off the event loop
+    env = await asyncio.to_thread(SESSION_POOL.get, session_id)
+    bind_environment(env)
+    content_worker_for(env)
+
+
+STARTUP = {"started_at": time.time(), "ready_seconds": None, "error": None}
+
+
+def warm_start():
+    """Build the session template (plus warm-up ticks) and the static asset variants."""
+    started = time.perf_counter()
+    try:
+        SESSION_POOL.warm()
+        for path in (CHART_JS_VENDOR_PATH, *LAYOUT_ASSETS):
+            STATIC_ASSETS.asset(path)
+    except Exception as e:
+        # Requests still work: the template is retried lazily on the first session
+        STARTUP["error"] = str(e)
+        logger.exception("Warm start failed")
+        return
+    STARTUP["ready_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(f"Warm start finished in {STARTUP['ready_seconds']}s ({WARMUP_TICKS} warm-up ticks)")
+
+
+async def lifespan(app):
+    """Lifespan generator (FastHTML wraps it): warm up in the background so the server accepts connections (and /health) immediately."""
+    warmup = asyncio.create_task(asyncio.to_thread(warm_start))
+    yield
+    if not warmup.done():
+        warmup.cancel()
+    # Trajectory archive headers lag their files until closed
+    SESSION_POOL.close()
+    close_history(GLOBAL_ENVIRONMENT)
+
+
 # Create FastHTML app (don't bootstrap yet for Vercel)
 # Use a fixed secret key for Vercel (read-only filesystem)
 # In production, set SECRET_KEY environment variable in Vercel dashboard
 secret = os.getenv("SECRET_KEY", "vercel-demo-key-change-in-production-settings")
-app, rt = fast_app(hdrs=Theme.slate.headers(), secret_key=secret, key_fname=None)
+session_bind = Beforeware(
+    bind_session_environment,
+    skip=[r"/static/.*", r"/favicon\.ico", r".*\.(css|js|ico|png|svg|map)", r"/health"]
+)
+app, rt = fast_app(
+    hdrs=Theme.slate.headers(),
+    secret_key=secret,
+    key_fname=None,
+    before=session_bind,
+    middleware=[Middleware(CompressionMiddleware)],
+    lifespan=lifespan,
+)
 
-# Lazy bootstrap on first request (BEFORE route registration)
-@app.middleware("http")
-async def bootstrap_middleware(request, call_next):
-    """Bootstrap simulation on first request"""
-    if len(GLOBAL_ENVIRONMENT.agents) == 0:
-        bootstrap_simulation(GLOBAL_ENVIRONMENT)
-    response = await call_next(request)
-    return response
+# Fingerprinted assets must match before fast_app's catch-all static file route
+app.router.routes.insert(0, Mount(ASSET_PREFIX, app=STATIC_ASSETS))
 
 # Register all APIRouters with the app using FastHTML's .to_app() method
 for router in [
@@ -58,6 +139,10 @@ for router in [
     update_policy_rt,
     load_scenario_rt,
     data_export_rt,
+    fragments_rt,
+    stream_rt,
+    autorun_rt,
+    charts_rt,
     # Page routes
     dashboard_rt,
     governance_lab_rt,
@@ -65,10 +150,30 @@ for router in [
     router.to_app(app)
 
 
-# Health-check endpoint
+# Health-check endpoint: 503 until the session template is built, by the warm start
+# or lazily by the first session after a failed one (then reported as degraded)
 @rt("/health") 
 def health():
-    return {"status": "ok"}
+    ready = SESSION_POOL.ready
+    if not ready:
+        status = "starting"
+    elif STARTUP["error"]:
+        status = "degraded"
+    else:
+        status = "ok"
+    body = {
+        "status": status,
+        "ready": ready,
+        "warmup_ticks": WARMUP_TICKS,
+        "ready_seconds": STARTUP["ready_seconds"],
+        "uptime_seconds": round(time.time() - STARTUP["started_at"], 1),
+        "sessions": SESSION_POOL.stats()["environments"],
+        "content_cache": get_content_generator().cache.stats(),
+        "content_breaker": get_content_generator().breaker.stats(),
+    }
+    if STARTUP["error"]:
+        body["error"] = STARTUP["error"]
+    return JSONResponse(body, status_code=200 if ready else 503)
 
 # Dev root fallback
 @rt("/dev", methods=["GET"])
@@ -0,0 +1,64 @@
+from fasthtml.common import APIRouter, Response
+from simulation.environment import current_environment
+from simulation.runner import runner_for
+from routes.api_update_policy import MAX_RUN_TICKS
+from routes.stream import broadcaster_for
+from ui.components import autorun_controls
+
+rt = APIRouter()
+
+
+def _status_response(req, runner):
+    """Controls fragment for HTMX requests, JSON status otherwise."""
+    status = {**runner.status(), "stream": broadcaster_for(runner.env).stats()}
+    if req.headers.get("hx-request"):
+        return autorun_controls(status)
+    return status
+
+@rt("/api/autorun/status")
+def autorun_status(req):
+    """Loop state, achieved ticks/second, lag and stream frame stats."""
+    runner = runner_for(current_environment())
+    return _status_response(req, runner)
+
+@rt("/api/autorun/start", methods=["POST"])
+async def autorun_start(req, ticks_per_second: float = None):
+    """Start advancing the simulation in the background."""
+    runner = runner_for(current_environment())
+    if ticks_per_second is not None:
+        try:
+            runner.set_speed(ticks_per_second)
+        except ValueError as e:
+            return Response(str(e), status_code=400)
+    runner.start()
+    return _status_response(req, runner)
+
+@rt("/api/autorun/pause", methods=["POST"])
+async def autorun_pause(req):
+    """Stop the background loop."""
+    runner = runner_for(current_environment())
+    runner.pause()
+    return _status_response(req, runner)
+
+@rt("/api/autorun/step", methods=["POST"])
+async def autorun_step(req, ticks: int = 1):
+    """Run a number of ticks now (in a worker thread).
+
+    Args:
+        ticks: Number of ticks to run (1 to MAX_RUN_TICKS)
+    """
+    if not 1 <= ticks <= MAX_RUN_TICKS:
+        return Response(f"ticks must be between 1 and {MAX_RUN_TICKS}", status_code=400)
+    runner = runner_for(current_environment())
+    await runner.step(ticks)
+    return _status_response(req, runner)
+
+@rt("/api/autorun/speed", methods=["POST"])
+async def autorun_speed(req, ticks_per_second: float):
+    """Change the target rate (0 = as fast as possible)."""
+    runner = runner_for(current_environment())
+    try:
+        runner.set_speed(ticks_per_second)
+    except ValueError as e:
+        return Response(str(e), status_code=400)
+    return _status_response(req, runner)
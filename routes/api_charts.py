@@ -0,0 +1,211 @@
+"""
+Chart data API.
+
+Pages render bare `<canvas data-chart=...>` elements and `charts.js` fetches
+each chart's series from `/api/charts/<name>`. Payloads are compact JSON
+built once per simulation state (cached on the environment snapshot) and
+served with an ETag; URLs that carry the current version (`?v=`) may be
+cached by the browser indefinitely, since any change produces a new version.
+"""
+
+import json
+import statistics
+import threading
+import weakref
+
+from fasthtml.common import APIRouter, Response
+from simulation.actor import current_snapshot
+from simulation.trait_summary import trait_summaries
+from ui.render_cache import version_tag
+
+rt = APIRouter()
+
+PRECISION = 4  # Decimal places kept in chart payloads
+HISTOGRAM_BINS = 10
+SPARKLINE_POINTS = 10
+
+REGIME_COLORS = {
+    "differential": "rgb(34, 197, 94)",
+    "intermittent": "rgb(239, 68, 68)",
+    "hybrid": "rgb(59, 130, 246)",
+}
+
+
+def _round(values):
+    return [round(v, PRECISION) for v in values]
+
+
+# ---------------------------------------------------------
+# Payload builders (one per chart, all read a snapshot)
+# ---------------------------------------------------------
+def _health_gauge(snapshot):
+    scores = snapshot.history.get("health_score", ())
+    return {
+        "current": round(scores[-1], PRECISION) if scores else 0.5,
+        "previous": round(scores[-2], PRECISION) if len(scores) > 1 else None,
+    }
+
+
+def _trait_distributions(snapshot):
+    """Per-trait summary statistics and histogram (same size for any population)."""
+    return {
+        label: {key: round(value, PRECISION) if isinstance(value, float) else value
+                for key, value in summary.items()}
+        for label, summary in trait_summaries(snapshot.agents, bins=HISTOGRAM_BINS).items()
+    }
+
+
+def _histogram(values, bins=HISTOGRAM_BINS):
+    """Equal-width bins over [min, max], last bin inclusive (as charts.js bins raw data)."""
+    if not values:
+        return {"labels": [], "counts": []}
+    low, high = min(values), max(values)
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        index = int((value - low) / width) if width else bins - 1
+        counts[min(index, bins - 1)] += 1
+    return {"labels": [f"{low + i * width:.2f}" for i in range(bins)], "counts": counts}
+
+
+def _reward_characteristics(snapshot):
+    # Read by index: a memoryview of the live arrays would block the writer's appends
+    rows = snapshot.history_columns.iter_rows(tick_to=snapshot.tick_count, columns=("final_reward",))
+    rewards = [row[0] for row in rows]
+    avg_reward = sum(rewards) / len(rewards) if rewards else 0
+    variance = sum((r - avg_reward) ** 2 for r in rewards) / len(rewards) if rewards else 0
+    return {
+        "histogram": _histogram(rewards),
+        "avg_reward": round(avg_reward, PRECISION),
+        "variance": round(variance, PRECISION),
+        "predictability": round(1 - min(variance, 1), PRECISION),  # Simple predictability metric
+    }
+
+
+class _TransitionCounts:
+    """State-transition counts of one run, advanced by the ticks added since the last request."""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.tick = 0  # Last tick counted
+        self.last_state = {}  # agent id -> state at `tick`
+        self.counts = {}
+        self.lock = threading.Lock()
+
+
+_TRANSITIONS = weakref.WeakKeyDictionary()  # history store -> _TransitionCounts
+_TRANSITIONS_LOCK = threading.Lock()
+
+
+def _state_transitions(snapshot):
+    store = snapshot.history_columns
+    with _TRANSITIONS_LOCK:
+        memo = _TRANSITIONS.get(store)
+        # A new run, or an older snapshot than the one counted, starts over
+        if memo is None or memo.run_id != snapshot.run_id or memo.tick > snapshot.tick_count:
+            memo = _TRANSITIONS[store] = _TransitionCounts(snapshot.run_id)
+    with memo.lock:
+        rows = store.iter_rows(
+            tick_from=memo.tick + 1, tick_to=snapshot.tick_count, columns=("agent_id", "state")
+        )
+        for agent_id, to_state in rows:
+            from_state = memo.last_state.get(agent_id)
+            memo.last_state[agent_id] = to_state
+            if from_state is not None and from_state != to_state:
+                key = f"{from_state}->{to_state}"
+                memo.counts[key] = memo.counts.get(key, 0) + 1
+        memo.tick = max(memo.tick, snapshot.tick_count)
+        return dict(memo.counts)
+
+
+def _correlation(x, y):
+    n = min(len(x), len(y))
+    if n < 2:
+        return 0
+    x, y = x[:n], y[:n]
+    mean_x = sum(x) / n
+    mean_y = sum(y) / n
+    numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(n))
+    denom_x = sum((x[i] - mean_x) ** 2 for i in range(n)) ** 0.5
+    denom_y = sum((y[i] - mean_y) ** 2 for i in range(n)) ** 0.5
+    return numerator / (denom_x * denom_y) if denom_x and denom_y else 0
+
+
+def _correlations(snapshot):
+    history = snapshot.history
+    series = {
+        "Burnout": history.get("avg_burnout", ()),
+        "Addiction": history.get("avg_addiction", ()),
+        "Resilience": history.get("avg_resilience", ()),
+        "Arousal": history.get("avg_arousal", ()),
+    }
+    names = list(series)
+    return {
+        f"{a}_{b}": round(_correlation(series[a], series[b]), PRECISION)
+        for i, a in enumerate(names) for b in names[i + 1:]
+    }
+
+
+def _reward_timeline(snapshot):
+    ticks = list(snapshot.history.get("ticks", ()))
+    rewards = _round(snapshot.history.get("avg_reward", ()))
+    mean_reward = statistics.mean(rewards) if rewards else 0
+    regime = snapshot.summary().get("current_regime", "unknown")
+    return {
+        "ticks": ticks,
+        "rewards": rewards,
+        "mean": round(mean_reward, PRECISION),
+        "color": REGIME_COLORS.get(regime, "rgb(107, 114, 128)"),
+    }
+
+
+def _sparklines(snapshot):
+    """Last SPARKLINE_POINTS burnout and reward values per agent, keyed by agent id."""
+    return {
+        str(agent.profile.id): {
+            "burnout": _round(snapshot.agent_series(agent, "burnout", last=SPARKLINE_POINTS)),
+            "reward": _round(snapshot.agent_series(agent, "final_reward", last=SPARKLINE_POINTS)),
+        }
+        for agent in snapshot.agents if agent.ticks_recorded >= 2
+    }
+
+
+CHARTS = {
+    "health-gauge": _health_gauge,
+    "trait-distributions": _trait_distributions,
+    "reward-characteristics": _reward_characteristics,
+    "state-transitions": _state_transitions,
+    "correlations": _correlations,
+    "reward-timeline": _reward_timeline,
+    "sparklines": _sparklines,
+}
+
+
+@rt("/api/charts/{name}")
+def chart_data(req, name: str, v: str = None):
+    """Compact JSON series for one chart.
+
+    Args:
+        name: Chart name (see CHARTS)
+        v: Version tag from `ui.render_cache.chart_url`; a current tag allows long-lived caching
+    """
+    build = CHARTS.get(name)
+    if build is None:
+        return Response(f"Unknown chart: {name}. Available: {', '.join(CHARTS)}", status_code=404)
+
+    snapshot = current_snapshot()
+    tag = version_tag(snapshot)
+    etag = f'"{name}-{tag}"'
+    headers = {
+        "ETag": etag,
+        # Versioned URLs never change content; others must revalidate (per-session data)
+        "Cache-Control": "private, max-age=31536000, immutable" if v == tag else "private, no-cache",
+    }
+    if req.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    key = ("chart", name)
+    body = snapshot.renders.get(key)
+    if body is None:
+        body = snapshot.renders[key] = json.dumps(build(snapshot), separators=(",", ":"))
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,27 +1,30 @@
 from fasthtml.common import APIRouter
 from simulation.scenarios import load_scenario, ALL_SCENARIOS
-from simulation.environment import GLOBAL_ENVIRONMENT
-from ui.pages.dashboard import DashboardPage
+from simulation.actor import actor_for
+from simulation.environment import current_environment
+from ui.pages.dashboard import DashboardFragments
 from ui.pages.governance_lab import GovernanceLabPage
 
 rt = APIRouter()
 
 @rt("/scenarios/load", methods=["POST"])
-def load_scenario_route(scenario: str, source: str = "dashboard"):
+def load_scenario_route(req, scenario: str, source: str = "dashboard"):
     """Load a scenario and return updated page content.
     
     Called via HTMX from scenario_selector buttons.
-    Returns the appropriate page based on source parameter.
+    Returns the governance page, or the changed dashboard fragments
+    (including the scenario selector) based on source parameter.
     
     Args:
         scenario: Name of the scenario to load
         source: Either 'dashboard' or 'governance' to determine which page to return
     """
     if scenario in ALL_SCENARIOS:
-        load_scenario(GLOBAL_ENVIRONMENT, scenario)
+        env = current_environment()
+        actor_for(env).call(load_scenario, env, scenario)
     
     # Return the appropriate page based on where the request came from
     if source == "governance":
         return GovernanceLabPage()
     else:
-        return DashboardPage()
\ No newline at end of file
+        return DashboardFragments(include_selector=True, shown=req.headers.get("x-dashboard-shown"))
\ No newline at end of file
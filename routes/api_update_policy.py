@@ -1,11 +1,20 @@
-from fasthtml.common import APIRouter
-from simulation.environment import GLOBAL_ENVIRONMENT
+import asyncio
+import json
+import time
+from dataclasses import replace
+from fasthtml.common import APIRouter, HTMLResponse, Response, to_xml
+from simulation.actor import actor_for
+from simulation.environment import current_environment
 from simulation.policy_engine.config import PolicyConfig, get_preset
-from ui.pages.dashboard import DashboardPage
+from simulation.tick_queue import TickQueueFull, tick_queue_for
+from ui.pages.dashboard import DashboardFragments
 from ui.pages.governance_lab import GovernanceLabPage
+from ui.components import fast_forward_controls
 
 rt = APIRouter()
 
+MAX_RUN_TICKS = 10000  # Upper bound for a single /api/run request
+
 @rt("/api/update-policy", methods=["POST"])
 def update_policy(
     quality_weight: float = None,
@@ -20,44 +29,94 @@ def update_policy(
     intermittent_variance: float = None,
 ):
     """Update policy configuration and return updated governance lab content."""
-    cfg = GLOBAL_ENVIRONMENT.policy_engine.config
+    env = current_environment()
 
     # Update only provided parameters
-    if quality_weight is not None:
-        cfg.quality_weight = quality_weight
-    if diversity_weight is not None:
-        cfg.diversity_weight = diversity_weight
-    if consistency_weight is not None:
-        cfg.consistency_weight = consistency_weight
-    if volume_weight is not None:
-        cfg.volume_weight = volume_weight
-    if break_reward is not None:
-        cfg.break_reward = break_reward
-    if burnout_penalty is not None:
-        cfg.burnout_penalty = burnout_penalty
-    if sustainability_bonus is not None:
-        cfg.sustainability_bonus = sustainability_bonus
-    if baseline_guarantee is not None:
-        cfg.baseline_guarantee = baseline_guarantee
-    if intermittent_probability is not None:
-        cfg.intermittent_probability = intermittent_probability
-    if intermittent_variance is not None:
-        cfg.intermittent_variance = intermittent_variance
+    changes = {
+        "quality_weight": quality_weight,
+        "diversity_weight": diversity_weight,
+        "consistency_weight": consistency_weight,
+        "volume_weight": volume_weight,
+        "break_reward": break_reward,
+        "burnout_penalty": burnout_penalty,
+        "sustainability_bonus": sustainability_bonus,
+        "baseline_guarantee": baseline_guarantee,
+        "intermittent_probability": intermittent_probability,
+        "intermittent_variance": intermittent_variance,
+    }
+    changes = {name: value for name, value in changes.items() if value is not None}
+
+    def apply():
+        # Swap in a new config rather than mutating the one a tick may be reading
+        env.policy_engine.config = replace(env.policy_engine.config, **changes)
 
-    GLOBAL_ENVIRONMENT.policy_engine.config = cfg
+    actor_for(env).call(apply)
     return GovernanceLabPage()
 
 @rt("/api/tick", methods=["POST"])
-def run_tick():
-    """Run a single simulation tick and return updated dashboard."""
-    GLOBAL_ENVIRONMENT.tick()
-    return DashboardPage()
+async def run_tick(req):
+    """Run a simulation tick and return the changed dashboard fragments.
+    
+    Tick requests that arrive while another is waiting or running are coalesced
+    into one batch; the X-Ticks-Applied header reports the batch size. When too
+    many ticks are already waiting the request is refused with 429 and a
+    Retry-After header.
+    """
+    env = current_environment()
+    try:
+        batch = tick_queue_for(env).request()
+    except TickQueueFull as e:
+        return Response(str(e), status_code=429, headers={"Retry-After": str(e.retry_after)})
+    ticks = await asyncio.wrap_future(batch)
+    shown = req.headers.get("x-dashboard-shown")
+    # Render off the event loop (the snapshot may wait for the writer thread)
+    html = await asyncio.to_thread(lambda: to_xml(DashboardFragments(shown=shown)))
+    return HTMLResponse(html, headers={"X-Ticks-Applied": str(ticks)})
+
+@rt("/api/run", methods=["POST"])
+async def run_ticks(req, ticks: int = 100):
+    """Run N ticks in one request and render the dashboard fragments once at the end.
+    
+    Ticks run on the environment's writer thread without text generation. HTMX requests get the
+    dashboard fragments plus the timing readout; other clients get JSON timing.
+    Both carry a Server-Timing header.
+    
+    Args:
+        ticks: Number of ticks to run (1 to MAX_RUN_TICKS)
+    """
+    if not 1 <= ticks <= MAX_RUN_TICKS:
+        return Response(f"ticks must be between 1 and {MAX_RUN_TICKS}", status_code=400)
+    
+    env = current_environment()
+    started = time.perf_counter()
+    await actor_for(env).run(env.run, ticks)
+    simulate_ms = (time.perf_counter() - started) * 1000
+    timing = {
+        "ticks": ticks,
+        "tick": env.tick_count,
+        "simulate_ms": round(simulate_ms, 2),
+        "ticks_per_second": round(ticks / simulate_ms * 1000, 1) if simulate_ms else 0.0,
+    }
+    
+    if not req.headers.get("hx-request"):
+        headers = {"Server-Timing": f"simulate;dur={simulate_ms:.2f}"}
+        return Response(json.dumps(timing), media_type="application/json", headers=headers)
+    
+    started = time.perf_counter()
+    shown = req.headers.get("x-dashboard-shown")
+    # Render off the event loop, as /api/tick does
+    html = await asyncio.to_thread(lambda: to_xml(DashboardFragments(shown=shown)))
+    timing["render_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    html += to_xml(fast_forward_controls(ticks, timing)(hx_swap_oob="true"))
+    headers = {"Server-Timing": f"simulate;dur={simulate_ms:.2f}, render;dur={timing['render_ms']:.2f}"}
+    return HTMLResponse(html, headers=headers)
 
 @rt("/api/reset", methods=["POST"])
-def reset_simulation():
-    """Reset the simulation and return updated dashboard."""
-    GLOBAL_ENVIRONMENT.reset_full_state()
-    return DashboardPage()
+def reset_simulation(req):
+    """Reset the simulation and return the changed dashboard fragments."""
+    env = current_environment()
+    actor_for(env).call(env.reset_full_state)
+    return DashboardFragments(shown=req.headers.get("x-dashboard-shown"))
 
 @rt("/api/load-preset", methods=["POST"])
 def load_preset(preset: str):
@@ -68,7 +127,8 @@ def load_preset(preset: str):
     """
     try:
         preset_config = get_preset(preset)
-        GLOBAL_ENVIRONMENT.policy_engine.config = preset_config
+        env = current_environment()
+        actor_for(env).call(setattr, env.policy_engine, "config", preset_config)
         return GovernanceLabPage()
     except ValueError as e:
         # If invalid preset, just return current page
@@ -1,69 +1,285 @@
 from fasthtml.common import APIRouter
-from simulation.environment import GLOBAL_ENVIRONMENT
+from simulation.actor import actor_for, current_snapshot
+from simulation.environment import current_environment
 import json
 import csv
+import zlib
 from io import StringIO
 from fasthtml.common import Response
+from starlette.responses import StreamingResponse
+from simulation import arrow_export
+from simulation.content_store import content_store_for
+from simulation.history import COLUMN_NAMES
+from routes.export_cache import EXPORT_CACHE
 
 rt = APIRouter()
 
+ARROW_UNAVAILABLE_MESSAGE = "Columnar export requires pyarrow (pip install pyarrow)."
+EXPORT_CHUNK_ROWS = 1000  # Rows per streamed block
+
+
+def _parse_list(value, cast=str):
+    """Parse a comma-separated query parameter into a list (None if empty)."""
+    if not value:
+        return None
+    return [cast(v.strip()) for v in value.split(",") if v.strip()]
+
+def _encode_chunks(chunks, gzip=False):
+    """Encode a stream of text chunks as UTF-8 bytes, optionally gzipped incrementally."""
+    if not gzip:
+        for chunk in chunks:
+            yield chunk.encode("utf-8")
+        return
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _unsupported_compression(compression, allowed):
+    """400 response for a codec the format does not support (None if it is supported)."""
+    if compression in allowed:
+        return None
+    return Response(
+        f"Unsupported compression: {compression}. Available: {', '.join(allowed)}",
+        status_code=400
+    )
+
+def _cached_export(req, fmt, filters, filename, media_type, produce, download=True, snapshot=None):
+    """Serve an export through the on-disk cache, keyed by data version and filters."""
+    snapshot = snapshot or current_snapshot()
+    key = EXPORT_CACHE.key(fmt, snapshot.data_version(), filters)
+    return EXPORT_CACHE.respond(req, key, filename, media_type, produce, download=download)
+
+def _csv_chunks(store, tick_from, tick_to, agent_ids, columns):
+    """Yield CSV text in blocks of EXPORT_CHUNK_ROWS rows."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for i, row in enumerate(store.iter_rows(tick_from, tick_to, agent_ids, columns), 1):
+        writer.writerow(row)
+        if i % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _json_chunks(store, agents, tick_from, tick_to, agent_ids, columns):
+    """Yield a JSON array of per-agent history arrays, one entry at a time.
+
+    Entries come from the columnar history (or trajectory archive), not from
+    `agent.history`, which may only hold the most recent ticks.
+    """
+    wanted = set(agent_ids) if agent_ids is not None else None
+    yield "["
+    first_agent = True
+    for agent in agents:
+        agent_id = agent.profile.id
+        if wanted is not None and agent_id not in wanted:
+            continue
+        yield "[" if first_agent else ",["
+        first_agent = False
+        first_entry = True
+        for row in store.agent_rows(agent_id, tick_from, tick_to, columns):
+            entry = json.dumps(dict(zip(columns, row)))
+            yield entry if first_entry else "," + entry
+            first_entry = False
+        yield "]"
+    yield "]"
+
+def _jsonl_chunks(posts):
+    """Yield JSON lines in blocks of EXPORT_CHUNK_ROWS posts."""
+    lines = []
+    for post in posts:
+        lines.append(json.dumps(post, default=str))
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
 @rt("/export/json")
-def export_json():
-    data = [a.history for a in GLOBAL_ENVIRONMENT.agents]
-    return Response(json.dumps(data), media_type="application/json")
+def export_json(
+    req,
+    tick_from: int = None,
+    tick_to: int = None,
+    agent_ids: str = None,
+    columns: str = None,
+    gzip: bool = False,
+):
+    """Stream per-agent history as JSON (one array of entries per agent).
+
+    Args:
+        tick_from: First tick to include (inclusive)
+        tick_to: Last tick to include (inclusive)
+        agent_ids: Comma-separated agent ids to include
+        columns: Comma-separated column names to keep in each entry (default: all columns)
+        gzip: Return a gzip-compressed download
+    """
+    try:
+        ids = _parse_list(agent_ids, int)
+    except ValueError:
+        return Response("agent_ids must be comma-separated integers", status_code=400)
+    selected = _parse_list(columns) or list(COLUMN_NAMES)
+    unknown = [c for c in selected if c not in COLUMN_NAMES]
+    if unknown:
+        return Response(
+            f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(COLUMN_NAMES)}",
+            status_code=400
+        )
+    snapshot = current_snapshot()
+    store = snapshot.history_columns
+    # The store keeps growing while we stream; stop at the snapshot's tick
+    last_tick = snapshot.tick_count if tick_to is None else min(tick_to, snapshot.tick_count)
+
+    def produce():
+        return _encode_chunks(_json_chunks(store, snapshot.agents, tick_from, last_tick, ids, selected), gzip)
+
+    filters = (tick_from, tick_to, ids, selected, gzip)
+    if gzip:
+        return _cached_export(req, "json", filters, "platform_capitalism_data.json.gz", "application/gzip", produce,
+                              snapshot=snapshot)
+    return _cached_export(req, "json", filters, "platform_capitalism_data.json", "application/json", produce,
+                          download=False, snapshot=snapshot)
 
 @rt("/export/csv")
-def export_csv():
-    """Export comprehensive simulation data as downloadable CSV."""
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Comprehensive header with all key metrics
-    writer.writerow([
-        "agent_id",
-        "tick",
-        "state",
-        "strategy",
-        "final_reward",
-        "cpm_earnings",
-        "posts_generated",
-        "burnout",
-        "addiction_drive",
-        "emotional_resilience",
-        "arousal_level",
-        "quality",
-        "diversity",
-        "consistency",
-        "action_taken"
-    ])
-
-    # Export all agent history
-    for agent in GLOBAL_ENVIRONMENT.agents:
-        for entry in agent.history:
-            writer.writerow([
-                agent.profile.id,
-                entry.get("tick", 0),
-                entry.get("state", "UNKNOWN"),
-                entry.get("strategy", "unknown"),
-                entry.get("final_reward", 0),
-                entry.get("cpm_earnings", 0),
-                entry.get("posts_generated", 0),
-                entry.get("burnout", 0),
-                entry.get("addiction_drive", 0),
-                entry.get("emotional_resilience", 0),
-                entry.get("arousal_level", 0),
-                entry.get("quality", 0),
-                entry.get("diversity", 0),
-                entry.get("consistency", 0),
-                entry.get("action_taken", "")
-            ])
-
-    # Return with proper download headers
-    csv_data = output.getvalue()
-    return Response(
-        csv_data,
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=platform_capitalism_data.csv"
-        }
-    )
\ No newline at end of file
+def export_csv(
+    req,
+    tick_from: int = None,
+    tick_to: int = None,
+    agent_ids: str = None,
+    columns: str = None,
+    gzip: bool = False,
+):
+    """Stream comprehensive simulation data as a downloadable CSV.
+
+    Rows are emitted tick by tick from the columnar history, so the download
+    starts immediately and memory use doesn't grow with the run length.
+    Repeat downloads of the same tick are served from the export cache.
+
+    Args:
+        tick_from: First tick to include (inclusive)
+        tick_to: Last tick to include (inclusive)
+        agent_ids: Comma-separated agent ids to include
+        columns: Comma-separated column names (default: all columns)
+        gzip: Return a gzip-compressed download
+    """
+    try:
+        ids = _parse_list(agent_ids, int)
+    except ValueError:
+        return Response("agent_ids must be comma-separated integers", status_code=400)
+    selected = _parse_list(columns) or list(COLUMN_NAMES)
+    unknown = [c for c in selected if c not in COLUMN_NAMES]
+    if unknown:
+        return Response(
+            f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(COLUMN_NAMES)}",
+            status_code=400
+        )
+
+    snapshot = current_snapshot()
+    store = snapshot.history_columns
+    # The store keeps growing while we stream; stop at the snapshot's tick
+    last_tick = snapshot.tick_count if tick_to is None else min(tick_to, snapshot.tick_count)
+
+    def produce():
+        return _encode_chunks(_csv_chunks(store, tick_from, last_tick, ids, selected), gzip)
+
+    filters = (tick_from, tick_to, ids, selected, gzip)
+    if gzip:
+        return _cached_export(req, "csv", filters, "platform_capitalism_data.csv.gz", "application/gzip", produce,
+                              snapshot=snapshot)
+    return _cached_export(req, "csv", filters, "platform_capitalism_data.csv", "text/csv", produce,
+                          snapshot=snapshot)
+
+@rt("/export/parquet")
+def export_parquet(req, chunk_ticks: int = arrow_export.DEFAULT_CHUNK_TICKS, compression: str = "zstd"):
+    """Export full agent trajectories as typed, compressed Parquet.
+
+    Each row group covers `chunk_ticks` ticks. The run seed and PolicyConfig
+    are stored in the file's schema metadata.
+    """
+    if not arrow_export.ARROW_AVAILABLE:
+        return Response(ARROW_UNAVAILABLE_MESSAGE, status_code=501)
+    invalid = _unsupported_compression(compression, arrow_export.PARQUET_COMPRESSIONS)
+    if invalid:
+        return invalid
+
+    env = current_environment()
+    snapshot = current_snapshot()
+
+    def produce():
+        # Built on the writer thread: a tick appending mid-export would resize
+        # the arrays Arrow is reading zero-copy. Rows and metadata come from the
+        # snapshot the cache key and ETag name, not from later ticks.
+        yield actor_for(env).call(
+            arrow_export.to_bytes, arrow_export.write_parquet, snapshot,
+            chunk_ticks=chunk_ticks, compression=compression, tick_to=snapshot.tick_count
+        )
+
+    return _cached_export(
+        req, "parquet", (chunk_ticks, compression),
+        "platform_capitalism_data.parquet", "application/vnd.apache.parquet", produce,
+        snapshot=snapshot
+    )
+
+@rt("/export/arrow")
+def export_arrow(req, chunk_ticks: int = arrow_export.DEFAULT_CHUNK_TICKS, compression: str = None):
+    """Export full agent trajectories as an Arrow IPC stream.
+
+    Uncompressed by default so readers can map the buffers zero-copy;
+    pass `compression=zstd` or `compression=lz4` for a smaller download.
+    """
+    if not arrow_export.ARROW_AVAILABLE:
+        return Response(ARROW_UNAVAILABLE_MESSAGE, status_code=501)
+    if compression:
+        invalid = _unsupported_compression(compression, arrow_export.ARROW_COMPRESSIONS)
+        if invalid:
+            return invalid
+
+    env = current_environment()
+    snapshot = current_snapshot()
+
+    def produce():
+        # Built on the writer thread: a tick appending mid-export would resize
+        # the arrays Arrow is reading zero-copy. Rows and metadata come from the
+        # snapshot the cache key and ETag name, not from later ticks.
+        yield actor_for(env).call(
+            arrow_export.to_bytes, arrow_export.write_arrow_stream, snapshot,
+            chunk_ticks=chunk_ticks, compression=compression or None, tick_to=snapshot.tick_count
+        )
+
+    return _cached_export(
+        req, "arrow", (chunk_ticks, compression),
+        "platform_capitalism_data.arrows", "application/vnd.apache.arrow.stream", produce,
+        snapshot=snapshot
+    )
+
+@rt("/export/posts")
+def export_posts(tick_from: int = None, tick_to: int = None, agent_ids: str = None, gzip: bool = False):
+    """Stream generated posts as JSON lines, oldest first.
+
+    Includes posts spilled out of memory by the content store. Not served
+    through the export cache: post text arrives after its tick, so the data
+    version does not identify it.
+
+    Args:
+        tick_from: First tick to include (inclusive)
+        tick_to: Last tick to include (inclusive)
+        agent_ids: Comma-separated agent ids to include
+        gzip: Return a gzip-compressed download
+    """
+    try:
+        ids = _parse_list(agent_ids, int)
+    except ValueError:
+        return Response("agent_ids must be comma-separated integers", status_code=400)
+    env = current_environment()
+    store = content_store_for(env)
+    # Captured on the writer thread, then streamed from here
+    posts = actor_for(env).call(store.posts, ids, tick_from, tick_to)
+    filename = "platform_capitalism_posts.jsonl.gz" if gzip else "platform_capitalism_posts.jsonl"
+    return StreamingResponse(
+        _encode_chunks(_jsonl_chunks(posts), gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -0,0 +1,193 @@
+"""
+On-disk cache for data exports.
+
+Exports are a pure function of the simulation's data version (run, tick,
+policy config version) and the request filters, so each build is written to
+disk once and re-served with an `ETag` / `Last-Modified` until the next tick.
+
+Cache misses still stream: the first requester's response is teed into the
+cache file as it is sent, and concurrent requesters for the same key wait
+for that build instead of starting their own. The build is settled when its
+response ends, however it ends (even if the client leaves before the first
+byte), so waiters are never left hanging on an abandoned build.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import formatdate, parsedate_to_datetime
+
+from fasthtml.common import Response
+from starlette.responses import FileResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_DIR = os.getenv(
+    "EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "platform_capitalism_exports")
+)
+EXPORT_CACHE_MAX_FILES = 32
+BUILD_WAIT_TIMEOUT = 60.0  # Seconds to wait on another requester's build
+
+
+class ExportCache:
+    """Disk cache with single-flight builds and conditional GET support."""
+
+    def __init__(self, directory=EXPORT_CACHE_DIR, max_files=EXPORT_CACHE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future[path | None]
+
+    def key(self, *parts) -> str:
+        """Stable digest of the data version and filters identifying an export."""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key, filename) -> str:
+        return os.path.join(self.directory, f"{key}-{filename}")
+
+    def respond(self, req, key, filename, media_type, produce, download=True):
+        """Serve an export, answering from cache or building it on a miss.
+
+        Args:
+            req: Incoming request (for If-None-Match / If-Modified-Since)
+            key: Cache key from `key()`
+            filename: Download filename (also the cache file suffix)
+            media_type: Response content type
+            produce: Zero-arg callable returning an iterator of bytes chunks
+            download: Send as an attachment rather than inline
+        """
+        etag = f'"{key}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",  # Always revalidate; 304s are cheap
+        }
+        if download:
+            headers["Content-Disposition"] = f"attachment; filename={filename}"
+        path = self.path(key, filename)
+
+        # The ETag is derived from the key, so a match needs no file at all
+        if _etag_matches(req.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        while True:
+            with self._lock:
+                if os.path.exists(path):
+                    break
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._in_flight[key] = Future()
+                    started = time.time()
+                    headers["Last-Modified"] = formatdate(started, usegmt=True)
+                    chunks = self._tee(key, path, produce(), future, started)
+                    return _BuildResponse(
+                        chunks, lambda: self._settle(key, future, None),
+                        media_type=media_type, headers=headers
+                    )
+            try:
+                built = future.result(timeout=BUILD_WAIT_TIMEOUT)
+            except TimeoutError:
+                # The build is slow but alive: leave it in place and stream our own copy
+                headers["Last-Modified"] = formatdate(time.time(), usegmt=True)
+                return StreamingResponse(produce(), media_type=media_type, headers=headers)
+            if built is None:
+                # The other build failed or was abandoned (its builder already
+                # removed it); try again, possibly as the builder
+                continue
+
+        mtime = os.path.getmtime(path)
+        headers["Last-Modified"] = formatdate(mtime, usegmt=True)
+        if _not_modified_since(req.headers.get("if-modified-since"), mtime):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    def _tee(self, key, path, chunks, future, started):
+        """Yield chunks to the client while writing them to the cache file."""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        completed = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            os.utime(tmp_path, (started, started))
+            os.replace(tmp_path, path)
+            completed = True
+        finally:
+            if not completed and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            self._settle(key, future, path if completed else None)
+            if completed:
+                self._evict()
+
+    def _settle(self, key, future, result):
+        """Finish a build once: release its in-flight entry and wake the waiters."""
+        with self._lock:
+            # Only this build's own entry; a newer build may hold the key by now
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if future.done():
+                return
+            future.set_result(result)
+
+    def _evict(self):
+        """Keep at most `max_files` cached exports, dropping the oldest."""
+        try:
+            entries = [
+                os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)
+                if not name.endswith(".tmp")
+            ]
+            entries.sort(key=os.path.getmtime)
+            for stale in entries[:-self.max_files]:
+                os.unlink(stale)
+        except OSError as e:
+            logger.warning(f"Export cache eviction failed: {e}")
+
+
+class _BuildResponse(StreamingResponse):
+    """Streaming response for a cache build that settles the build when it ends.
+
+    A generator that never started never runs its `finally`, so a client
+    that disconnects before the first chunk would otherwise leave the build
+    in flight until waiters time out.
+    """
+
+    def __init__(self, chunks, on_close, **kwargs):
+        super().__init__(chunks, **kwargs)
+        self._chunks = chunks
+        self._on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._chunks.close()  # Runs the tee's cleanup if the body was cut short
+            self._on_close()
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _not_modified_since(header, mtime):
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(mtime) <= since
+
+
+# Shared cache used by the export routes
+EXPORT_CACHE = ExportCache()
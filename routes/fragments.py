@@ -0,0 +1,52 @@
+from fasthtml.common import APIRouter, HTMLResponse, P
+from simulation.actor import current_snapshot
+from simulation.agent_index import DEFAULT_PAGE_SIZE
+from ui.pages.dashboard import status_bar, agents_panel, health_panel
+from ui.components import activity_feed, agent_card, agent_page, agent_query
+from ui.render_cache import cached_render, version_tag
+
+rt = APIRouter()
+
+@rt("/fragments/status-bar")
+def status_bar_fragment():
+    """Dashboard status bar only."""
+    return status_bar()
+
+@rt("/fragments/activity-feed")
+def activity_feed_fragment():
+    """Activity feed card only."""
+    return activity_feed()
+
+@rt("/fragments/agents")
+def agents_fragment(req):
+    """Agent browser (loaded lazily when the Agents tab is shown)."""
+    return agents_panel(agent_query(req.query_params))
+
+@rt("/fragments/agents/page")
+def agent_page_fragment(req, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE, v: str = None):
+    """One page of agent cards for the browser's sort/filter parameters.
+
+    A next-page request whose version `v` no longer matches the current
+    snapshot gets the first page instead, swapped over the whole grid.
+    """
+    query = agent_query(req.query_params)
+    if v is not None and offset and v != version_tag(current_snapshot()):
+        html = str(cached_render("agent-page", agent_page, query, 0, limit))
+        return HTMLResponse(html, headers={"HX-Retarget": "#agent-grid", "HX-Reswap": "innerHTML"})
+    return cached_render("agent-page", agent_page, query, offset, limit)
+
+@rt("/fragments/agents/{agent_id}")
+def agent_card_fragment(agent_id: int):
+    """A single agent card, for refreshing one creator in place."""
+    return cached_render("agent-card", _agent_card, agent_id)
+
+def _agent_card(agent_id):
+    for agent in current_snapshot().agents:
+        if agent.profile.id == agent_id:
+            return agent_card(agent)
+    return P(f"Agent {agent_id} not found", cls="text-gray-400")
+
+@rt("/fragments/health")
+def health_fragment():
+    """System health tab (loaded lazily when the Health tab is shown)."""
+    return health_panel()
@@ -0,0 +1,123 @@
+"""
+Fingerprinted, precompressed static assets.
+
+`asset_url("js/charts.js")` returns `/assets/js/charts.<hash>.js`, where the
+hash is taken from the file's content, so the URL changes whenever the file
+does and the response can be cached forever (`immutable`). Each asset is read
+and compressed once (gzip level 9, plus brotli quality 11 when the `brotli`
+package is installed) and the best variant the client accepts is served
+without further work.
+
+Chart.js is served from `static/vendor/` when present (`make vendor` fetches
+it) so the app runs without network access; otherwise pages fall back to the
+CDN.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from pathlib import Path
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from routes.compression import BROTLI_AVAILABLE, accepted_encodings
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+ASSET_PREFIX = "/assets"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HASH_LENGTH = 10
+
+CHART_JS_VENDOR_PATH = "vendor/chart.umd.min.js"
+CHART_JS_CDN_URL = "https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"
+
+
+class Asset:
+    """One static file with its content hash and encoded variants."""
+
+    __slots__ = ("path", "name", "url", "etag", "media_type", "variants")
+
+    def __init__(self, path, data):
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        stem, ext = os.path.splitext(path)
+        self.path = path
+        self.name = f"/{stem}.{digest}{ext}"  # Path below ASSET_PREFIX
+        self.url = ASSET_PREFIX + self.name
+        self.etag = f'"{digest}"'
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.variants = {"identity": data, "gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            self.variants["br"] = brotli.compress(data, quality=11)
+
+    def negotiate(self, accept_encoding):
+        """Smallest variant the client accepts, as (content coding, body)."""
+        accepted = accepted_encodings(accept_encoding)
+        candidates = [(len(body), coding) for coding, body in self.variants.items()
+                      if coding == "identity" or coding in accepted]
+        _, coding = min(candidates)
+        return coding, self.variants[coding]
+
+
+class StaticAssets:
+    """Registry of fingerprinted assets, and the ASGI app serving them under ASSET_PREFIX."""
+
+    def __init__(self, root=STATIC_DIR):
+        self.root = Path(root)
+        self._by_path = {}  # source path -> Asset (missing files are not cached)
+        self._by_name = {}  # fingerprinted name -> Asset
+        self._lock = threading.Lock()
+
+    def asset(self, path):
+        """Load (once) and return the asset at `path` under the static root, or None.
+
+        A missing file is looked up again on the next call, so one added while
+        the server runs (e.g. by `make vendor`) is picked up without a restart.
+        """
+        with self._lock:
+            asset = self._by_path.get(path)
+            if asset is None:
+                try:
+                    data = (self.root / path).read_bytes()
+                except OSError:
+                    return None
+                asset = self._by_path[path] = Asset(path, data)
+                self._by_name[asset.name] = asset
+            return asset
+
+    def url(self, path, fallback=None):
+        """Fingerprinted URL for `path`, or `fallback` if the file doesn't exist."""
+        asset = self.asset(path)
+        return asset.url if asset is not None else fallback
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope)
+        # Mounted under ASSET_PREFIX: the path below the mount point is the name
+        asset = self._by_name.get(scope["path"][len(scope.get("root_path", "")):])
+        if asset is None:
+            response = Response("Not Found", status_code=404)
+        elif request.headers.get("if-none-match") == asset.etag:
+            response = Response(status_code=304, headers=self._headers(asset))
+        else:
+            coding, body = asset.negotiate(request.headers.get("accept-encoding"))
+            headers = self._headers(asset)
+            if coding != "identity":
+                headers["Content-Encoding"] = coding
+            response = Response(body, media_type=asset.media_type, headers=headers)
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _headers(asset):
+        return {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": asset.etag, "Vary": "Accept-Encoding"}
+
+
+STATIC_ASSETS = StaticAssets()
+
+
+def asset_url(path, fallback=None):
+    """Fingerprinted URL for a file under static/ (see StaticAssets.url)."""
+    return STATIC_ASSETS.url(path, fallback)
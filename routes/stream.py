@@ -0,0 +1,218 @@
+"""
+Server-Sent Events stream of per-tick simulation deltas.
+
+After every tick the environment notifies `TickBroadcaster`, which builds one
+compact JSON delta (summary metrics, state counts, changed agents, new chart
+points), formats it as an SSE frame once, and fans the same bytes out to every
+connected observer. Nothing is computed while nobody is watching.
+
+Each observer has a small bounded queue; a slow client drops its oldest
+frames rather than holding memory for the whole run. When the auto-run loop
+ticks faster than `STREAM_MAX_FPS`, intermediate ticks are coalesced: only
+the latest state is sent, once the frame interval has passed.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from fasthtml.common import APIRouter
+from starlette.responses import StreamingResponse
+
+from simulation.environment import current_environment
+
+logger = logging.getLogger(__name__)
+
+rt = APIRouter()
+
+STREAM_QUEUE_SIZE = 16  # Frames buffered per observer before the oldest are dropped
+HEARTBEAT_SECONDS = 15.0  # Keep-alive comment interval (proxies close idle streams)
+RETRY_MS = 3000  # Client reconnect delay
+STREAM_MAX_FPS = 10.0  # Frames per second at most; faster ticks are coalesced
+
+# Agent fields sent to observers, rounded to keep frames small
+AGENT_FIELDS = ("burnout", "addiction_drive", "emotional_resilience", "arousal_level")
+CHART_FIELDS = ("health_score", "avg_burnout", "avg_addiction", "avg_resilience", "avg_arousal", "avg_reward")
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class TickBroadcaster:
+    """Fan out per-tick deltas from one environment to many SSE observers."""
+
+    def __init__(self, env, queue_size=STREAM_QUEUE_SIZE, max_fps=STREAM_MAX_FPS):
+        self.env = env
+        self.queue_size = queue_size
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self._lock = threading.Lock()
+        self._subscribers = set()  # (loop, queue)
+        self._agent_snapshot = {}  # agent id -> last sent values
+        self._last_frame = 0.0
+        self._flush_timer = None
+        self.frames_sent = 0
+        self.ticks_coalesced = 0
+        self.frames_dropped = 0
+        env.tick_listeners.append(self.on_event)
+
+    @property
+    def observers(self):
+        return len(self._subscribers)
+
+    def stats(self) -> dict:
+        return {
+            "observers": self.observers,
+            "frames_sent": self.frames_sent,
+            "ticks_coalesced": self.ticks_coalesced,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    def on_event(self, env, event):
+        """Tick listener: build the frame once and offer it to every observer."""
+        if event not in ("tick", "reset", "evict"):
+            return  # e.g. "posts", sent mid-tick before rewards are applied
+        with self._lock:
+            if not self._subscribers:
+                return
+            if event == "evict":
+                # Close the streams; clients reconnect to their session's restored environment
+                frame = None
+            elif event == "reset":
+                self._agent_snapshot = {}
+                frame = _sse("reset", {"tick": env.tick_count})
+            else:
+                wait = self._last_frame + self.min_interval - time.monotonic()
+                if wait > 0:
+                    # Too soon after the last frame: send the latest state once the interval passes
+                    self.ticks_coalesced += 1
+                    if self._flush_timer is None:
+                        self._flush_timer = threading.Timer(wait, self._flush)
+                        self._flush_timer.daemon = True
+                        self._flush_timer.start()
+                    return
+                frame = self._tick_frame(env)
+            subscribers = list(self._subscribers)
+        self._publish(subscribers, frame)
+
+    def _flush(self):
+        """Send the state left pending by coalesced ticks."""
+        with self.env.lock, self._lock:
+            self._flush_timer = None
+            if not self._subscribers:
+                return
+            frame = self._tick_frame(self.env)
+            subscribers = list(self._subscribers)
+        self._publish(subscribers, frame)
+
+    def _tick_frame(self, env):
+        self._last_frame = time.monotonic()
+        self.frames_sent += 1
+        return _sse("tick", self._delta(env))
+
+    def _publish(self, subscribers, frame):
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, frame)
+            except RuntimeError:
+                # The observer's event loop is gone; it unsubscribes on its own
+                pass
+
+    def _offer(self, queue, frame):
+        if queue.full():
+            queue.get_nowait()  # Drop the oldest frame for slow observers
+            self.frames_dropped += 1
+        queue.put_nowait(frame)
+
+    def _delta(self, env):
+        """Compact description of what changed since the last frame."""
+        summary = env.summary()
+        changed = []
+        total_earnings = 0.0
+        for agent in env.agents:
+            p = agent.profile
+            total_earnings += agent.total_earnings
+            entry = agent.history[-1] if agent.history else {}
+            values = {
+                "state": p.current_state.name,
+                "reward": round(entry.get("final_reward", 0), 3),
+                **{field: round(getattr(p, field), 3) for field in AGENT_FIELDS},
+            }
+            if self._agent_snapshot.get(p.id) != values:
+                self._agent_snapshot[p.id] = values
+                changed.append({"id": p.id, **values})
+
+        history = env.history
+        chart = {"tick": env.tick_count}
+        for field in CHART_FIELDS:
+            series = history.get(field)
+            chart[field] = round(series[-1], 4) if series else None
+
+        return {
+            "tick": env.tick_count,
+            "summary": {
+                "num_agents": summary.get("num_agents", 0),
+                "avg_burnout": summary.get("avg_burnout", 0),
+                "avg_addiction": summary.get("avg_addiction", 0),
+                "avg_resilience": summary.get("avg_resilience", 0),
+                "burnout_rate": summary.get("burnout_rate", 0),
+                "system_health_score": summary.get("system_health_score", 0.5),
+                "mode": summary.get("current_regime"),
+                "total_earnings": round(total_earnings, 2),
+            },
+            "states": summary.get("state_distribution", {}),
+            "agents": changed,
+            "chart": chart,
+        }
+
+    async def events(self, req):
+        """Async iterator of SSE frames for one observer until it disconnects."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        subscriber = (loop, queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            # Next delta lists every agent so a late joiner sees the full state
+            self._agent_snapshot = {}
+        try:
+            yield f"retry: {RETRY_MS}\n" + _sse("hello", {"tick": self.env.tick_count})
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await req.is_disconnected():
+                        break
+                    frame = ": keep-alive\n\n"
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+_broadcaster_lock = threading.Lock()  # Guards creation only; env.lock is held for whole ticks
+
+
+def broadcaster_for(env):
+    """The SSE broadcaster attached to `env`, created on first use."""
+    broadcaster = env.extensions.get("broadcaster")
+    if broadcaster is not None:
+        return broadcaster
+    with _broadcaster_lock:
+        broadcaster = env.extensions.get("broadcaster")
+        if broadcaster is None:
+            broadcaster = env.extensions["broadcaster"] = TickBroadcaster(env)
+        return broadcaster
+
+
+@rt("/api/stream")
+async def stream(req):
+    """SSE stream: a `tick` event with a JSON delta after every simulation tick."""
+    return StreamingResponse(
+        broadcaster_for(current_environment()).events(req),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
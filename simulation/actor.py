@@ -0,0 +1,209 @@
+"""
+Single-writer command queue around an Environment, with immutable snapshots.
+
+Every mutation of an environment (ticks, resets, policy and scenario changes)
+is submitted to its `EnvironmentActor`, which applies commands one at a time
+on a dedicated writer thread. Renders never touch the live environment:
+they read an `EnvironmentSnapshot`, an immutable copy of the state as of the
+last command. The writer publishes a new snapshot at the end of each
+command, and readers only ever take the last published one, so any number
+of requests can render while a tick (or a queue of them) runs without
+waiting on it.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from types import SimpleNamespace
+
+from simulation.agents.agent import Agent
+from simulation.environment import Environment, current_environment
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryView(Sequence):
+    """Read-only view of the first `n` entries of an append-only list.
+
+    Agents only ever append to `history` (a reset or trim assigns a new
+    list), so a snapshot can share the live list and bound its reads to the
+    length it had, instead of copying every entry after every command.
+    """
+
+    __slots__ = ("_entries", "_n")
+
+    def __init__(self, entries):
+        self._entries = entries
+        self._n = len(entries)
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entries[i] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("history index out of range")
+        return self._entries[index]
+
+    def __iter__(self):
+        return islice(self._entries, self._n)
+
+
+class AgentSnapshot:
+    """Read-only copy of an agent: profile, history and last generated content."""
+
+    __slots__ = (
+        "profile", "history", "ticks_recorded", "total_earnings", "total_posts",
+        "_current_tick_content", "_current_tick_posts",
+    )
+
+    def __init__(self, agent):
+        # History entries are never mutated once appended, so sharing them is safe
+        self.profile = copy.copy(agent.profile)
+        self.profile.state_history = list(agent.profile.state_history)
+        self.history = HistoryView(agent.history)
+        self.ticks_recorded = agent.ticks_recorded
+        self.total_earnings = agent.total_earnings
+        self.total_posts = agent.total_posts
+        self._current_tick_content = tuple(getattr(agent, "_current_tick_content", ()))
+        self._current_tick_posts = getattr(agent, "_current_tick_posts", 0)
+
+    get_strategy_info = Agent.get_strategy_info
+    _get_strategy_description = Agent._get_strategy_description
+
+
+class EnvironmentSnapshot:
+    """Immutable view of an Environment after a command, with its read API."""
+
+    TICK_DURATION_DAYS = Environment.TICK_DURATION_DAYS
+
+    def __init__(self, env):
+        self.run_id = env.run_id
+        self.seed = env.seed
+        self.tick_count = env.tick_count
+        self.current_scenario = env.current_scenario
+        self.agents = tuple(AgentSnapshot(agent) for agent in env.agents)
+        self.history = {key: tuple(values) for key, values in env.history.items()}
+        self.last_tick_explanations = tuple(env.last_tick_explanations)
+        self.policy_engine = SimpleNamespace(
+            config=replace(env.policy_engine.config),
+            config_version=env.policy_engine.config_version,
+        )
+        # Append-only: readers stay consistent by bounding reads to `tick_count`
+        self.history_columns = env.history_columns
+        self._summary = env.summary()
+        # Memo of rendered HTML for this state (see ui.render_cache)
+        self.renders = {}
+
+    def summary(self):
+        return dict(self._summary)
+
+    def data_version(self):
+        return (self.run_id, self.tick_count, self.policy_engine.config_version)
+
+    def agent_series(self, agent, field, last=None):
+        series = getattr(self.history_columns, "agent_series", None)
+        if series is not None:
+            return series(agent.profile.id, field, last)
+        entries = agent.history if last is None else agent.history[-last:]
+        return [entry.get(field, 0) for entry in entries]
+
+    get_simulated_time = Environment.get_simulated_time
+
+
+class EnvironmentActor:
+    """Apply commands to one environment from a single writer thread."""
+
+    def __init__(self, env):
+        self.env = env
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="env-writer")
+        self._writer = None
+        self._lock = threading.Lock()
+        self._snapshot = None  # Published after each command (see _apply)
+        self._refresh = None  # Future for the first snapshot, before any command
+        self.commands = 0
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queue `fn(*args, **kwargs)` on the writer thread."""
+        if threading.current_thread() is self._writer:
+            # Already on the writer (e.g. a command issuing another): run inline
+            future = Future()
+            future.set_result(self._apply(fn, args, kwargs))
+            return future
+        return self._executor.submit(self._apply, fn, args, kwargs)
+
+    def call(self, fn, *args, **kwargs):
+        """Run a command and wait for its result (from sync code)."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a command and await its result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _apply(self, fn, args, kwargs):
+        self._writer = threading.current_thread()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.commands += 1
+            # Publish on the writer, so readers never wait for queued commands
+            self._publish()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def snapshot(self) -> EnvironmentSnapshot:
+        """The snapshot published after the last command (built once if none yet)."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        if threading.current_thread() is self._writer:
+            return self._publish()
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            if self._refresh is None:
+                self._refresh = self._executor.submit(self._publish)
+            refresh = self._refresh
+        return refresh.result()
+
+    def _publish(self):
+        try:
+            snapshot = EnvironmentSnapshot(self.env)
+        except Exception as e:
+            # Keep serving the previous snapshot rather than failing the command
+            logger.warning(f"Could not build environment snapshot: {e}")
+            return self._snapshot
+        with self._lock:
+            self._refresh = None
+            self._snapshot = snapshot
+        return snapshot
+
+
+def actor_for(env) -> EnvironmentActor:
+    """The command queue attached to `env`, created on first use."""
+    # Lock-free once created: env.lock is held for the whole of every tick
+    actor = env.extensions.get("actor")
+    if actor is not None:
+        return actor
+    with env.lock:
+        actor = env.extensions.get("actor")
+        if actor is None:
+            actor = env.extensions["actor"] = EnvironmentActor(env)
+        return actor
+
+
+def current_snapshot() -> EnvironmentSnapshot:
+    """Snapshot of the current request's environment (for rendering)."""
+    return actor_for(current_environment()).snapshot()
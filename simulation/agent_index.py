@@ -0,0 +1,124 @@
+"""
+Sortable, filterable index over the agents of an environment snapshot.
+
+The agent browser pages through creators on the server. Sorting and
+filtering run over one compact row per agent (id, state, burnout, earnings)
+built once per snapshot, and the ordering of each distinct query is memoised
+as well, so every page after the first is a slice: the cost of a page
+depends on its size, not on the population.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+SORT_KEYS = ("id", "burnout", "earnings", "state")
+DEFAULT_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class AgentRow:
+    """Sort/filter fields of one agent, and its position in `snapshot.agents`."""
+    id: int
+    state: str
+    burnout: float
+    earnings: float
+    position: int
+
+
+@dataclass(frozen=True)
+class AgentQuery:
+    """Sort order and filters of an agent browser request.
+
+    Attributes:
+        sort: One of SORT_KEYS
+        descending: Reverse the sort order
+        state: Only agents in this state (e.g. "ENGAGED")
+        min_burnout: Only agents with burnout >= this value
+        max_burnout: Only agents with burnout <= this value
+        min_earnings: Only agents with total earnings >= this value
+    """
+    sort: str = "id"
+    descending: bool = False
+    state: Optional[str] = None
+    min_burnout: Optional[float] = None
+    max_burnout: Optional[float] = None
+    min_earnings: Optional[float] = None
+
+    def __post_init__(self):
+        if self.sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {self.sort}. Available: {', '.join(SORT_KEYS)}")
+
+    def matches(self, row: AgentRow) -> bool:
+        return (
+            (self.state is None or row.state == self.state)
+            and (self.min_burnout is None or row.burnout >= self.min_burnout)
+            and (self.max_burnout is None or row.burnout <= self.max_burnout)
+            and (self.min_earnings is None or row.earnings >= self.min_earnings)
+        )
+
+    def params(self) -> dict:
+        """Query-string parameters reproducing this query (defaults omitted)."""
+        params = {"sort": self.sort}
+        if self.descending:
+            params["descending"] = "true"
+        for name in ("state", "min_burnout", "max_burnout", "min_earnings"):
+            value = getattr(self, name)
+            if value is not None:
+                params[name] = value
+        return params
+
+
+class AgentIndex:
+    """Rows for every agent of a snapshot, with memoised query results."""
+
+    def __init__(self, agents):
+        self.agents = agents
+        self.rows = tuple(
+            AgentRow(
+                id=agent.profile.id,
+                state=agent.profile.current_state.name,
+                burnout=agent.profile.burnout,
+                earnings=agent.total_earnings,
+                position=position,
+            )
+            for position, agent in enumerate(agents)
+        )
+        self.total_earnings = sum(row.earnings for row in self.rows)
+        self._results = {}
+        self._lock = threading.Lock()
+
+    @property
+    def states(self) -> Tuple[str, ...]:
+        """Distinct agent states, for the filter menu."""
+        return tuple(sorted({row.state for row in self.rows}))
+
+    def select(self, query: AgentQuery) -> Tuple[AgentRow, ...]:
+        """Rows matching `query`, in its sort order (computed once per query)."""
+        with self._lock:
+            result = self._results.get(query)
+        if result is None:
+            # Ties break on id, so pages are stable across requests
+            matching = [row for row in self.rows if query.matches(row)]
+            matching.sort(key=lambda row: (getattr(row, query.sort), row.id), reverse=query.descending)
+            result = tuple(matching)
+            with self._lock:
+                self._results[query] = result
+        return result
+
+    def page(self, query: AgentQuery, offset=0, limit=DEFAULT_PAGE_SIZE):
+        """One page of agents matching `query`, and the total number of matches."""
+        rows = self.select(query)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+        return [self.agents[row.position] for row in rows[offset:offset + limit]], len(rows)
+
+
+def agent_index(snapshot) -> AgentIndex:
+    """The AgentIndex of a snapshot, built on first use and kept with the snapshot."""
+    index = snapshot.renders.get(("agent-index",))
+    if index is None:
+        # Concurrent first uses may both build; the results are identical
+        index = snapshot.renders[("agent-index",)] = AgentIndex(snapshot.agents)
+    return index
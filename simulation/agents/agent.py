@@ -9,8 +9,15 @@ class Agent:
         self.selector = StrategySelector()
         self.history = []
         self.decision_trace = []
+        self.reset_totals()
 
-    def update_state(self, rewards, policy_cfg, current_tick=None):
+    def reset_totals(self):
+        """Zero the running totals kept alongside `history` (which may be trimmed)."""
+        self.ticks_recorded = 0
+        self.total_earnings = 0.0
+        self.total_posts = 0.0
+
+    def update_state(self, rewards, policy_cfg, current_tick=None, rng=random):
         ctx = StateContext(
             arousal=self.profile.arousal_level,
             addiction=self.profile.addiction_drive,
@@ -20,16 +27,16 @@ class Agent:
             diversity=rewards.get("diversity", 0),
             consistency=rewards.get("consistency", 0)
         )
-        next_state = self.state_machine.compute_transition(ctx, rewards, policy_cfg)
+        next_state = self.state_machine.compute_transition(ctx, rewards, policy_cfg, rng)
         self.profile.current_state = next_state
         self.profile.strategy = self.selector.select(self)
         
         # Evolve agent traits based on state and rewards
-        self._evolve_traits(next_state, rewards, policy_cfg)
+        self._evolve_traits(next_state, rewards, policy_cfg, rng)
         
         # Record history with trait snapshots for sparklines
         history_entry = {
-            "tick": current_tick if current_tick is not None else len(self.history),
+            "tick": current_tick if current_tick is not None else self.ticks_recorded,
             "state": next_state.name,
             "burnout": self.profile.burnout,
             "addiction": self.profile.addiction_drive,
@@ -43,9 +50,12 @@ class Agent:
             # Keep _current_tick_posts for UI display (don't delete it)
         
         self.history.append(history_entry)
+        self.ticks_recorded += 1
+        self.total_earnings += history_entry.get("cpm_earnings", 0)
+        self.total_posts += history_entry.get("posts_generated", 0)
         return next_state
     
-    def _evolve_traits(self, state, rewards, policy_cfg):
+    def _evolve_traits(self, state, rewards, policy_cfg, rng=random):
         """Update agent traits based on current state and rewards.
         
         Key research insight: Intermittent reinforcement drives addiction and burnout,
@@ -57,7 +67,7 @@ class Agent:
         predictability = rewards.get("predictability", 0.5)
         
         # Individual personality variation (each agent responds slightly differently)
-        personality_noise = random.gauss(0, 0.015)  # ±1.5% individual variation
+        personality_noise = rng.gauss(0, 0.015)  # ±1.5% individual variation
         
         # === BURNOUT DYNAMICS ===
         # Burnout increases when hustling, decreases when resting
@@ -65,21 +75,21 @@ class Agent:
             # Intermittent reinforcement causes MORE burnout (chasing unpredictable rewards)
             base_increase = 0.05 if policy_cfg.mode == "differential" else 0.08
             # Add individual variation (some people burn out faster/slower)
-            burnout_increase = base_increase + random.gauss(0, 0.02)
+            burnout_increase = base_increase + rng.gauss(0, 0.02)
             self.profile.burnout = min(1.0, self.profile.burnout + burnout_increase)
         elif state == CreatorState.BURNOUT:
             # Recovery is faster with differential (predictable rest rewards)
             base_recovery = 0.03 if policy_cfg.mode == "differential" else 0.02
             # Add individual recovery rate variation
-            recovery_rate = base_recovery + random.gauss(0, 0.01)
+            recovery_rate = base_recovery + rng.gauss(0, 0.01)
             self.profile.burnout = max(0.0, self.profile.burnout - recovery_rate)
         else:
             # Baseline burnout reduction with individual variation
-            baseline_reduction = 0.01 + random.gauss(0, 0.005)
+            baseline_reduction = 0.01 + rng.gauss(0, 0.005)
             self.profile.burnout = max(0.0, self.profile.burnout - baseline_reduction)
         
         # Add independent noise to burnout (life events, external stressors)
-        self.profile.burnout = max(0.0, min(1.0, self.profile.burnout + random.gauss(0, 0.01)))
+        self.profile.burnout = max(0.0, min(1.0, self.profile.burnout + rng.gauss(0, 0.01)))
         
         # === AROUSAL/ANXIETY DYNAMICS ===
         # Unpredictable rewards create anxiety and hypervigilance
@@ -87,23 +97,23 @@ class Agent:
             # Intermittent: High arousal from unpredictability
             if reward_magnitude > 0:
                 # Got reward - dopamine spike (with individual variation)
-                arousal_increase = 0.06 + random.gauss(0, 0.015)
+                arousal_increase = 0.06 + rng.gauss(0, 0.015)
                 self.profile.arousal_level = min(1.0, self.profile.arousal_level + arousal_increase)
             else:
                 # Missed reward - anxiety increases (with individual variation)
-                anxiety_increase = 0.03 + random.gauss(0, 0.01)
+                anxiety_increase = 0.03 + rng.gauss(0, 0.01)
                 self.profile.arousal_level = min(1.0, self.profile.arousal_level + anxiety_increase)
         else:
             # Differential: Stable arousal levels
             if reward_magnitude > 0.5:
-                arousal_change = 0.02 + random.gauss(0, 0.01)
+                arousal_change = 0.02 + rng.gauss(0, 0.01)
                 self.profile.arousal_level = min(1.0, self.profile.arousal_level + arousal_change)
             else:
-                arousal_change = 0.02 + random.gauss(0, 0.01)
+                arousal_change = 0.02 + rng.gauss(0, 0.01)
                 self.profile.arousal_level = max(0.0, self.profile.arousal_level - arousal_change)
         
         # Add independent noise to arousal (daily mood fluctuations)
-        self.profile.arousal_level = max(0.0, min(1.0, self.profile.arousal_level + random.gauss(0, 0.015)))
+        self.profile.arousal_level = max(0.0, min(1.0, self.profile.arousal_level + rng.gauss(0, 0.015)))
         
         # === ADDICTION DYNAMICS ===
         # Intermittent reinforcement is HIGHLY addictive (like gambling)
@@ -111,41 +121,41 @@ class Agent:
             # Unpredictable rewards drive compulsive behavior
             if reward_magnitude > 0.3:
                 # Big reward hit - addiction spike (with individual susceptibility)
-                addiction_increase = 0.07 + random.gauss(0, 0.02)
+                addiction_increase = 0.07 + rng.gauss(0, 0.02)
                 self.profile.addiction_drive = min(1.0, self.profile.addiction_drive + addiction_increase)
             else:
                 # Near-miss keeps addiction high (with variation)
-                near_miss_effect = 0.02 + random.gauss(0, 0.01)
+                near_miss_effect = 0.02 + rng.gauss(0, 0.01)
                 self.profile.addiction_drive = min(1.0, self.profile.addiction_drive + near_miss_effect)
         elif policy_cfg.mode == "differential":
             # Predictable rewards reduce addiction over time (with individual recovery rates)
-            addiction_reduction = 0.02 + random.gauss(0, 0.005)
+            addiction_reduction = 0.02 + rng.gauss(0, 0.005)
             self.profile.addiction_drive = max(0.0, self.profile.addiction_drive - addiction_reduction)
         else:  # hybrid
             # Moderate addiction effects (with variation)
             if reward_magnitude > 0.3:
-                addiction_change = 0.03 + random.gauss(0, 0.01)
+                addiction_change = 0.03 + rng.gauss(0, 0.01)
                 self.profile.addiction_drive = min(1.0, self.profile.addiction_drive + addiction_change)
             else:
-                addiction_change = 0.01 + random.gauss(0, 0.005)
+                addiction_change = 0.01 + rng.gauss(0, 0.005)
                 self.profile.addiction_drive = max(0.0, self.profile.addiction_drive - addiction_change)
         
         # Add independent noise to addiction (environmental triggers, social influences)
-        self.profile.addiction_drive = max(0.0, min(1.0, self.profile.addiction_drive + random.gauss(0, 0.01)))
+        self.profile.addiction_drive = max(0.0, min(1.0, self.profile.addiction_drive + rng.gauss(0, 0.01)))
         
         # === RESILIENCE DYNAMICS ===
         # Differential reinforcement builds resilience through predictability
         if policy_cfg.mode == "differential" and predictability > 0.8:
             # Predictable environment builds confidence and resilience (with individual growth rates)
-            resilience_growth = 0.01 + random.gauss(0, 0.003)
+            resilience_growth = 0.01 + rng.gauss(0, 0.003)
             self.profile.emotional_resilience = min(1.0, self.profile.emotional_resilience + resilience_growth)
         elif policy_cfg.mode == "intermittent":
             # Unpredictability erodes resilience (with individual vulnerability)
-            resilience_erosion = 0.01 + random.gauss(0, 0.003)
+            resilience_erosion = 0.01 + rng.gauss(0, 0.003)
             self.profile.emotional_resilience = max(0.0, self.profile.emotional_resilience - resilience_erosion)
         
         # Add independent noise to resilience (personal growth, therapy, support systems)
-        self.profile.emotional_resilience = max(0.0, min(1.0, self.profile.emotional_resilience + random.gauss(0, 0.008)))
+        self.profile.emotional_resilience = max(0.0, min(1.0, self.profile.emotional_resilience + rng.gauss(0, 0.008)))
 
     def get_state_probabilities(self, rewards):
         """Get current state transition probabilities for this agent."""
@@ -189,7 +199,7 @@ class Agent:
             "addiction": round(self.profile.addiction_drive, 3),
             "resilience": round(self.profile.emotional_resilience, 3),
             "strategy": self.profile.strategy,
-            "ticks_alive": len(self.history)
+            "ticks_alive": self.ticks_recorded
         }
     
     def _parse_frequency_from_strategy(self, strategy_description: str) -> float:
@@ -276,25 +286,24 @@ class Agent:
     # See FEEDBACK.md lines 359-458 for full implementation details.
     
     def _build_markov_corpus(self):
-        """Build a Markov chain corpus from agent's historical content.
-        
-        Future Implementation:
-        - Analyze agent's content history to build a statistical model
-        - Use agent's quality, diversity, and consistency traits to shape corpus
-        - Generate realistic text patterns based on agent's "voice"
+        """Build a Markov chain corpus from the agent's generated content history.
         
         Returns:
-            dict: Markov chain transition probabilities (stub returns empty dict)
+            dict: Word transition counts (empty until the agent has content)
         
         Example:
             {
-                "the": {"quick": 0.3, "lazy": 0.2, "brown": 0.5},
-                "quick": {"brown": 0.8, "fox": 0.2}
+                "the": {"quick": 3, "lazy": 2, "brown": 5},
+                "quick": {"brown": 8, "fox": 2}
             }
         """
-        # STUB: Return empty corpus
-        # TODO: Implement Markov chain builder when content history is available
-        return {}
+        from simulation.markov import build_corpus
+        texts = [
+            entry.get("content", "")
+            for entry in getattr(self, "_current_tick_content", ())
+            if not entry.get("pending")
+        ]
+        return build_corpus(texts)
     
     def generate_content_prompt_hf(self, temperature=0.7, max_tokens=100):
         """Generate a content prompt for Hugging Face text generation.
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from simulation.agents.state_machine import CreatorState
 import random
 
@@ -15,16 +15,19 @@ class AgentProfile:
     strategy: str = "neutral"
     current_state: CreatorState = field(default_factory=lambda: CreatorState.OPTIMIZER)
     state_history: list = field(default_factory=list)
+    rng: InitVar[random.Random] = None  # Trait sampling source (e.g. env.rng); module RNG if None
     
-    def __post_init__(self):
+    def __post_init__(self, rng):
         """Initialize traits with random variation sampled from distributions.
         
         Uses normal distributions centered around typical values with reasonable
         variance to create diverse but realistic agent populations.
         """
+        rng = rng or random
+
         # Helper to sample from normal distribution and clamp to [0, 1]
         def sample(mean, std):
-            return max(0.0, min(1.0, random.gauss(mean, std)))
+            return max(0.0, min(1.0, rng.gauss(mean, std)))
         
         # Only initialize if not already set (allows scenario overrides)
         if self.arousal_level is None:
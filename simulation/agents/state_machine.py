@@ -31,13 +31,14 @@ class CreatorStateMachine:
     def __init__(self, agent):
         self.agent = agent
 
-    def compute_transition(self, ctx: StateContext, rewards, policy_cfg):
+    def compute_transition(self, ctx: StateContext, rewards, policy_cfg, rng=random):
         """Compute probabilistic state transition based on context and rewards.
         
         Args:
             ctx: Current agent context (arousal, burnout, etc.)
             rewards: Reward breakdown from policy engine
             policy_cfg: Current policy configuration
+            rng: Random source (the environment's, so runs replay from their seed)
             
         Returns:
             CreatorState: The next state based on weighted probabilities
@@ -74,14 +75,14 @@ class CreatorStateMachine:
         
         # Add small random noise to each transition score (platform algorithm variability)
         for state in transitions:
-            transitions[state] += random.gauss(0, 0.05)
+            transitions[state] += rng.gauss(0, 0.05)
         
         # Normalize to probabilities
         total = sum(transitions.values()) + 1e-6  # Avoid division by zero
         probs = {state: score / total for state, score in transitions.items()}
         
         # Sample from probability distribution
-        rnd = random.random()
+        rnd = rng.random()
         cumulative = 0.0
         for state, prob in probs.items():
             cumulative += prob
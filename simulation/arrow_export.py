@@ -0,0 +1,133 @@
+"""
+Columnar (Parquet / Arrow IPC) export of simulation history.
+
+Builds Arrow record batches directly on top of the `ColumnarHistory` buffers,
+one batch per tick range, so numeric columns are handed to Arrow without a
+per-row Python pass. Requires the optional `pyarrow` dependency, which is
+imported on first use rather than with this module (it costs more to import
+than the whole simulation package).
+"""
+
+import importlib.util
+import json
+import logging
+from dataclasses import asdict
+
+from simulation.history import HISTORY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+if not ARROW_AVAILABLE:
+    logger.info("pyarrow not installed. Parquet/Arrow export is disabled.")
+
+pa = pq = None  # Bound by _load_pyarrow()
+
+DEFAULT_CHUNK_TICKS = 100
+METADATA_PREFIX = "platform_capitalism."
+# Codecs each format accepts (Arrow IPC streams are uncompressed unless one is given)
+PARQUET_COMPRESSIONS = ("none", "snappy", "gzip", "brotli", "lz4", "zstd")
+ARROW_COMPRESSIONS = ("lz4", "zstd")
+
+
+def _load_pyarrow():
+    """Import pyarrow on first use."""
+    global pa, pq
+    if pa is None:
+        import pyarrow
+        import pyarrow.parquet
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def _arrow_types():
+    return {
+        "q": pa.int64(),
+        "d": pa.float64(),
+        None: pa.dictionary(pa.uint16(), pa.string()),
+    }
+
+
+def history_schema(env):
+    """Arrow schema for the history columns, carrying run metadata."""
+    _load_pyarrow()
+    types = _arrow_types()
+    fields = [pa.field(name, types[code], nullable=False) for name, code in HISTORY_COLUMNS]
+    return pa.schema(fields, metadata=export_metadata(env))
+
+
+def export_metadata(env):
+    """File-level metadata: run seed, policy config and run position.
+
+    `env` may be an Environment or an EnvironmentSnapshot; exports of a
+    snapshot pass its `tick_count` as `tick_to`, so the rows match it.
+    """
+    meta = {
+        "seed": env.seed,
+        "policy_config": json.dumps(asdict(env.policy_engine.config)),
+        "scenario": env.current_scenario or "",
+        "tick_count": env.tick_count,
+        "num_agents": len(env.agents),
+    }
+    return {f"{METADATA_PREFIX}{k}": str(v) for k, v in meta.items()}
+
+
+def _column_array(store, name, code, start, stop):
+    """Wrap a slice of a typed column as an Arrow array.
+
+    Contiguous buffers of the right type (the in-memory ColumnarHistory) are
+    wrapped without copying; strided or differently typed views (the mmap
+    trajectory archive) are converted.
+    """
+    length = stop - start
+    view = store.column(name, start, stop)
+    index_type = pa.uint16()
+    if code is None:
+        if isinstance(view, memoryview) and view.contiguous and view.format == "H":
+            indices = pa.Array.from_buffers(index_type, length, [None, pa.py_buffer(view)])
+        else:
+            indices = pa.array([int(v) for v in view], index_type)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(store.categories[name], pa.string()))
+    arrow_type = _arrow_types()[code]
+    if isinstance(view, memoryview) and view.contiguous and view.format == code:
+        return pa.Array.from_buffers(arrow_type, length, [None, pa.py_buffer(view)])
+    values = view.tolist() if isinstance(view, memoryview) else view
+    return pa.array(values, pa.float64()).cast(arrow_type)
+
+
+def iter_record_batches(env, chunk_ticks=DEFAULT_CHUNK_TICKS, tick_from=None, tick_to=None):
+    """Yield one RecordBatch per `chunk_ticks`-tick range of the run."""
+    store = env.history_columns
+    schema = history_schema(env)
+    for start, stop in store.tick_chunks(chunk_ticks, tick_from, tick_to):
+        arrays = [_column_array(store, name, code, start, stop) for name, code in HISTORY_COLUMNS]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(env, sink, chunk_ticks=DEFAULT_CHUNK_TICKS, compression="zstd", tick_from=None, tick_to=None):
+    """Write history as Parquet, one row group per tick range."""
+    _load_pyarrow()
+    with pq.ParquetWriter(sink, history_schema(env), compression=compression) as writer:
+        for batch in iter_record_batches(env, chunk_ticks, tick_from, tick_to):
+            writer.write_batch(batch)
+
+
+def write_arrow_stream(env, sink, chunk_ticks=DEFAULT_CHUNK_TICKS, compression=None, tick_from=None, tick_to=None):
+    """Write history as an Arrow IPC stream, one record batch per tick range.
+
+    Uncompressed streams (the default) can be read zero-copy; pass
+    `compression="zstd"` or `"lz4"` to trade that for a smaller download.
+    """
+    _load_pyarrow()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, history_schema(env), options=options) as writer:
+        for batch in iter_record_batches(env, chunk_ticks, tick_from, tick_to):
+            writer.write_batch(batch)
+
+
+def to_bytes(writer_fn, env, **kwargs):
+    """Run one of the writers into an in-memory buffer and return its bytes."""
+    _load_pyarrow()
+    sink = pa.BufferOutputStream()
+    writer_fn(env, sink, **kwargs)
+    return sink.getvalue().to_pybytes()
+
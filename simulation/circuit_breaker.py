@@ -0,0 +1,101 @@
+"""
+Circuit breaker and jittered backoff for calls to a remote backend.
+
+When the text-generation endpoint is down or overloaded, every request
+would otherwise wait out its full timeout before falling back. The breaker
+counts consecutive failures. After `failure_threshold` of them it opens,
+and callers skip the backend (falling back at once) for `reset_timeout`
+seconds. It then lets a single probe through ("half-open"). A successful
+probe closes the circuit. A failed probe opens it again for another
+`reset_timeout` seconds.
+
+`backoff_delays` gives the pauses between retries of a single request:
+exponential with "full jitter" (uniform in [0, base * 2**attempt], capped),
+so clients that failed together do not retry together.
+"""
+
+import random
+import threading
+import time
+from typing import List
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic time source
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None  # While a half-open probe is in flight
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now (False = fall back immediately)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            now = self.clock()
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+            # A probe that never reported back (e.g. cancelled) is replaced after reset_timeout
+            if self._state == HALF_OPEN and (
+                self._probe_started is None or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.trips += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+                self._probe_started = None
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+def backoff_delays(retries, base=0.2, cap=2.0, rng=random) -> List[float]:
+    """Full-jitter exponential backoff: the pause before each of `retries` retries."""
+    return [rng.uniform(0, min(cap, base * 2 ** attempt)) for attempt in range(retries)]
@@ -0,0 +1,177 @@
+"""
+LRU/TTL cache of generated post text.
+
+Prompts come from a handful of strategy templates and temperatures are
+derived from traits, so most text-generation requests repeat. The cache keys
+a request on (prompt, model, temperature rounded to TEMPERATURE_STEP,
+quality bucket, diversity bucket) and keeps up to `variants` responses per
+key: until a key has that many, requests still go to the model (and add a
+variant); after that a random variant is returned, so feeds keep varying.
+Keys expire `ttl` seconds after their first response and the least recently
+used keys are evicted beyond `max_entries`. With a `path`, the cache is
+loaded from and periodically saved to a JSON file, so it survives restarts.
+"""
+
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTENT_CACHE_SIZE = int(os.getenv("CONTENT_CACHE_SIZE", "512"))
+CONTENT_CACHE_TTL_SECONDS = float(os.getenv("CONTENT_CACHE_TTL", "3600"))
+CONTENT_CACHE_VARIANTS = int(os.getenv("CONTENT_CACHE_VARIANTS", "3"))
+CONTENT_CACHE_PATH = os.getenv("CONTENT_CACHE_PATH") or None
+
+TEMPERATURE_STEP = 0.1
+TRAIT_BUCKETS = 5  # Quality/diversity targets are bucketed into fifths
+SAVE_EVERY = 50  # New variants between saves to `path`
+FILE_VERSION = 1
+
+
+def _bucket(value: float) -> int:
+    return min(int(max(value, 0.0) * TRAIT_BUCKETS), TRAIT_BUCKETS - 1)
+
+
+def cache_key(prompt, model, temperature, quality_target, diversity_target) -> tuple:
+    """Cache key of a generation request (temperature quantised, traits bucketed)."""
+    return (
+        prompt,
+        model,
+        round(round(temperature / TEMPERATURE_STEP) * TEMPERATURE_STEP, 2),
+        _bucket(quality_target),
+        _bucket(diversity_target),
+    )
+
+
+class ContentCache:
+    """Size-bounded LRU cache with TTL, holding several response variants per key."""
+
+    def __init__(
+        self,
+        max_entries=CONTENT_CACHE_SIZE,
+        ttl=CONTENT_CACHE_TTL_SECONDS,
+        variants=CONTENT_CACHE_VARIANTS,
+        path=CONTENT_CACHE_PATH,
+        clock=time.time,
+    ):
+        """
+        Args:
+            max_entries: Most keys kept (least recently used are evicted)
+            ttl: Seconds a key's variants are served after the first was stored
+            variants: Responses kept per key before requests stop reaching the model
+            path: JSON file the cache is loaded from and saved to (None = memory only)
+            clock: Wall-clock time source (persisted expiry times use it)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.variants = max(1, variants)
+        self.path = path
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> {"created": float, "variants": [dict]}
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def get(self, key) -> Optional[Dict[str, object]]:
+        """A random cached variant for `key`, or None if the model should be called."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry["created"] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None or len(entry["variants"]) < self.variants:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(random.choice(entry["variants"]), cached=True)
+
+    def put(self, key, result: Dict[str, object]):
+        """Store a model response as one variant of `key`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {"created": self.clock(), "variants": []}
+            self._entries.move_to_end(key)
+            if len(entry["variants"]) < self.variants:
+                entry["variants"].append(dict(result))
+                self._unsaved += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            save = self.path and self._unsaved >= SAVE_EVERY
+        if save:
+            self.save()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self):
+        """Write unexpired entries to `path` (atomically)."""
+        if not self.path:
+            return
+        with self._lock:
+            now = self.clock()
+            entries = [
+                {"key": list(key), "created": entry["created"], "variants": list(entry["variants"])}
+                for key, entry in self._entries.items()
+                if now - entry["created"] <= self.ttl
+            ]
+            self._unsaved = 0
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": FILE_VERSION, "entries": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save content cache to {self.path}: {e}")
+
+    def load(self):
+        """Read entries saved by `save`, skipping expired ones (missing file = empty cache)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable content cache {self.path}: {e}")
+            return
+        if data.get("version") != FILE_VERSION:
+            return
+        now = self.clock()
+        with self._lock:
+            for item in data.get("entries", []):
+                if now - item["created"] <= self.ttl:
+                    self._entries[tuple(item["key"])] = {"created": item["created"], "variants": item["variants"]}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -5,41 +5,162 @@ This module provides text generation capabilities for agent content creation,
 supporting both API-based and local model inference.
 """
 
+import asyncio
+import importlib.util
 import os
 import random
+import threading
+import time
 from typing import Dict, Optional, List
 import logging
 
+from simulation.circuit_breaker import CircuitBreaker, backoff_delays
+from simulation.content_cache import ContentCache, cache_key
+from simulation.markov import MarkovChain, build_corpus
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Check if HF dependencies are available
-try:
-    from huggingface_hub import InferenceClient
-    HF_AVAILABLE = True
-except ImportError:
-    HF_AVAILABLE = False
+# Check if HF dependencies are available (imported only when a client is
+# created: huggingface_hub alone costs more to import than the simulation)
+HF_AVAILABLE = importlib.util.find_spec("huggingface_hub") is not None
+if not HF_AVAILABLE:
     logger.warning("huggingface_hub not installed. Content generation will use fallback mode.")
 
+# Concurrent generation: requests in flight at once, and per-request timeout
+# after which the agent's content falls back to a template
+CONTENT_CONCURRENCY = int(os.getenv("CONTENT_GENERATION_CONCURRENCY", "8"))
+CONTENT_TIMEOUT_SECONDS = float(os.getenv("CONTENT_GENERATION_TIMEOUT", "5"))
+
+# Retries of a failed request (connection errors, 429 and 5xx only), and the
+# circuit breaker: consecutive failed requests before the HF API is skipped,
+# and seconds it is skipped for before one probe request is let through
+CONTENT_RETRIES = int(os.getenv("CONTENT_GENERATION_RETRIES", "2"))
+CONTENT_BREAKER_FAILURES = int(os.getenv("CONTENT_BREAKER_FAILURES", "5"))
+CONTENT_BREAKER_RESET_SECONDS = float(os.getenv("CONTENT_BREAKER_RESET", "30"))
+
+# Offline fallback when the HF API is unavailable: "template" or "markov"
+CONTENT_FALLBACK = os.getenv("CONTENT_FALLBACK", "template")
+
+# Template fallback vocabulary (also the base corpus of the Markov fallback)
+FALLBACK_TEMPLATES = [
+    "Just posted new content! Check it out and let me know what you think. {emoji}",
+    "Working on something exciting today. Stay tuned for updates! {emoji}",
+    "Quick update: {topic}. More details coming soon! {emoji}",
+    "Sharing my thoughts on {topic}. What's your take? {emoji}",
+    "New post alert! {topic} - dive in and share your perspective! {emoji}",
+    "Today's focus: {topic}. Let's discuss! {emoji}",
+    "Breaking down {topic} in my latest post. Check it out! {emoji}",
+    "Just finished working on {topic}. Excited to share! {emoji}",
+]
+
+FALLBACK_TOPICS = [
+    "content creation",
+    "platform dynamics",
+    "creator economy",
+    "digital trends",
+    "social media strategy",
+    "audience engagement",
+    "creative process",
+    "platform updates",
+    "community building",
+    "content strategy"
+]
+
+FALLBACK_EMOJIS = ["🔥", "💡", "🚀", "✨", "💪", "🎯", "📈", "🌟", "💫", "🎨"]
+
+FALLBACK_ADDITIONS = [
+    " I've been researching this for a while.",
+    " This is based on recent insights.",
+    " Looking forward to your feedback!",
+    " Let's build something amazing together."
+]
+
+def _is_timeout(error) -> bool:
+    # httpx timeouts do not all derive from the builtin TimeoutError
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+def _retryable(error) -> bool:
+    """Whether a failed request may succeed if sent again.
+    
+    Connection errors, rate limiting (429) and server errors (5xx) are worth
+    retrying. Client errors and timeouts are not: a slow backend is left to
+    the circuit breaker.
+    """
+    if _is_timeout(error):
+        return False
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+
+_tables = None  # Formatted template posts per generation tier, built on first use
+
+
+def _tier(quality_target: float, diversity_target: float) -> int:
+    """Index into `_template_tables` of the posts available to these targets."""
+    # High diversity uses every template, medium the first 5, low the first 3;
+    # over 0.5 diversity varies the emoji and over 0.7 quality adds a detail sentence
+    templates = 2 if diversity_target > 0.7 else 1 if diversity_target > 0.4 else 0
+    return templates * 4 + (diversity_target > 0.5) * 2 + (quality_target > 0.7)
+
+
+def _template_tables():
+    """Every possible template post, with word and character counts, per `_tier`."""
+    global _tables
+    if _tables is None:
+        tables = []
+        for templates in (FALLBACK_TEMPLATES[:3], FALLBACK_TEMPLATES[:5], FALLBACK_TEMPLATES):
+            for emojis in (["✨"], FALLBACK_EMOJIS):
+                for additions in ([""], FALLBACK_ADDITIONS):
+                    tables.append([
+                        (content, len(content.split()), len(content))
+                        for template in templates
+                        for topic in FALLBACK_TOPICS
+                        for emoji in emojis
+                        for addition in additions
+                        for content in [template.format(topic=topic, emoji=emoji) + addition]
+                    ])
+        _tables = tables
+    return _tables
 
 class ContentGenerator:
     """Generate realistic social media content using Hugging Face models."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt2"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt2",
+        cache: Optional[ContentCache] = None,
+        fallback: str = CONTENT_FALLBACK,
+        breaker: Optional[CircuitBreaker] = None,
+        retries: int = CONTENT_RETRIES
+    ):
         """Initialize the content generator.
         
         Args:
             api_key: Hugging Face API key (optional, uses env var if not provided)
             model: Model to use for generation (default: gpt2)
+            cache: Response cache for model output (default: configured from env vars)
+            fallback: Offline generation method, "template" or "markov"
+            breaker: Circuit breaker for the HF API (default: configured from env vars)
+            retries: Retries of a request failing with a transient error
         """
         self.api_key = api_key or os.getenv("HUGGINGFACE_API_KEY")
         self.model = model
+        self.fallback = fallback
+        self.cache = cache if cache is not None else ContentCache()
+        self.breaker = breaker or CircuitBreaker(CONTENT_BREAKER_FAILURES, CONTENT_BREAKER_RESET_SECONDS)
+        self.retries = max(0, retries)
         self.client = None
+        self._async_client = None  # Created on the content loop (see _generation_loop)
         
         # Initialize client if API key is available
         if HF_AVAILABLE and self.api_key:
             try:
-                self.client = InferenceClient(token=self.api_key)
+                from huggingface_hub import InferenceClient
+                # Requests go through huggingface_hub's shared, pooled HTTP session
+                self.client = InferenceClient(token=self.api_key, timeout=CONTENT_TIMEOUT_SECONDS)
                 logger.info(f"Initialized Hugging Face client with model: {model}")
             except Exception as e:
                 logger.error(f"Failed to initialize HF client: {e}")
@@ -67,15 +188,26 @@ class ContentGenerator:
         Returns:
             Dict with generated content and metadata
         """
-        # If HF client is available, use it
+        # If HF client is available, use it (or a cached response to the same request)
         if self.client:
+            key = cache_key(prompt, self.model, temperature, quality_target, diversity_target)
+            cached = self._cached(key, temperature, quality_target, diversity_target)
+            if cached is not None:
+                return cached
+            if not self.breaker.allow():
+                return self._fallback_for(prompt, quality_target, diversity_target, "circuit_open")
             try:
-                return self._generate_with_hf(
+                result = self._generate_with_hf(
                     prompt, temperature, max_tokens, quality_target, diversity_target
                 )
             except Exception as e:
+                self.breaker.record_failure()
                 logger.warning(f"HF generation failed, using fallback: {e}")
-                return self._generate_fallback(prompt, quality_target, diversity_target)
+                reason = "timeout" if _is_timeout(e) else "error"
+                return self._fallback_for(prompt, quality_target, diversity_target, reason)
+            self.breaker.record_success()
+            self.cache.put(key, result)
+            return result
         
         # Otherwise use fallback
         return self._generate_fallback(prompt, quality_target, diversity_target)
@@ -90,6 +222,9 @@ class ContentGenerator:
     ) -> Dict[str, any]:
         """Generate content using Hugging Face API.
         
+        Transient failures (see `_retryable`) are retried up to `self.retries`
+        times after a jittered backoff.
+        
         Args:
             prompt: Base prompt for content generation
             temperature: Sampling temperature
@@ -100,49 +235,134 @@ class ContentGenerator:
         Returns:
             Dict with generated content and metadata
         """
-        try:
-            # Generate text using HF Inference API
-            response = self.client.text_generation(
-                prompt,
-                model=self.model,
-                max_new_tokens=max_tokens,
-                temperature=temperature,
-                top_p=0.9,
-                do_sample=True,
-                return_full_text=False
-            )
-            
-            # Extract generated text
-            if isinstance(response, str):
-                generated_text = response
-            else:
-                generated_text = response.get("generated_text", "")
-            
-            # Clean up the text
-            generated_text = generated_text.strip()
-            
-            # Calculate actual quality metrics
-            word_count = len(generated_text.split())
-            char_count = len(generated_text)
-            
-            # Quality score based on length and coherence
-            quality_score = min(1.0, word_count / 50.0)  # Target ~50 words
-            
-            return {
-                "content": generated_text,
-                "method": "huggingface",
-                "model": self.model,
-                "word_count": word_count,
-                "char_count": char_count,
-                "quality_score": quality_score,
-                "temperature": temperature,
-                "quality_target": quality_target,
-                "diversity_target": diversity_target
-            }
+        delays = backoff_delays(self.retries)
+        for attempt in range(self.retries + 1):
+            try:
+                # Generate text using HF Inference API
+                response = self.client.text_generation(
+                    prompt,
+                    model=self.model,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=0.9,
+                    do_sample=True,
+                    return_full_text=False
+                )
+                
+                return self._hf_result(response, temperature, quality_target, diversity_target)
             
+            except Exception as e:
+                if attempt == self.retries or not _retryable(e):
+                    logger.error(f"HF API error: {e}")
+                    raise
+                time.sleep(delays[attempt])
+    
+    async def agenerate_content(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 100,
+        quality_target: float = 0.5,
+        diversity_target: float = 0.5,
+        timeout: float = CONTENT_TIMEOUT_SECONDS
+    ) -> Dict[str, any]:
+        """Async `generate_content`: the HF request is awaited, not blocking a thread.
+        
+        A request that fails or takes longer than `timeout` seconds falls back to a
+        template (with `fallback_reason` set), so one slow request cannot hold up a tick.
+        While the circuit breaker is open, requests fall back without being sent.
+        """
+        if not self.client:
+            return self._generate_fallback(prompt, quality_target, diversity_target)
+        key = cache_key(prompt, self.model, temperature, quality_target, diversity_target)
+        cached = self._cached(key, temperature, quality_target, diversity_target)
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            return self._fallback_for(prompt, quality_target, diversity_target, "circuit_open")
+        try:
+            # The timeout covers retries too
+            response = await asyncio.wait_for(self._atext_generation(prompt, temperature, max_tokens), timeout)
         except Exception as e:
-            logger.error(f"HF API error: {e}")
-            raise
+            self.breaker.record_failure()
+            if _is_timeout(e):
+                logger.warning(f"HF generation timed out after {timeout}s, using fallback")
+                reason = "timeout"
+            else:
+                logger.warning(f"HF generation failed, using fallback: {e}")
+                reason = "error"
+            return self._fallback_for(prompt, quality_target, diversity_target, reason)
+        self.breaker.record_success()
+        result = self._hf_result(response, temperature, quality_target, diversity_target)
+        self.cache.put(key, result)
+        return result
+    
+    async def _atext_generation(self, prompt, temperature, max_tokens):
+        """Async text-generation request, retried like `_generate_with_hf`."""
+        if self._async_client is None:
+            from huggingface_hub import AsyncInferenceClient
+            # One client (and so one pooled HTTP connection pool) for all requests
+            self._async_client = AsyncInferenceClient(token=self.api_key)
+        delays = backoff_delays(self.retries)
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._async_client.text_generation(
+                    prompt,
+                    model=self.model,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=0.9,
+                    do_sample=True,
+                    return_full_text=False
+                )
+            except Exception as e:
+                if attempt == self.retries or not _retryable(e):
+                    raise
+                await asyncio.sleep(delays[attempt])
+    
+    def _fallback_for(self, prompt, quality_target, diversity_target, reason) -> Dict[str, any]:
+        """Fallback content for a request that did not reach the model, and why."""
+        result = self._generate_fallback(prompt, quality_target, diversity_target)
+        result["fallback_reason"] = reason
+        return result
+    
+    def _cached(self, key, temperature, quality_target, diversity_target) -> Optional[Dict[str, any]]:
+        """A cached response variant for `key`, carrying this request's parameters."""
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        cached.update(temperature=temperature, quality_target=quality_target, diversity_target=diversity_target)
+        return cached
+    
+    def _hf_result(self, response, temperature, quality_target, diversity_target) -> Dict[str, any]:
+        """Result dict for a Hugging Face text-generation response."""
+        # Extract generated text
+        if isinstance(response, str):
+            generated_text = response
+        else:
+            generated_text = response.get("generated_text", "")
+        
+        # Clean up the text
+        generated_text = generated_text.strip()
+        
+        # Calculate actual quality metrics
+        word_count = len(generated_text.split())
+        char_count = len(generated_text)
+        
+        # Quality score based on length and coherence
+        quality_score = min(1.0, word_count / 50.0)  # Target ~50 words
+        
+        return {
+            "content": generated_text,
+            "method": "huggingface",
+            "model": self.model,
+            "word_count": word_count,
+            "char_count": char_count,
+            "quality_score": quality_score,
+            "temperature": temperature,
+            "quality_target": quality_target,
+            "diversity_target": diversity_target
+        }
     
     def _generate_fallback(
         self,
@@ -162,70 +382,58 @@ class ContentGenerator:
         Returns:
             Dict with generated content and metadata
         """
-        # Template-based content generation
-        templates = [
-            "Just posted new content! Check it out and let me know what you think. {emoji}",
-            "Working on something exciting today. Stay tuned for updates! {emoji}",
-            "Quick update: {topic}. More details coming soon! {emoji}",
-            "Sharing my thoughts on {topic}. What's your take? {emoji}",
-            "New post alert! {topic} - dive in and share your perspective! {emoji}",
-            "Today's focus: {topic}. Let's discuss! {emoji}",
-            "Breaking down {topic} in my latest post. Check it out! {emoji}",
-            "Just finished working on {topic}. Excited to share! {emoji}",
-        ]
-        
-        topics = [
-            "content creation",
-            "platform dynamics",
-            "creator economy",
-            "digital trends",
-            "social media strategy",
-            "audience engagement",
-            "creative process",
-            "platform updates",
-            "community building",
-            "content strategy"
-        ]
-        
-        emojis = ["🔥", "💡", "🚀", "✨", "💪", "🎯", "📈", "🌟", "💫", "🎨"]
+        return self.generate_fallback_batch([quality_target], [diversity_target])[0]
+    
+    def generate_fallback_batch(self, quality_targets, diversity_targets, rng=random) -> List[Dict[str, any]]:
+        """Fallback content for many posts at once, one per (quality, diversity) pair.
         
-        # Select template based on diversity
-        if diversity_target > 0.7:
-            # High diversity - more varied templates
-            template = random.choice(templates)
-        elif diversity_target > 0.4:
-            # Medium diversity - moderate variation
-            template = random.choice(templates[:5])
-        else:
-            # Low diversity - consistent templates
-            template = random.choice(templates[:3])
+        Every post a template can produce is formatted once per process (see
+        `_template_tables`), so each post in the batch is one random index into
+        the table for its targets.
         
-        # Fill in template
-        content = template.format(
-            topic=random.choice(topics),
-            emoji=random.choice(emojis) if diversity_target > 0.5 else "✨"
-        )
+        Args:
+            quality_targets: Target quality level per post
+            diversity_targets: Target diversity level per post
+            rng: Source of randomness (`random` module or a `random.Random`)
         
-        # Adjust length based on quality target
-        if quality_target > 0.7:
-            # High quality - add more detail
-            additions = [
-                " I've been researching this for a while.",
-                " This is based on recent insights.",
-                " Looking forward to your feedback!",
-                " Let's build something amazing together."
+        Returns:
+            List of dicts with generated content and metadata, in input order
+        """
+        if self.fallback == "markov":
+            return [
+                self._generate_markov_fallback(quality, diversity)
+                for quality, diversity in zip(quality_targets, diversity_targets)
             ]
-            content += random.choice(additions)
-        
-        word_count = len(content.split())
-        char_count = len(content)
         
+        tables = _template_tables()
+        draw = rng.random
+        results = []
+        for quality, diversity in zip(quality_targets, diversity_targets):
+            table = tables[_tier(quality, diversity)]
+            content, words, chars = table[int(draw() * len(table))]
+            results.append({
+                "content": content,
+                "method": "template_fallback",
+                "model": "template",
+                "word_count": words,
+                "char_count": chars,
+                "quality_score": quality,
+                "temperature": 0.7,
+                "quality_target": quality,
+                "diversity_target": diversity
+            })
+        return results
+    
+    def _generate_markov_fallback(self, quality_target: float, diversity_target: float) -> Dict[str, any]:
+        """Offline generation from the Markov chain over the fallback vocabulary."""
+        # Higher quality targets write longer posts, like the template additions
+        content = base_markov_chain().generate(length=int(60 + 80 * quality_target))
         return {
             "content": content,
-            "method": "template_fallback",
-            "model": "template",
-            "word_count": word_count,
-            "char_count": char_count,
+            "method": "markov",
+            "model": "markov",
+            "word_count": len(content.split()),
+            "char_count": len(content),
             "quality_score": quality_target,
             "temperature": 0.7,
             "quality_target": quality_target,
@@ -234,7 +442,7 @@ class ContentGenerator:
     
     def generate_markov_content(
         self,
-        corpus: Dict[str, Dict[str, float]],
+        corpus,
         seed_word: str = None,
         length: int = 50
     ) -> str:
@@ -243,7 +451,8 @@ class ContentGenerator:
         This is an alternative fallback method using statistical modeling.
         
         Args:
-            corpus: Markov chain transition probabilities
+            corpus: Markov chain transition weights ({word: {next_word: weight}}),
+                or a compiled MarkovChain (reuse it when generating repeatedly)
             seed_word: Starting word (random if None)
             length: Target length in characters
         
@@ -252,30 +461,8 @@ class ContentGenerator:
         """
         if not corpus:
             return self._generate_fallback("", 0.5, 0.5)["content"]
-        
-        # Start with seed word or random word
-        current_word = seed_word or random.choice(list(corpus.keys()))
-        result = [current_word]
-        
-        # Generate text
-        while len(" ".join(result)) < length and current_word in corpus:
-            # Get next word based on transition probabilities
-            transitions = corpus[current_word]
-            if not transitions:
-                break
-            
-            words = list(transitions.keys())
-            probabilities = list(transitions.values())
-            
-            # Normalize probabilities
-            total = sum(probabilities)
-            probabilities = [p / total for p in probabilities]
-            
-            # Choose next word
-            current_word = random.choices(words, weights=probabilities)[0]
-            result.append(current_word)
-        
-        return " ".join(result)
+        chain = corpus if isinstance(corpus, MarkovChain) else MarkovChain.compile(corpus)
+        return chain.generate(length=length, seed_word=seed_word)
 
 
 # Global content generator instance
@@ -325,9 +512,144 @@ def generate_agent_content(
         diversity_target=prompt_config["diversity_target"]
     )
     
-    # Add agent metadata
+    return _with_agent_metadata(result, agent)
+
+
+def _with_agent_metadata(result, agent) -> Dict[str, any]:
+    """Add the generating agent's id, state and strategy to a result."""
     result["agent_id"] = agent.profile.id
     result["agent_state"] = agent.profile.current_state.name
     result["agent_strategy"] = agent.profile.strategy
-    
     return result
+
+
+# Event loop for concurrent generation, shared by all ticks (and sessions) so
+# async clients and their connections outlive a single tick
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _generation_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) and return the background event loop running content requests."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="content-generation", daemon=True).start()
+        return _loop
+
+
+async def agenerate_contents(
+    prompt_configs,
+    concurrency: int = CONTENT_CONCURRENCY,
+    timeout: float = CONTENT_TIMEOUT_SECONDS
+) -> List[Dict[str, any]]:
+    """Generate content for several prompt configurations concurrently, in order.
+    
+    At most `concurrency` requests are in flight at once and each is bounded by
+    `timeout` (falling back to a template), so the stage takes about as long as
+    its slowest batch of requests rather than the sum of all of them.
+    
+    Args:
+        prompt_configs: Dicts as returned by `Agent.generate_content_prompt_hf`
+    """
+    generator = get_content_generator()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def generate(prompt_config):
+        async with semaphore:
+            return await generator.agenerate_content(
+                prompt=prompt_config["prompt"],
+                temperature=prompt_config["temperature"],
+                max_tokens=prompt_config["max_tokens"],
+                quality_target=prompt_config["quality_target"],
+                diversity_target=prompt_config["diversity_target"],
+                timeout=timeout
+            )
+    
+    return await asyncio.gather(*(generate(config) for config in prompt_configs))
+
+
+def generate_contents(prompt_configs, **kwargs) -> List[Dict[str, any]]:
+    """Blocking entry point for `agenerate_contents` (callable from any thread).
+    
+    Without an HF client every result is local fallback content, generated
+    inline as one batch without touching the event loop.
+    """
+    generator = get_content_generator()
+    if not generator.client:
+        return generator.generate_fallback_batch(
+            [config["quality_target"] for config in prompt_configs],
+            [config["diversity_target"] for config in prompt_configs]
+        )
+    coroutine = agenerate_contents(prompt_configs, **kwargs)
+    return asyncio.run_coroutine_threadsafe(coroutine, _generation_loop()).result()
+
+
+def generate_agent_contents(agents, temperature: float = 0.7, max_tokens: int = 100, **kwargs) -> List[Dict[str, any]]:
+    """`generate_agent_content` for several agents, with requests sent concurrently.
+    
+    Offline with the Markov fallback, posts are written from each agent's own
+    content history (see `generate_markov_posts`).
+    """
+    generator = get_content_generator()
+    if not generator.client:
+        if generator.fallback == "markov":
+            return generate_markov_posts(agents)
+        results = generator.generate_fallback_batch(
+            [agent.profile.quality for agent in agents],
+            [agent.profile.diversity for agent in agents]
+        )
+        return [_with_agent_metadata(result, agent) for result, agent in zip(results, agents)]
+    prompt_configs = [agent.generate_content_prompt_hf(temperature, max_tokens) for agent in agents]
+    results = generate_contents(prompt_configs, **kwargs)
+    return [_with_agent_metadata(result, agent) for result, agent in zip(results, agents)]
+
+
+_base_chain: Optional[MarkovChain] = None
+
+
+def base_markov_chain() -> MarkovChain:
+    """Markov chain over every filled-in fallback template (compiled once)."""
+    global _base_chain
+    if _base_chain is None:
+        texts = [
+            template.format(topic=topic, emoji=emoji) + addition
+            for template in FALLBACK_TEMPLATES
+            for topic in FALLBACK_TOPICS
+            for emoji in FALLBACK_EMOJIS
+            for addition in ["", *FALLBACK_ADDITIONS]
+        ]
+        _base_chain = MarkovChain.compile(build_corpus(texts))
+    return _base_chain
+
+
+def generate_markov_posts(agents, length: int = 100, min_corpus_words: int = 20, rng=random) -> List[Dict[str, any]]:
+    """Generate one post per agent offline, in the agent's own voice where possible.
+    
+    Each agent's chain is compiled once from its content history; agents with
+    less than `min_corpus_words` distinct words of history use the base chain.
+    
+    Args:
+        agents: Agents to write for
+        length: Target post length in characters
+        min_corpus_words: Vocabulary needed before an agent gets its own chain
+        rng: Source of randomness (`random` module or a `random.Random`)
+    """
+    results = []
+    for agent in agents:
+        corpus = agent._build_markov_corpus()
+        chain = MarkovChain.compile(corpus) if len(corpus) >= min_corpus_words else base_markov_chain()
+        content = chain.generate(length=length, rng=rng)
+        results.append(_with_agent_metadata({
+            "content": content,
+            "method": "markov",
+            "model": "markov",
+            "word_count": len(content.split()),
+            "char_count": len(content),
+            "quality_score": agent.profile.quality,
+            "temperature": 0.7,
+            "quality_target": agent.profile.quality,
+            "diversity_target": agent.profile.diversity
+        }, agent))
+    return results
@@ -0,0 +1,256 @@
+"""
+Bounded per-agent store of generated posts, spilling old posts to disk.
+
+Each agent keeps its most recent `window` posts in memory, in
+`agent._current_tick_content` (what snapshots, the activity feed and the
+Markov fallback read). When a post falls out of the window it is appended
+to a spill buffer. Every SPILL_CHUNK posts, the buffer is written as one
+gzip member at the end of a per-environment log file, so the file is a
+valid multi-member .jsonl.gz. An in-memory index records, per agent, the
+tick of each spilled post and the chunk holding it: two integers per post
+instead of the post itself. The log's descriptor is shared by the store
+and any exports reading it, and closed once none of them holds it.
+
+Pending placeholders (see `content_worker`) are never spilled. Posts leave
+the window oldest first and stop at the first pending one, so each
+agent's spilled ticks stay in increasing order and can be searched with
+bisect.
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_WINDOW = int(os.getenv("CONTENT_WINDOW", "20"))
+CONTENT_SPILL_DIR = os.getenv("CONTENT_SPILL_DIR") or None  # None = system temp dir
+
+SPILL_CHUNK = 64  # Posts per gzip member in the spill log
+
+
+class _SpillLog:
+    """Descriptor of a spill log, closed when the last reference goes away.
+
+    A reset drops the store's reference and unlinks the file; exports that
+    captured the log keep reading it until they finish or are discarded
+    (even if they never started streaming).
+    """
+
+    __slots__ = ("fd",)
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def __del__(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class ContentStore:
+    """Recent posts per agent in memory, older posts in a compressed log."""
+
+    def __init__(self, env, window=CONTENT_WINDOW, spill_dir=CONTENT_SPILL_DIR):
+        """
+        Args:
+            env: Environment whose agents' posts are stored
+            window: Posts kept in memory per agent (at least 1)
+            spill_dir: Directory of the spill log (None = system temp dir)
+        """
+        self.env = env
+        self.window = max(1, window)
+        self.spill_dir = spill_dir
+        self._lock = threading.Lock()
+        self._log: Optional[_SpillLog] = None
+        self.path = None
+        self._agents: Dict[object, object] = {}  # agent_id -> agent, for get()
+        self._agents_indexed = 0  # Agents are only ever appended to env.agents
+        self._reset_spill()
+
+    def _reset_spill(self):
+        self._chunks: List[Tuple[int, int]] = []  # (offset, length) of each gzip member
+        self._buffer: List[tuple] = []  # (agent_id, post) waiting for the next chunk
+        self._index: Dict[object, Tuple[array, array]] = {}  # agent_id -> (ticks, chunk numbers)
+        self.spilled = 0
+
+    # ------------------------------------------------------------------
+    # Writing (on the environment's writer)
+    # ------------------------------------------------------------------
+    def add(self, agent, post):
+        """Append `post` to the agent's window, spilling what no longer fits."""
+        recent = getattr(agent, "_current_tick_content", None)
+        if recent is None:
+            recent = agent._current_tick_content = []
+        recent.append(post)
+        self.trim(agent)
+
+    def trim(self, agent):
+        """Spill the agent's oldest finished posts beyond `window`."""
+        recent = getattr(agent, "_current_tick_content", None)
+        if not recent or len(recent) <= self.window:
+            return
+        excess = len(recent) - self.window
+        spill = 0
+        while spill < excess and not recent[spill].get("pending"):
+            spill += 1
+        if not spill:
+            return
+        agent_id = agent.profile.id
+        with self._lock:
+            ticks, chunk_numbers = self._index.setdefault(agent_id, (array("q"), array("l")))
+            for post in recent[:spill]:
+                ticks.append(post.get("tick", -1))
+                chunk_numbers.append(len(self._chunks))  # The chunk the buffer becomes
+                self._buffer.append((agent_id, post))
+            self.spilled += spill
+            if len(self._buffer) >= SPILL_CHUNK:
+                self._flush()
+        del recent[:spill]
+
+    def _flush(self):
+        """Write the spill buffer as one gzip member (caller holds the lock)."""
+        if self._log is None:
+            fd, self.path = tempfile.mkstemp(prefix="content-", suffix=".jsonl.gz", dir=self.spill_dir)
+            self._log = _SpillLog(fd)
+        lines = "\n".join(json.dumps([agent_id, post], default=str) for agent_id, post in self._buffer)
+        data = gzip.compress(lines.encode("utf-8"))
+        offset = os.lseek(self._log.fd, 0, os.SEEK_END)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._log.fd, view):]
+        self._chunks.append((offset, len(data)))
+        self._buffer = []
+
+    def clear(self):
+        """Forget every post: empty the windows and delete the spill log."""
+        for agent in self.env.agents:
+            if getattr(agent, "_current_tick_content", None):
+                agent._current_tick_content = []
+        with self._lock:
+            self._close()
+            self._reset_spill()
+
+    def _close(self):
+        if self._log is not None:
+            self._log = None  # Closed once readers that captured it are done
+            try:
+                os.unlink(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove content spill log {self.path}: {e}")
+            self.path = None
+
+    def _on_event(self, env, event):
+        if event in ("reset", "evict"):
+            self.clear()
+            if event == "evict":
+                env.tick_listeners.remove(self._on_event)
+                env.extensions.pop("content_store", None)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _read_chunk(fd, offset, length) -> List[tuple]:
+        data = gzip.decompress(os.pread(fd, length, offset))
+        return [tuple(json.loads(line)) for line in data.decode("utf-8").split("\n")]
+
+    def _agent(self, agent_id):
+        agents = self.env.agents
+        if self._agents_indexed != len(agents):
+            for agent in agents[self._agents_indexed:]:
+                self._agents.setdefault(agent.profile.id, agent)
+            self._agents_indexed = len(agents)
+        return self._agents.get(agent_id)
+
+    def get(self, agent_id, tick) -> Optional[dict]:
+        """The agent's post at `tick`, from memory or the spill log (None if unknown)."""
+        agent = self._agent(agent_id)
+        if agent is not None:
+            for post in reversed(getattr(agent, "_current_tick_content", ())):
+                if post.get("tick") == tick:
+                    return post
+        with self._lock:
+            ticks, chunk_numbers = self._index.get(agent_id, ((), ()))
+            i = bisect_left(ticks, tick)
+            if i == len(ticks) or ticks[i] != tick:
+                return None
+            number = chunk_numbers[i]
+            if number == len(self._chunks):
+                posts = self._buffer
+            else:
+                posts = self._read_chunk(self._log.fd, *self._chunks[number])
+        for post_agent, post in posts:
+            if post_agent == agent_id and post.get("tick") == tick:
+                return post
+        return None
+
+    def posts(self, agent_ids: Optional[Iterable] = None, tick_from=None, tick_to=None) -> Iterator[dict]:
+        """Stored posts, oldest first, with an "agent_id" key (for exports).
+
+        Call on the environment's writer (e.g. `actor.call(store.posts)`): the
+        posts stored so far are captured then, and the returned iterator can
+        be consumed from any thread afterwards.
+
+        Args:
+            agent_ids: Agents to include (default: all)
+            tick_from: First tick to include (inclusive)
+            tick_to: Last tick to include (inclusive)
+        """
+        wanted = set(agent_ids) if agent_ids is not None else None
+        recent = [
+            (agent.profile.id, post)
+            for agent in self.env.agents
+            for post in getattr(agent, "_current_tick_content", ())
+            if not post.get("pending")
+        ]
+        with self._lock:
+            chunks = list(self._chunks)
+            buffered = list(self._buffer)
+            # Holding the log keeps it readable if a reset unlinks it meanwhile
+            log = self._log
+        return self._iter_posts(log, chunks, buffered + recent, wanted, tick_from, tick_to)
+
+    def _iter_posts(self, log, chunks, in_memory, wanted, tick_from, tick_to):
+        def selected(posts):
+            for agent_id, post in posts:
+                tick = post.get("tick", -1)
+                if wanted is not None and agent_id not in wanted:
+                    continue
+                if (tick_from is not None and tick < tick_from) or (tick_to is not None and tick > tick_to):
+                    continue
+                yield {**post, "agent_id": agent_id}
+
+        for offset, length in chunks:
+            yield from selected(self._read_chunk(log.fd, offset, length))
+        yield from selected(in_memory)
+
+    def stats(self) -> dict:
+        in_memory = sum(len(getattr(agent, "_current_tick_content", ())) for agent in self.env.agents)
+        with self._lock:
+            return {
+                "in_memory": in_memory,
+                "spilled": self.spilled,
+                "chunks": len(self._chunks),
+                "spill_bytes": sum(length for _, length in self._chunks),
+            }
+
+
+def content_store_for(env) -> ContentStore:
+    """The content store attached to `env`, created on first use."""
+    store = env.extensions.get("content_store")
+    if store is not None:
+        return store
+    with env.lock:
+        store = env.extensions.get("content_store")
+        if store is None:
+            store = env.extensions["content_store"] = ContentStore(env)
+            env.tick_listeners.append(store._on_event)
+        return store
@@ -0,0 +1,195 @@
+"""
+Background generation of post text, off the tick's critical path.
+
+Post text is only displayed (in the activity feed); rewards never depend on
+it. So instead of generating it inside `Environment.tick`, a tick that wants
+text announces its posts (the "posts" event) and `ContentWorker` queues one
+"agent X posted at tick T" event per agent. Each agent immediately gets a
+pending placeholder for tick T, which the UI renders as "writing...". A
+single worker thread drains the queue in batches (requests within a batch
+are concurrent, see `content_generator.generate_contents`) and attaches the
+text through the environment's actor once it is ready. Posts are kept in the
+environment's `ContentStore`, which bounds what each agent holds in memory.
+
+The queue is bounded: when it is full, the oldest events are dropped (their
+placeholders removed), so a fast auto-run or a slow text endpoint can never
+make it grow without limit or delay the simulation.
+"""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from simulation.actor import actor_for
+from simulation.content_generator import CONTENT_CONCURRENCY, generate_contents
+from simulation.content_store import content_store_for
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUED = 256  # Post events waiting for text, across all environments
+
+
+@dataclass(frozen=True)
+class PostEvent:
+    """One agent's post at one tick, with everything needed to write its text."""
+    env: object
+    run_id: str
+    tick: int
+    agent_id: object
+    prompt_config: dict
+    metadata: dict  # Agent id, state and strategy when the post was made
+
+
+def _pending(tick):
+    return {"tick": tick, "pending": True, "content": "", "method": "pending"}
+
+
+class ContentWorker:
+    """Generate post text for watched environments on a background thread."""
+
+    def __init__(self, max_queued=DEFAULT_MAX_QUEUED, batch_size=CONTENT_CONCURRENCY):
+        self.max_queued = max_queued
+        self.batch_size = max(1, batch_size)
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self.queued = 0
+        self.generated = 0
+        self.dropped = 0
+
+    def watch(self, env):
+        """Generate text for `env`'s posts from now on (no-op if already watched)."""
+        if env.extensions.get("content_worker") is self:
+            return
+        with env.lock:
+            if env.extensions.get("content_worker") is not self:
+                env.extensions["content_worker"] = self
+                env.tick_listeners.append(self._on_event)
+                # Placeholders restored from a snapshot have no event behind them
+                self._discard(env)
+
+    def _on_event(self, env, event):
+        if event == "posts":
+            self._enqueue(env)
+        elif event in ("reset", "evict"):
+            self._discard(env)
+            if event == "evict":
+                env.tick_listeners.remove(self._on_event)
+                env.extensions.pop("content_worker", None)
+
+    # ------------------------------------------------------------------
+    # Producer side (inside the tick, on the environment's writer)
+    # ------------------------------------------------------------------
+    def _enqueue(self, env):
+        events = []
+        store = content_store_for(env)
+        for agent in env.agents:
+            store.add(agent, _pending(env.tick_count))
+            events.append(PostEvent(
+                env=env,
+                run_id=env.run_id,
+                tick=env.tick_count,
+                agent_id=agent.profile.id,
+                prompt_config=agent.generate_content_prompt_hf(),
+                metadata={
+                    "agent_id": agent.profile.id,
+                    "agent_state": agent.profile.current_state.name,
+                    "agent_strategy": agent.profile.strategy,
+                },
+            ))
+        dropped = []
+        with self._condition:
+            for event in events:
+                if len(self._events) >= self.max_queued:
+                    dropped.append(self._events.popleft())
+                self._events.append(event)
+            self.queued += len(events)
+            self.dropped += len(dropped)
+            self._start()
+            self._condition.notify()
+        self._deliver([(event, None) for event in dropped])
+
+    def _discard(self, env):
+        """Forget `env`'s queued events and placeholders (its run is over)."""
+        with self._condition:
+            self._events = deque(event for event in self._events if event.env is not env)
+        for agent in env.agents:
+            content = getattr(agent, "_current_tick_content", None)
+            if content:
+                agent._current_tick_content = [c for c in content if not c.get("pending")]
+
+    # ------------------------------------------------------------------
+    # Consumer side (worker thread)
+    # ------------------------------------------------------------------
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="content-worker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._events:
+                    self._condition.wait()
+                batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+            try:
+                results = generate_contents([event.prompt_config for event in batch])
+            except Exception as e:
+                logger.warning(f"Content generation failed for {len(batch)} posts: {e}")
+                results = [None] * len(batch)
+            self.generated += sum(result is not None for result in results)
+            self._deliver(list(zip(batch, results)))
+
+    def _deliver(self, items):
+        """Attach results (None = drop the placeholder) via each environment's actor."""
+        by_env = {}
+        for event, result in items:
+            by_env.setdefault(id(event.env), (event.env, []))[1].append((event, result))
+        for env, env_items in by_env.values():
+            actor_for(env).submit(_attach, env, env_items)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "queued": self.queued,
+                "waiting": len(self._events),
+                "generated": self.generated,
+                "dropped": self.dropped,
+            }
+
+
+def _attach(env, items):
+    """Replace each event's pending placeholder with its text (an actor command)."""
+    agents = {agent.profile.id: agent for agent in env.agents}
+    store = content_store_for(env)
+    for event, result in items:
+        agent = agents.get(event.agent_id)
+        if agent is None or env.run_id != event.run_id:
+            continue
+        content = getattr(agent, "_current_tick_content", [])
+        for i, entry in enumerate(content):
+            if entry.get("pending") and entry.get("tick") == event.tick:
+                if result is None:
+                    del content[i]
+                else:
+                    content[i] = {**result, **event.metadata, "tick": event.tick}
+                break
+        # Finished posts beyond the window can now be spilled
+        store.trim(agent)
+
+
+_worker: Optional[ContentWorker] = None
+_worker_lock = threading.Lock()
+
+
+def content_worker_for(env) -> ContentWorker:
+    """The shared content worker, watching `env` (started on first use)."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = ContentWorker()
+    _worker.watch(env)
+    return _worker
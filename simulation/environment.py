@@ -1,18 +1,25 @@
+import logging
+import os
 import random
+import threading
+import uuid
+from contextvars import ContextVar
 from simulation.policy_engine import PolicyEngine, PolicyConfig
 from simulation.policy_engine.config import OPTIMAL_POLICY_CONFIG
 from simulation.agents.agent import Agent
+from simulation.agents.profile import AgentProfile
+from simulation.history import ColumnarHistory
+from simulation.scenarios import ALL_SCENARIOS
+from simulation.trajectory_archive import TrajectoryArchive
 
-# Optional: Import content generator (gracefully handles missing dependencies)
-try:
-    from simulation.content_generator import generate_agent_content
-    CONTENT_GENERATION_ENABLED = True
-except ImportError:
-    CONTENT_GENERATION_ENABLED = False
+logger = logging.getLogger(__name__)
+
+# History entries each agent keeps in RAM when trajectories go to an on-disk archive
+AGENT_HISTORY_WINDOW = int(os.getenv("AGENT_HISTORY_WINDOW", "50"))
 
 # Utility: compute platform volatility
-def compute_volatility():
-    return random.random() * 0.5
+def compute_volatility(rng=random):
+    return rng.random() * 0.5
 
 # Utility: ensure state history tracking
 def ensure_state_history(agent):
@@ -28,6 +35,24 @@ def update_state_history(agent):
     else:
         agent.profile.state_history.append((agent.profile.current_state.name, 1))
 
+# Utility: pick the history store (mmap archive when TRAJECTORY_ARCHIVE_PATH is set;
+# `suffix` gives each session environment its own archive file)
+def default_history_store(suffix=None):
+    path = os.getenv("TRAJECTORY_ARCHIVE_PATH")
+    if not path:
+        return ColumnarHistory()
+    return TrajectoryArchive(f"{path}.{suffix}" if suffix else path)
+
+def close_history(env):
+    """Flush an on-disk history store's header and release its mapping (e.g. at shutdown)."""
+    close = getattr(env.history_columns, "close", None)
+    if close is not None:
+        with env.lock:
+            close()
+
+# Environment bound to the current request/task (see current_environment())
+_CURRENT_ENVIRONMENT = ContextVar("current_environment", default=None)
+
 # Main Environment Class
 class Environment:
     """Simulation environment managing agents and policy enforcement.
@@ -43,12 +68,17 @@ class Environment:
     
     TICK_DURATION_DAYS = 1  # Each tick represents 1 day
 
-    def __init__(self, agents=None, policy_config=None):
+    def __init__(self, agents=None, policy_config=None, seed=None, history_store=None):
+        # Each environment draws from its own RNG, so a run can be reproduced from
+        # its recorded seed regardless of what other environments do
+        self.reseed(seed)
+
         self.agents = agents or []
         self.policy_engine = PolicyEngine(policy_config or OPTIMAL_POLICY_CONFIG)
         self.last_tick_explanations = []
         self.current_scenario = None  # Track which scenario is loaded
         self.tick_count = 0
+        self.run_id = uuid.uuid4().hex  # Changes on reset so cached exports of old runs never match
         
         # History tracking for charts (last 20 ticks)
         self.history = {
@@ -63,42 +93,117 @@ class Environment:
         }
         self.max_history_length = 20
 
+        # Full per-agent trajectories in typed columns (feeds the data exports).
+        # Pass a TrajectoryArchive to keep very long runs on disk instead of in RAM.
+        self.history_columns = history_store if history_store is not None else ColumnarHistory()
+
+        # Callables notified as listener(env, event) after each "tick" and "reset"
+        self.tick_listeners = []
+        # Serialises ticks and resets coming from request handlers and the auto-run loop
+        self.lock = threading.RLock()
+        # Per-process helpers attached to this environment (auto-runner, SSE broadcaster)
+        self.extensions = {}
+
+    def __getstate__(self):
+        # Locks, listeners and extensions (SSE broadcasters, runners) belong to the live process
+        state = self.__dict__.copy()
+        del state["lock"]
+        state["tick_listeners"] = []
+        state["extensions"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+        if "rng" not in state:
+            # Saved before environments had their own RNG
+            self.rng = random.Random(self.seed)
+
+    def reseed(self, seed=None):
+        """Restart the simulation RNG from `seed` (a fresh random seed if None)."""
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.rng = random.Random(self.seed)
+
     def volatility(self):
-        return compute_volatility()
+        return compute_volatility(self.rng)
 
     def tick(self, generate_text_content=True):
         """Run a single simulation tick: generate content, apply rewards, update state, record telemetry.
         
         Args:
-            generate_text_content: If True and HF is available, generate actual text content
+            generate_text_content: If True, write text for this tick's posts. With a
+                ContentWorker watching this environment (`ContentWorker.watch(env)`) the
+                text is generated in the background; otherwise it is generated inline.
         """
-        self.last_tick_explanations = []
-        self.tick_count += 1
+        with self.lock:
+            self.last_tick_explanations = []
+            self.tick_count += 1
         
-        # Step 1: Agent Action - Content Generation
-        # Agents decide how much content to post based on strategy and previous rewards
-        for agent in self.agents:
-            posts_count = agent.simulate_content_generation()
+            # Step 1: Agent Action - Content Generation
+            # Agents decide how much content to post based on strategy and previous rewards
+            for agent in self.agents:
+                agent.simulate_content_generation()
             
-            # Optional: Generate actual text content using HF
-            if generate_text_content and CONTENT_GENERATION_ENABLED:
-                try:
-                    content_result = generate_agent_content(agent)
-                    # Store generated content in agent's current tick data
-                    if not hasattr(agent, '_current_tick_content'):
-                        agent._current_tick_content = []
-                    agent._current_tick_content.append(content_result)
-                except Exception as e:
-                    # Silently fail - content generation is optional
-                    pass
-        
-        # Step 2: Policy Application & Reward Calculation
+            # Optional: post text. A content worker generates it in the background and
+            # attaches it when ready, so ticks never wait on it
+            if generate_text_content:
+                if "content_worker" in self.extensions:
+                    self._notify("posts")
+                else:
+                    self._generate_content_inline()
+        
+            # Step 2: Policy Application & Reward Calculation
+            for agent in self.agents:
+                self.policy_engine.apply(agent, self)  # Updates agent state and logs telemetry
+                update_state_history(agent)
+        
+            # Step 3: Record history for charts and exports
+            self._record_history()
+            self.history_columns.record_tick(self.tick_count, self.agents)
+            if getattr(self.history_columns, "on_disk", False):
+                self._trim_agent_history()
+            self._notify("tick")
+
+    def _generate_content_inline(self):
+        """Write this tick's post text now (no content worker is attached)."""
+        # Imported here so the simulation core loads without the generator's dependencies
+        from simulation.content_generator import generate_agent_contents
+        from simulation.content_store import content_store_for
+
+        try:
+            results = generate_agent_contents(self.agents)
+        except Exception as e:
+            # Content generation is optional; the tick goes on without text
+            logger.warning(f"Inline content generation failed: {e}")
+            return
+        store = content_store_for(self)
+        for agent, result in zip(self.agents, results):
+            store.add(agent, {**result, "tick": self.tick_count})
+
+    def _trim_agent_history(self):
+        """Keep the last AGENT_HISTORY_WINDOW entries per agent; the archive has the rest.
+
+        Trims only once a history reaches twice the window, and replaces the
+        list rather than cutting it in place: snapshots share the old list.
+        """
+        window = max(1, AGENT_HISTORY_WINDOW)
         for agent in self.agents:
-            self.policy_engine.apply(agent, self)  # Updates agent state and logs telemetry
-            update_state_history(agent)
+            if len(agent.history) >= 2 * window:
+                agent.history = agent.history[-window:]
+
+    def run(self, ticks, generate_text_content=False):
+        """Run several ticks back to back under one lock hold.
         
-        # Step 3: Record history for charts
-        self._record_history()
+        Text generation is off by default so fast-forwarding costs simulation
+        time only.
+        
+        Args:
+            ticks: Number of ticks to run
+            generate_text_content: Request text content for every tick's posts
+        """
+        with self.lock:
+            for _ in range(ticks):
+                self.tick(generate_text_content)
 
     def add_agent(self, agent: Agent):
         self.agents.append(agent)
@@ -108,32 +213,51 @@ class Environment:
         
         This encapsulates all reset logic, preventing external code from
         needing knowledge of agent and environment internals.
+
+        The RNG restarts from `seed` and every agent's initial traits are
+        drawn from it again (then the loaded scenario's trait overrides are
+        reapplied), so the run after a reset matches a fresh environment
+        built from the same seed. Call `reseed()` first to start a new run.
         """
-        # Reset all agents to initial state
-        for agent in self.agents:
-            agent.history = []
-            agent.decision_trace = []
-            
-            # Reset traits to initial values (keeping personality traits)
-            agent.profile.burnout = 0.2  # Fresh start
-            agent.profile.arousal_level = 0.5  # Moderate baseline
-            # Keep addiction_drive, emotional_resilience as personality traits
+        with self.lock:
+            self.reseed(self.seed)
+            scenario = ALL_SCENARIOS.get(self.current_scenario)
+            overrides = (scenario.agent_overrides if scenario else None) or {}
+            for agent in self.agents:
+                agent.history = []
+                agent.decision_trace = []
+                agent.reset_totals()
+                # Same draws, in the same order, as agents bootstrapped from `rng`
+                agent.profile = AgentProfile(id=agent.profile.id, rng=self.rng)
+                for name, value in overrides.items():
+                    setattr(agent.profile, name, value)
         
-        # Reset environment state
-        self.tick_count = 0
-        self.last_tick_explanations = []
+            # Reset environment state
+            self.tick_count = 0
+            self.run_id = uuid.uuid4().hex
+            self.last_tick_explanations = []
+            self.history_columns.clear()
         
-        # Clear history tracking
-        self.history = {
-            "ticks": [],
-            "health_score": [],
-            "avg_burnout": [],
-            "avg_addiction": [],
-            "avg_resilience": [],
-            "avg_arousal": [],  # Track arousal over time
-            "state_distribution": [],
-            "avg_reward": [],
-        }
+            # Clear history tracking
+            self.history = {
+                "ticks": [],
+                "health_score": [],
+                "avg_burnout": [],
+                "avg_addiction": [],
+                "avg_resilience": [],
+                "avg_arousal": [],  # Track arousal over time
+                "state_distribution": [],
+                "avg_reward": [],
+            }
+            self._notify("reset")
+
+    def _notify(self, event):
+        """Call tick listeners; a failing listener never breaks the simulation."""
+        for listener in list(self.tick_listeners):
+            try:
+                listener(self, event)
+            except Exception as e:
+                logger.warning(f"Tick listener failed on {event}: {e}")
     
     def _record_history(self):
         """Record current state to history for time-series charts."""
@@ -163,6 +287,26 @@ class Environment:
             if len(self.history[key]) > self.max_history_length:
                 self.history[key] = self.history[key][-self.max_history_length:]
 
+    def agent_series(self, agent, field, last=None):
+        """Recent values of one history field for an agent (e.g. for sparklines).
+
+        Reads straight from the trajectory archive when one is configured,
+        otherwise from the agent's in-memory history entries.
+        """
+        series = getattr(self.history_columns, "agent_series", None)
+        if series is not None:
+            return series(agent.profile.id, field, last)
+        entries = agent.history if last is None else agent.history[-last:]
+        return [entry.get(field, 0) for entry in entries]
+
+    def data_version(self):
+        """Identify the current data state: (run, tick, policy config version).
+
+        Anything derived purely from the run's history and policy config (exports,
+        rendered charts) can be cached under this key.
+        """
+        return (self.run_id, self.tick_count, self.policy_engine.config_version)
+
     def get_simulated_time(self):
         """Convert current tick count to human-readable time.
         
@@ -245,4 +389,13 @@ class Environment:
         }
 
 # Global environment instance for use across UI
-GLOBAL_ENVIRONMENT = Environment()
\ No newline at end of file
+GLOBAL_ENVIRONMENT = Environment(history_store=default_history_store())
+
+def current_environment():
+    """Environment for the current request (its session's), else GLOBAL_ENVIRONMENT."""
+    env = _CURRENT_ENVIRONMENT.get()
+    return env if env is not None else GLOBAL_ENVIRONMENT
+
+def bind_environment(env):
+    """Make `env` the current environment for this request/task (returns a contextvars Token)."""
+    return _CURRENT_ENVIRONMENT.set(env)
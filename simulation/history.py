@@ -0,0 +1,191 @@
+"""
+Columnar per-agent history buffers.
+
+`Agent.history` keeps one dict per agent per tick for the UI (only the most
+recent ones when the store is on disk). This module keeps the same
+trajectories as typed, append-only columns (one `array.array` per field) so
+exports can hand contiguous buffers to analysis tools instead of re-walking
+every dict.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# (column name, array typecode). Categorical columns use None and are stored
+# as integer codes into a per-column category list.
+HISTORY_COLUMNS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("agent_id", "q"),
+    ("tick", "q"),
+    ("state", None),
+    ("strategy", None),
+    ("final_reward", "d"),
+    ("cpm_earnings", "d"),
+    ("posts_generated", "d"),
+    ("burnout", "d"),
+    ("addiction_drive", "d"),
+    ("emotional_resilience", "d"),
+    ("arousal_level", "d"),
+    ("quality", "d"),
+    ("diversity", "d"),
+    ("consistency", "d"),
+)
+
+CATEGORY_TYPECODE = "H"  # uint16 category codes
+COLUMN_NAMES = tuple(name for name, _ in HISTORY_COLUMNS)
+CATEGORICAL_COLUMNS = tuple(name for name, code in HISTORY_COLUMNS if code is None)
+
+
+def history_row(tick, agent) -> Dict[str, object]:
+    """Extract one history row for an agent after a tick has been applied.
+
+    Trait columns come from the live profile; reward columns come from the
+    agent's latest history entry (the reward breakdown for this tick).
+    """
+    p = agent.profile
+    entry = agent.history[-1] if agent.history else {}
+    return {
+        "agent_id": p.id,
+        "tick": tick,
+        "state": p.current_state.name,
+        "strategy": p.strategy,
+        "final_reward": entry.get("final_reward", 0.0),
+        "cpm_earnings": entry.get("cpm_earnings", 0.0),
+        "posts_generated": entry.get("posts_generated", 0.0),
+        "burnout": p.burnout,
+        "addiction_drive": p.addiction_drive,
+        "emotional_resilience": p.emotional_resilience,
+        "arousal_level": p.arousal_level,
+        "quality": entry.get("quality", 0.0),
+        "diversity": entry.get("diversity", 0.0),
+        "consistency": entry.get("consistency", 0.0),
+    }
+
+
+class ColumnarHistory:
+    """Append-only, tick-major columnar store of agent trajectories.
+
+    Rows are appended one tick at a time (all agents for tick T, then T+1, ...)
+    so a tick range always maps to a contiguous row range.
+    """
+
+    on_disk = False
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Drop all recorded rows."""
+        self.columns: Dict[str, array] = {
+            name: array(code or CATEGORY_TYPECODE) for name, code in HISTORY_COLUMNS
+        }
+        self.categories: Dict[str, List[str]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self._category_codes: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        # One entry per recorded tick: the tick number and its first row offset
+        self.ticks = array("q")
+        self.tick_offsets = array("q")
+        # Row numbers of each agent, ascending (for per-agent reads)
+        self.agent_row_numbers: Dict[object, array] = {}
+
+    def __len__(self):
+        return len(self.columns["tick"])
+
+    def record_tick(self, tick, agents):
+        """Append one row per agent for the given tick."""
+        if not agents:
+            return
+        self.ticks.append(tick)
+        self.tick_offsets.append(len(self))
+        for agent in agents:
+            row = history_row(tick, agent)
+            self.agent_row_numbers.setdefault(agent.profile.id, array("q")).append(len(self))
+            for name, code in HISTORY_COLUMNS:
+                value = row[name]
+                if code is None:
+                    value = self._encode(name, value)
+                elif code == "d":
+                    value = float(value)
+                else:
+                    value = int(value)
+                self.columns[name].append(value)
+
+    def _encode(self, name, value):
+        codes = self._category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return code
+
+    def decode(self, name, code):
+        """Map a category code back to its string value."""
+        return self.categories[name][code]
+
+    def row_range(self, tick_from=None, tick_to=None) -> Tuple[int, int]:
+        """Return the (start, stop) row slice covering ticks in [tick_from, tick_to]."""
+        first = 0 if tick_from is None else bisect_left(self.ticks, tick_from)
+        last = len(self.ticks) if tick_to is None else bisect_right(self.ticks, tick_to)
+        return self._offset(first), self._offset(last)
+
+    def _offset(self, tick_index):
+        if tick_index >= len(self.tick_offsets):
+            return len(self)
+        return self.tick_offsets[tick_index]
+
+    def tick_chunks(self, chunk_ticks, tick_from=None, tick_to=None) -> Iterator[Tuple[int, int]]:
+        """Yield (start, stop) row slices of at most `chunk_ticks` ticks each."""
+        chunk_ticks = max(1, int(chunk_ticks))
+        first = 0 if tick_from is None else bisect_left(self.ticks, tick_from)
+        last = len(self.ticks) if tick_to is None else bisect_right(self.ticks, tick_to)
+        for i in range(first, last, chunk_ticks):
+            yield self._offset(i), self._offset(min(i + chunk_ticks, last))
+
+    def column(self, name, start=0, stop=None) -> memoryview:
+        """Zero-copy view over rows [start, stop) of a column."""
+        return memoryview(self.columns[name])[start:stop]
+
+    def iter_rows(
+        self,
+        tick_from=None,
+        tick_to=None,
+        agent_ids: Optional[Iterable] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[list]:
+        """Yield decoded rows (lists ordered like `columns`) lazily.
+
+        Args:
+            tick_from: First tick to include (inclusive, None = start of run)
+            tick_to: Last tick to include (inclusive, None = latest tick)
+            agent_ids: Only include these agents (None = all agents)
+            columns: Column names to emit (None = all columns)
+        """
+        columns = list(columns or COLUMN_NAMES)
+        # Capture the current buffers so a concurrent clear() can't swap them mid-stream
+        data = self.columns
+        categories = self.categories
+        start, stop = self.row_range(tick_from, tick_to)
+        selected = [(data[name], categories.get(name)) for name in columns]
+        agent_col = data["agent_id"]
+        wanted = set(agent_ids) if agent_ids is not None else None
+
+        for i in range(start, stop):
+            if wanted is not None and agent_col[i] not in wanted:
+                continue
+            yield [col[i] if cats is None else cats[col[i]] for col, cats in selected]
+
+    def agent_rows(
+        self,
+        agent_id,
+        tick_from=None,
+        tick_to=None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[list]:
+        """Yield one agent's decoded rows (lists ordered like `columns`), oldest first."""
+        columns = list(columns or COLUMN_NAMES)
+        data = self.columns
+        categories = self.categories
+        rows = self.agent_row_numbers.get(agent_id, ())
+        start, stop = self.row_range(tick_from, tick_to)
+        selected = [(data[name], categories.get(name)) for name in columns]
+        for i in rows[bisect_left(rows, start):bisect_left(rows, stop)]:
+            yield [col[i] if cats is None else cats[col[i]] for col, cats in selected]
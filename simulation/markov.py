@@ -0,0 +1,114 @@
+"""
+Compiled first-order Markov text engine.
+
+`build_corpus` counts word transitions in a set of texts (the dict format
+`ContentGenerator.generate_markov_content` has always accepted).
+`MarkovChain.compile` turns such a corpus into flat tables: words are
+integer-coded, each word's successors and their cumulative weights are
+stored contiguously in `array`s (CSR layout), and sampling a successor is a
+`bisect` over that word's slice. Nothing is renormalised per step and the
+output length is tracked incrementally, so generation is linear in the
+number of words produced.
+"""
+
+import random
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+
+Corpus = Dict[str, Dict[str, float]]
+
+
+def build_corpus(texts: Iterable[str]) -> Corpus:
+    """Transition counts between consecutive words of `texts`."""
+    corpus: Corpus = {}
+    for text in texts:
+        words = text.split()
+        for word, following in zip(words, words[1:]):
+            transitions = corpus.setdefault(word, {})
+            transitions[following] = transitions.get(following, 0) + 1
+        if words:
+            corpus.setdefault(words[-1], {})
+    return corpus
+
+
+class MarkovChain:
+    """Integer-coded transition tables with cumulative weights."""
+
+    __slots__ = ("words", "ids", "offsets", "targets", "cumulative", "_starts", "_start_cumulative")
+
+    def __init__(self, words, offsets, targets, cumulative):
+        self.words = words  # id -> word
+        self.ids = {word: i for i, word in enumerate(words)}
+        self.offsets = offsets  # successors of word i are targets[offsets[i]:offsets[i + 1]]
+        self.targets = targets
+        self.cumulative = cumulative  # running weight within each word's slice
+        # Start words: any word with successors, weighted by its outgoing weight
+        self._starts = array("l")
+        self._start_cumulative = array("d")
+        total = 0.0
+        for i in range(len(words)):
+            lo, hi = offsets[i], offsets[i + 1]
+            if hi > lo:
+                total += cumulative[hi - 1]
+                self._starts.append(i)
+                self._start_cumulative.append(total)
+
+    @classmethod
+    def compile(cls, corpus: Corpus) -> "MarkovChain":
+        """Compile a {word: {next_word: weight}} corpus (weights need not be normalised)."""
+        words: List[str] = list(corpus)
+        ids = {word: i for i, word in enumerate(words)}
+        for transitions in corpus.values():
+            for following in transitions:
+                if following not in ids:
+                    ids[following] = len(words)
+                    words.append(following)
+        offsets = array("l", [0])
+        targets = array("l")
+        cumulative = array("d")
+        for word in words:
+            running = 0.0
+            for following, weight in corpus.get(word, {}).items():
+                if weight > 0:
+                    running += weight
+                    targets.append(ids[following])
+                    cumulative.append(running)
+            offsets.append(len(targets))
+        return cls(words, offsets, targets, cumulative)
+
+    def __len__(self):
+        return len(self.words)
+
+    def _next(self, word_id: int, rng) -> Optional[int]:
+        lo, hi = self.offsets[word_id], self.offsets[word_id + 1]
+        if lo == hi:
+            return None
+        # Each word's slice of cumulative weights starts again from zero
+        r = rng.random() * self.cumulative[hi - 1]
+        return self.targets[min(bisect_right(self.cumulative, r, lo, hi), hi - 1)]
+
+    def generate(self, length: int = 50, seed_word: Optional[str] = None, rng=random) -> str:
+        """Walk the chain until the text reaches `length` characters or a dead end.
+
+        Args:
+            length: Target length in characters
+            seed_word: First word (a random start word if None or unknown)
+            rng: Source of randomness (`random` module or a `random.Random`)
+        """
+        if not self._starts:
+            return seed_word or ""
+        word_id = self.ids.get(seed_word)
+        if word_id is None:
+            r = rng.random() * self._start_cumulative[-1]
+            word_id = self._starts[min(bisect_right(self._start_cumulative, r), len(self._starts) - 1)]
+        result = [self.words[word_id]]
+        chars = len(result[0])
+        while chars < length:
+            word_id = self._next(word_id, rng)
+            if word_id is None:
+                break
+            word = self.words[word_id]
+            result.append(word)
+            chars += len(word) + 1
+        return " ".join(result)
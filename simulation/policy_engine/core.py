@@ -1,3 +1,4 @@
+from dataclasses import replace
 from simulation.policy_engine.config import PolicyConfig
 import random
 
@@ -11,9 +12,20 @@ class PolicyEngine:
     """
     
     def __init__(self, config: PolicyConfig):
+        self.config_version = 0  # Bumped on every config assignment (cache invalidation)
         self.config = config
         self.reward_history = []  # Track reward patterns for analysis
 
+    @property
+    def config(self) -> PolicyConfig:
+        return self._config
+
+    @config.setter
+    def config(self, value: PolicyConfig):
+        # Keep a private copy so presets shared between environments are never mutated
+        self._config = replace(value)
+        self.config_version += 1
+
     # ---------------------------------------------------------
     # Main reward computation hook
     # ---------------------------------------------------------
@@ -98,6 +110,7 @@ class PolicyEngine:
         
         # Platform volatility (affects all modes)
         base_rewards["volatility_spike"] = env.volatility() * p.volatility_weight
+        rng = env.rng
         
         # Apply strategy multipliers (from strategy selector)
         strategy_metrics = agent.selector.get_strategy_metrics(pr.strategy)
@@ -108,7 +121,7 @@ class PolicyEngine:
 
         # === PLATFORM ALGORITHM NOISE ===
         # Real platforms have algorithmic variability (A/B tests, recommendation randomness)
-        algorithm_noise = random.gauss(1.0, 0.25)  # ±25% variance from algorithm
+        algorithm_noise = rng.gauss(1.0, 0.25)  # ±25% variance from algorithm
         
         # === VIRAL MECHANICS ===
         # Exceptional content can go viral (power-law distribution)
@@ -116,22 +129,22 @@ class PolicyEngine:
         if pr.quality > 0.75 and pr.diversity > 0.65:
             # High quality + diverse content has viral potential
             # Use Pareto distribution for long-tail viral hits
-            viral_roll = random.random()
+            viral_roll = rng.random()
             if viral_roll < 0.05:  # 5% chance of viral content
-                viral_multiplier = random.paretovariate(1.5)  # Power-law: most 1-3x, rare 10x+
+                viral_multiplier = rng.paretovariate(1.5)  # Power-law: most 1-3x, rare 10x+
         
         # === CONTENT FAILURE PENALTY ===
         # Low quality content can backfire (negative engagement, backlash)
         failure_penalty = 0.0
         if pr.quality < 0.3 or pr.consistency < 0.2:
             # Poor quality or inconsistent content gets penalized
-            failure_penalty = -random.uniform(0.05, 0.15)
+            failure_penalty = -rng.uniform(0.05, 0.15)
         
         # Apply mode-specific transformations
         if p.mode == "intermittent":
-            rewards = self._apply_intermittent(base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty)
+            rewards = self._apply_intermittent(base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty, rng)
         elif p.mode == "hybrid":
-            rewards = self._apply_hybrid(base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty)
+            rewards = self._apply_hybrid(base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty, rng)
         else:  # differential
             rewards = base_rewards
             # Calculate final_reward excluding cpm_earnings (it's a tracking metric, not a reward)
@@ -160,7 +173,7 @@ class PolicyEngine:
     # ---------------------------------------------------------
     def apply(self, agent, env):
         rewards = self.compute_rewards(agent, env)
-        agent.update_state(rewards, self.config, current_tick=env.tick_count)
+        agent.update_state(rewards, self.config, current_tick=env.tick_count, rng=env.rng)
 
         env.last_tick_explanations.append({
             "agent_id": agent.profile.id,
@@ -172,7 +185,7 @@ class PolicyEngine:
     # ---------------------------------------------------------
     # Intermittent reinforcement (the "bad" approach)
     # ---------------------------------------------------------
-    def _apply_intermittent(self, base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty):
+    def _apply_intermittent(self, base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty, rng=random):
         """Apply intermittent reinforcement - unpredictable, addictive.
         
         Key characteristics:
@@ -184,7 +197,7 @@ class PolicyEngine:
         p = self.config
         
         # Random chance of getting ANY reward
-        if random.random() > p.intermittent_probability:
+        if rng.random() > p.intermittent_probability:
             # No reward this tick - drives anxiety and compulsive checking
             return {
                 "final_reward": failure_penalty,  # Can still get failure penalty
@@ -193,7 +206,7 @@ class PolicyEngine:
             }
         
         # When reward DOES come, add high variance (jackpot effect)
-        variance_multiplier = random.uniform(0.5, p.intermittent_variance)
+        variance_multiplier = rng.uniform(0.5, p.intermittent_variance)
         # Exclude cpm_earnings from reward sum (it's a tracking metric)
         reward_sum = sum(v for k, v in base_rewards.items() if k != "cpm_earnings")
         # Apply all variance sources (intermittent, algorithm, viral)
@@ -217,7 +230,7 @@ class PolicyEngine:
     # ---------------------------------------------------------
     # Hybrid mode (compromise approach)
     # ---------------------------------------------------------
-    def _apply_hybrid(self, base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty):
+    def _apply_hybrid(self, base_rewards, agent, algorithm_noise, viral_multiplier, failure_penalty, rng=random):
         """Blend differential and intermittent approaches."""
         p = self.config
         
@@ -227,7 +240,7 @@ class PolicyEngine:
         differential_total = (reward_sum * algorithm_noise * viral_multiplier) + failure_penalty
         
         # Intermittent component (unpredictable)
-        intermittent_result = self._apply_intermittent(base_rewards.copy(), agent, algorithm_noise, viral_multiplier, failure_penalty)
+        intermittent_result = self._apply_intermittent(base_rewards.copy(), agent, algorithm_noise, viral_multiplier, failure_penalty, rng)
         intermittent_total = intermittent_result.get("final_reward", 0)
         
         # Blend based on hybrid_mix parameter
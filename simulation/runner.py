@@ -0,0 +1,148 @@
+"""
+Background auto-run loop for an Environment.
+
+`AutoRunner` advances an environment continuously from an asyncio task. Each
+tick is a command on the environment's single-writer actor, so the event loop
+keeps serving requests while the simulation runs. The loop paces itself to a target
+rate, or runs as fast as possible when the rate is 0, and keeps simple
+throughput statistics (achieved ticks/second, lag behind schedule, tick time).
+
+Post text is written only when a `ContentWorker` watches the environment, so
+the loop never waits on text requests; without one, ticks run without text.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+
+from simulation.actor import actor_for
+
+DEFAULT_TICKS_PER_SECOND = 2.0
+MAX_TICKS_PER_SECOND = 1000.0
+RATE_WINDOW = 50  # Recent ticks used for the achieved-rate estimate
+MAX_LAG_TICKS = 10  # Beyond this the schedule is reset instead of bursting to catch up
+
+
+class AutoRunner:
+    """Run `env.tick()` on a schedule from a background asyncio task."""
+
+    def __init__(self, env, ticks_per_second=DEFAULT_TICKS_PER_SECOND, generate_content=None):
+        """
+        Args:
+            env: Environment to advance
+            ticks_per_second: Target rate (0 = as fast as possible)
+            generate_content: Write post text for each tick. None (the default)
+                writes it only when a ContentWorker is attached, never inline.
+        """
+        self.env = env
+        self.generate_content = generate_content
+        self.ticks_per_second = 0.0
+        self.set_speed(ticks_per_second)
+        self._task = None
+        self._completed = deque(maxlen=RATE_WINDOW)  # monotonic completion times
+        self._tick_seconds = deque(maxlen=RATE_WINDOW)
+        self.ticks_run = 0
+        self.lag = 0.0
+        env.tick_listeners.append(self._on_event)
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def set_speed(self, ticks_per_second):
+        """Set the target rate; 0 runs as fast as the simulation allows."""
+        ticks_per_second = float(ticks_per_second or 0)
+        if not math.isfinite(ticks_per_second) or not 0 <= ticks_per_second <= MAX_TICKS_PER_SECOND:
+            raise ValueError(f"ticks_per_second must be between 0 and {MAX_TICKS_PER_SECOND:g}")
+        self.ticks_per_second = ticks_per_second
+
+    def start(self):
+        """Start the loop on the running event loop (no-op if already running)."""
+        if not self.running:
+            self.lag = 0.0
+            self._completed.clear()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def pause(self):
+        """Stop scheduling ticks; a tick already in its worker thread still completes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _on_event(self, env, event):
+        # An evicted environment must stop ticking; eviction may happen on another thread
+        if event == "evict" and self._task is not None:
+            task, self._task = self._task, None
+            task.get_loop().call_soon_threadsafe(task.cancel)
+
+    async def step(self, ticks=1):
+        """Run `ticks` ticks now, on the writer thread, whether or not the loop is running."""
+        for _ in range(max(1, int(ticks))):
+            await self._tick()
+
+    async def _tick(self):
+        generate = self.generate_content
+        if generate is None:
+            generate = "content_worker" in self.env.extensions
+        started = time.monotonic()
+        await actor_for(self.env).run(self.env.tick, generate)
+        finished = time.monotonic()
+        self._tick_seconds.append(finished - started)
+        self._completed.append(finished)
+        self.ticks_run += 1
+
+    async def _run(self):
+        next_due = time.monotonic()
+        while True:
+            await self._tick()
+            if not self.ticks_per_second:
+                self.lag = 0.0
+                await asyncio.sleep(0)  # Yield so request handlers still get the loop
+                continue
+
+            interval = 1.0 / self.ticks_per_second
+            next_due += interval
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                self.lag = 0.0
+                await asyncio.sleep(delay)
+            else:
+                self.lag = -delay
+                if self.lag > interval * MAX_LAG_TICKS:
+                    next_due = time.monotonic()
+                await asyncio.sleep(0)
+
+    def status(self) -> dict:
+        """Loop state and throughput statistics."""
+        achieved = 0.0
+        if len(self._completed) > 1:
+            span = self._completed[-1] - self._completed[0]
+            if span > 0:
+                achieved = (len(self._completed) - 1) / span
+        avg_tick = sum(self._tick_seconds) / len(self._tick_seconds) if self._tick_seconds else 0.0
+        return {
+            "running": self.running,
+            "tick": self.env.tick_count,
+            "target_ticks_per_second": self.ticks_per_second,
+            "achieved_ticks_per_second": round(achieved, 2),
+            "lag_seconds": round(self.lag, 4),
+            "avg_tick_ms": round(avg_tick * 1000, 3),
+            "ticks_run": self.ticks_run,
+        }
+
+
+_runner_lock = threading.Lock()  # Guards creation only; env.lock is held for whole ticks
+
+
+def runner_for(env):
+    """The auto-runner attached to `env`, created on first use."""
+    runner = env.extensions.get("runner")
+    if runner is not None:
+        return runner
+    with _runner_lock:
+        runner = env.extensions.get("runner")
+        if runner is None:
+            runner = env.extensions["runner"] = AutoRunner(env)
+        return runner
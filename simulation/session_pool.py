@@ -0,0 +1,257 @@
+"""
+Session-scoped pool of simulation environments.
+
+Every browser session gets its own Environment so visitors never click "Run
+Tick" on each other's simulation. Environments are created lazily by deep-
+copying a pre-built template (agents created and default scenario applied
+once), then restarted from a seed of their own. They are kept in LRU order
+and evicted when the pool exceeds its size or memory budget. With a snapshot
+directory configured, evicted environments are pickled to disk and restored
+transparently on the session's next request (environments using a trajectory
+archive are not snapshotted, and their archive files are deleted on eviction).
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from simulation.environment import close_history, default_history_store
+from simulation.history import ColumnarHistory
+
+logger = logging.getLogger(__name__)
+
+POOL_MAX_ENVIRONMENTS = int(os.getenv("SESSION_POOL_MAX_ENVIRONMENTS", "64"))
+POOL_MEMORY_BUDGET_MB = float(os.getenv("SESSION_POOL_MEMORY_MB", "256"))
+SESSION_SNAPSHOT_DIR = os.getenv("SESSION_SNAPSHOT_DIR") or None
+
+# Rough footprint model, measured with tracemalloc on a 5-agent run: each
+# agent-tick adds a history dict, a reward_history entry and a columnar row.
+BASE_ENVIRONMENT_BYTES = 64 * 1024
+AGENT_TICK_BYTES = 1100
+
+
+def estimate_environment_bytes(env) -> int:
+    """Approximate memory held by an environment (grows linearly with ticks run)."""
+    agent_ticks = sum(agent.ticks_recorded for agent in env.agents)
+    return BASE_ENVIRONMENT_BYTES + agent_ticks * AGENT_TICK_BYTES
+
+
+class EnvironmentPool:
+    """LRU pool of per-session environments with a memory budget."""
+
+    def __init__(
+        self,
+        template_factory,
+        max_environments=POOL_MAX_ENVIRONMENTS,
+        memory_budget_mb=POOL_MEMORY_BUDGET_MB,
+        snapshot_dir=SESSION_SNAPSHOT_DIR,
+    ):
+        """
+        Args:
+            template_factory: Zero-arg callable returning a ready-to-run Environment
+            max_environments: Most environments kept in memory at once
+            memory_budget_mb: Estimated memory budget across all pooled environments
+            snapshot_dir: Spill evicted environments here (None = discard them)
+        """
+        self.template_factory = template_factory
+        self.max_environments = max(1, max_environments)
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.snapshot_dir = snapshot_dir
+        self._template = None
+        self._envs = OrderedDict()  # session id -> Environment, least recently used first
+        self._lock = threading.Lock()  # Guards the LRU order and counters only
+        self._template_lock = threading.Lock()
+        self._building = {}  # session id -> Future of an environment being created or restored
+        self._spilling = {}  # session id -> Event set once its snapshot is written
+        self.created = 0
+        self.restored = 0
+        self.evicted = 0
+        self.spilled = 0
+
+    def warm(self):
+        """Build the template now rather than on the first new session."""
+        self._ensure_template()
+
+    @property
+    def ready(self):
+        """True once the template is built (new sessions no longer pay for it)."""
+        return self._template is not None
+
+    def _ensure_template(self):
+        if self._template is None:
+            with self._template_lock:
+                if self._template is None:
+                    self._template = self.template_factory()
+        return self._template
+
+    def get(self, session_id):
+        """Return the session's environment, restoring or creating it if needed.
+
+        Only the LRU bookkeeping runs under the pool lock: copying the
+        template, restoring a snapshot and spilling evicted environments
+        happen outside it, so a slow build never holds up other sessions.
+        Concurrent first requests of one session share a single build.
+        """
+        with self._lock:
+            env = self._envs.get(session_id)
+            if env is not None:
+                self._envs.move_to_end(session_id)
+                return env
+            build = self._building.get(session_id)
+            owner = build is None
+            if owner:
+                build = self._building[session_id] = Future()
+        if not owner:
+            return build.result()
+
+        try:
+            spilling = self._spilling.get(session_id)
+            if spilling is not None:
+                spilling.wait()  # Restore what the eviction is still writing
+            env = self._restore(session_id)
+            if env is None:
+                env = self._create(session_id)
+        except BaseException as e:
+            with self._lock:
+                del self._building[session_id]
+            build.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._building[session_id]
+            self._envs[session_id] = env
+            evicted = self._evict(keep=session_id)
+        build.set_result(env)
+        for evicted_id, evicted_env in evicted:
+            self._spill(evicted_id, evicted_env)
+            # Lets runners and SSE streams attached to this environment shut down
+            evicted_env._notify("evict")
+            if getattr(evicted_env.history_columns, "on_disk", False):
+                # Archives are not snapshotted, so the session's run ends here
+                with evicted_env.lock:
+                    evicted_env.history_columns.clear()
+        return env
+
+    def _create(self, session_id):
+        env = copy.deepcopy(self._ensure_template())
+        warmup_ticks = env.tick_count
+        store = default_history_store(suffix=self._session_key(session_id))
+        if not isinstance(store, ColumnarHistory):
+            env.history_columns = store  # Archives are per-session files
+        # Sessions copied from one template must not replay the same run. The
+        # session's seed is drawn first and its agents from it, so the run can
+        # be reproduced from the seed its exports record; the template's
+        # warm-up ticks are then replayed under that seed.
+        env.reseed()
+        env.reset_full_state()
+        if warmup_ticks:
+            env.run(warmup_ticks)
+        with self._lock:
+            self.created += 1
+        return env
+
+    def close(self):
+        """Flush and release the on-disk history of every pooled environment (at shutdown)."""
+        with self._lock:
+            envs = list(self._envs.values())
+        for env in envs:
+            close_history(env)
+
+    def __len__(self):
+        return len(self._envs)
+
+    def __contains__(self, session_id):
+        return session_id in self._envs
+
+    def memory_estimate(self) -> int:
+        return sum(estimate_environment_bytes(env) for env in self._envs.values())
+
+    def stats(self) -> dict:
+        return {
+            "environments": len(self._envs),
+            "estimated_bytes": self.memory_estimate(),
+            "memory_budget_bytes": self.memory_budget,
+            "created": self.created,
+            "restored": self.restored,
+            "evicted": self.evicted,
+            "spilled": self.spilled,
+        }
+
+    # ------------------------------------------------------------------
+    # Eviction and snapshots
+    # ------------------------------------------------------------------
+    def _evict(self, keep):
+        """Drop least recently used environments until within count and memory budget.
+
+        Called with the pool lock held; returns the (session id, environment)
+        pairs dropped, for the caller to spill and notify outside the lock.
+        """
+        evicted = []
+        total = self.memory_estimate()
+        while len(self._envs) > 1 and (
+            len(self._envs) > self.max_environments or total > self.memory_budget
+        ):
+            session_id = next(iter(self._envs))
+            if session_id == keep:
+                break
+            env = self._envs.pop(session_id)
+            total -= estimate_environment_bytes(env)
+            self.evicted += 1
+            if self.snapshot_dir:
+                self._spilling[session_id] = threading.Event()
+            evicted.append((session_id, env))
+        return evicted
+
+    @staticmethod
+    def _session_key(session_id):
+        # Hash the id so arbitrary session values never become path components
+        return hashlib.sha256(str(session_id).encode("utf-8")).hexdigest()[:32]
+
+    def _snapshot_path(self, session_id):
+        return os.path.join(self.snapshot_dir, f"{self._session_key(session_id)}.pkl")
+
+    def _spill(self, session_id, env):
+        if not self.snapshot_dir:
+            return
+        path = self._snapshot_path(session_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with env.lock, open(tmp_path, "wb") as f:
+                pickle.dump(env, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self.spilled += 1
+        except (OSError, TypeError, pickle.PicklingError) as e:
+            logger.warning(f"Could not snapshot evicted environment: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        finally:
+            with self._lock:
+                self._spilling.pop(session_id).set()
+
+    def _restore(self, session_id):
+        if not self.snapshot_dir:
+            return None
+        path = self._snapshot_path(session_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                env = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Could not restore environment snapshot: {e}")
+            return None
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        with self._lock:
+            self.restored += 1
+        return env
@@ -0,0 +1,110 @@
+"""
+Coalescing of single-tick requests into batches, with back-pressure.
+
+Each "Run Tick" click used to queue its own tick (and its own render) on the
+environment's actor, so a burst of clicks turned into a growing backlog.
+`TickQueue` instead gathers every tick request that arrives while a batch is
+waiting or running into the next batch, which runs as one actor command:
+however many clicks arrive, there is at most one batch running and one
+waiting. Everyone who joined a batch learns how many ticks it applied.
+Beyond `max_pending` ticks waiting, requests are refused with an estimate of
+when to retry.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from simulation.actor import actor_for
+
+DEFAULT_MAX_PENDING = 50  # Ticks waiting for the next batch
+TIMING_WINDOW = 20  # Recent batches used for the retry estimate
+
+
+class TickQueueFull(Exception):
+    """Raised when too many ticks are already waiting; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many ticks queued; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TickQueue:
+    """Coalesce tick requests for one environment into batches on its actor."""
+
+    def __init__(self, env, max_pending=DEFAULT_MAX_PENDING):
+        self.env = env
+        self.actor = actor_for(env)
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._batch = None  # Future of the batch new requests join
+        self._tick_seconds = deque(maxlen=TIMING_WINDOW)
+        self.requests = 0
+        self.batches = 0
+        self.rejected = 0
+
+    def request(self) -> Future:
+        """Ask for one tick; resolves to the number of ticks in the batch that applied it.
+
+        Raises:
+            TickQueueFull: `max_pending` ticks are already waiting
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise TickQueueFull(self._retry_after())
+            self._pending += 1
+            self.requests += 1
+            start = self._batch is None
+            if start:
+                self._batch = Future()
+            batch = self._batch
+        if start:
+            self.actor.submit(self._run_batch)
+        return batch
+
+    def _run_batch(self):
+        # On the writer thread: claim everything requested so far
+        with self._lock:
+            batch, self._batch = self._batch, None
+            ticks, self._pending = self._pending, 0
+        started = time.perf_counter()
+        try:
+            # Only the last tick's text content is ever shown, so generate just that
+            self.env.run(ticks - 1)
+            self.env.tick()
+        except Exception as e:
+            batch.set_exception(e)
+            raise
+        self._tick_seconds.append((time.perf_counter() - started) / ticks)
+        self.batches += 1
+        batch.set_result(ticks)
+
+    def _retry_after(self) -> int:
+        """Whole seconds until the waiting ticks should have run (at least 1)."""
+        per_tick = sum(self._tick_seconds) / len(self._tick_seconds) if self._tick_seconds else 0.0
+        return max(1, math.ceil(self._pending * per_tick))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "rejected": self.rejected,
+                "pending": self._pending,
+            }
+
+
+def tick_queue_for(env) -> TickQueue:
+    """The tick queue attached to `env`, created on first use."""
+    queue = env.extensions.get("tick_queue")
+    if queue is not None:
+        return queue
+    with env.lock:
+        queue = env.extensions.get("tick_queue")
+        if queue is None:
+            queue = env.extensions["tick_queue"] = TickQueue(env)
+        return queue
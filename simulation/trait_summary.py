@@ -0,0 +1,75 @@
+"""
+Distribution summaries of agent traits.
+
+The health tab's box plots need, per trait, the five-number summary plus
+mean and standard deviation (and optionally a histogram). These are computed
+here in one pass over the population per snapshot, so the chart payload has
+a constant size however many agents there are.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+# Chart label -> AgentProfile attribute
+TRAITS = {
+    "Burnout": "burnout",
+    "Addiction": "addiction_drive",
+    "Resilience": "emotional_resilience",
+    "Arousal": "arousal_level",
+}
+HISTOGRAM_RANGE = (0.0, 1.0)  # Traits are clamped to [0, 1]
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    """Linearly interpolated quantile of sorted values (numpy's default method)."""
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _histogram(values: List[float], bins: int) -> List[int]:
+    """Counts over `bins` equal-width bins spanning HISTOGRAM_RANGE (ends inclusive)."""
+    low, high = HISTOGRAM_RANGE
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(max(int((value - low) / width), 0), bins - 1)] += 1
+    return counts
+
+
+def summarize(values: List[float], bins: Optional[int] = None) -> Dict[str, object]:
+    """Five-number summary, mean and population std of `values`.
+
+    Args:
+        values: Trait values
+        bins: Also return a histogram with this many fixed bins over [0, 1]
+    """
+    summary = {"count": len(values)}
+    if not values:
+        summary.update(min=0.0, q1=0.0, median=0.0, q3=0.0, max=0.0, mean=0.0, std=0.0)
+    else:
+        ordered = sorted(values)
+        mean = math.fsum(ordered) / len(ordered)
+        summary.update(
+            min=ordered[0],
+            q1=_quantile(ordered, 0.25),
+            median=_quantile(ordered, 0.5),
+            q3=_quantile(ordered, 0.75),
+            max=ordered[-1],
+            mean=mean,
+            std=math.sqrt(math.fsum((v - mean) ** 2 for v in ordered) / len(ordered)),
+        )
+    if bins:
+        summary["histogram"] = _histogram(values, bins)
+    return summary
+
+
+def trait_summaries(agents, bins: Optional[int] = None) -> Dict[str, Dict[str, object]]:
+    """`summarize` for every trait in TRAITS, keyed by chart label."""
+    columns = {label: [] for label in TRAITS}
+    for agent in agents:
+        profile = agent.profile
+        for label, attribute in TRAITS.items():
+            columns[label].append(getattr(profile, attribute))
+    return {label: summarize(values, bins) for label, values in columns.items()}
@@ -0,0 +1,322 @@
+"""
+Memory-mapped trajectory archive for very long runs.
+
+Stores per-agent trajectories in a fixed-dtype binary file laid out as
+(tick, agent, field) little-endian float64, plus a small JSON header next to
+it (`<path>.json`). The archive exposes the same reading interface as
+`ColumnarHistory`, so the exports and dashboard sparklines read slices
+straight from the mapping instead of keeping the run in RAM.
+
+Offline analysis can open the same file without parsing:
+
+    header = json.load(open("run.traj.json"))
+    data = numpy.memmap("run.traj", dtype=header["dtype"], mode="r",
+                        shape=tuple(header["shape"]))
+    burnout = data[:, :, header["fields"].index("burnout")]
+"""
+
+import json
+import mmap
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from simulation.history import COLUMN_NAMES, CATEGORICAL_COLUMNS, history_row
+
+ARCHIVE_FORMAT = "platform-capitalism-trajectory"
+ARCHIVE_VERSION = 1
+ARCHIVE_DTYPE = "<f8"
+ITEM_SIZE = 8
+# agent_id and tick are implied by position, so they are not stored per cell
+ARCHIVE_FIELDS = tuple(name for name in COLUMN_NAMES if name not in ("agent_id", "tick"))
+INITIAL_CAPACITY_TICKS = 64
+
+
+class TrajectoryArchive:
+    """Append-only (tick, agent, field) float64 archive backed by mmap.
+
+    The agent population is fixed by the first recorded tick. Categorical
+    columns (state, strategy) are stored as float codes whose string values
+    live in the JSON header.
+
+    Nothing is written until the first tick, which replaces any archive an
+    earlier run left at `path`; `clear()` removes the files again. The header
+    is rewritten only when the layout changes (first tick, capacity growth, a
+    new category value) and on `close()`, so its tick count may lag the file
+    until the archive is closed (the server closes archives at shutdown).
+    """
+
+    on_disk = True  # Agents need not keep their full history in RAM
+
+    def __init__(self, path: str, capacity_ticks: int = INITIAL_CAPACITY_TICKS):
+        if sys.byteorder != "little":
+            raise RuntimeError("TrajectoryArchive requires a little-endian platform")
+        self.path = path
+        self.header_path = f"{path}.json"
+        self.initial_capacity = max(1, capacity_ticks)
+        self.field_index = {name: i for i, name in enumerate(ARCHIVE_FIELDS)}
+        self._file = None
+        self._mmap = None
+        self._view = None
+        self._created = False  # Whether this archive has written files at `path`
+        self._reset_layout()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def clear(self):
+        """Drop every recorded tick and remove the archive's files."""
+        self._release()
+        if self._created:
+            self._remove_files()
+            self._created = False
+        self._reset_layout()
+
+    def _reset_layout(self):
+        self.agent_ids: List = []
+        self._agent_index: Dict[object, int] = {}
+        self.categories: Dict[str, List[str]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self._category_codes: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self.first_tick = None
+        self.num_ticks = 0
+        self.capacity_ticks = 0
+
+    def _remove_files(self):
+        # Unlink rather than truncate: readers still holding the old mapping
+        # keep a valid inode instead of faulting on a shrunken file.
+        for path in (self.path, self.header_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def __getstate__(self):
+        raise TypeError("TrajectoryArchive is backed by a live mmap and cannot be pickled or copied")
+
+    def close(self):
+        """Flush the header and release the mapping."""
+        if self._created:
+            self._write_header()
+        self._release()
+
+    def _release(self):
+        self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A reader still holds a slice; the mapping is freed with it
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        self._remove_files()  # An earlier run's archive at this path
+        self._created = True
+        self._file = open(self.path, "w+b")
+        self._map(self.initial_capacity)
+
+    def _map(self, capacity_ticks):
+        """(Re)map the file so it can hold `capacity_ticks` ticks."""
+        size = capacity_ticks * self._tick_stride * ITEM_SIZE
+        self._file.truncate(size)
+        # Old views stay valid on the previous mapping; new writes use the new one
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._view = memoryview(self._mmap).cast("d")
+        self.capacity_ticks = capacity_ticks
+        self._write_header()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    @property
+    def num_agents(self):
+        return len(self.agent_ids)
+
+    @property
+    def num_fields(self):
+        return len(ARCHIVE_FIELDS)
+
+    @property
+    def _tick_stride(self):
+        return self.num_agents * self.num_fields
+
+    def __len__(self):
+        return self.num_ticks * self.num_agents
+
+    def record_tick(self, tick, agents):
+        """Write one (agent, field) plane for the given tick."""
+        if not agents:
+            return
+        if self.first_tick is None:
+            self.agent_ids = [a.profile.id for a in agents]
+            self._agent_index = {agent_id: a for a, agent_id in enumerate(self.agent_ids)}
+            self.first_tick = tick
+            self._open()
+        elif len(agents) != self.num_agents:
+            raise ValueError(
+                "Agent population changed during an archived run; reset the simulation first"
+            )
+
+        if self.num_ticks == self.capacity_ticks:
+            self._map(self.capacity_ticks * 2)
+
+        view = self._view
+        base = self.num_ticks * self._tick_stride
+        for a, agent in enumerate(agents):
+            row = history_row(tick, agent)
+            offset = base + a * self.num_fields
+            for f, name in enumerate(ARCHIVE_FIELDS):
+                value = row[name]
+                if name in self._category_codes:
+                    value = self._encode(name, value)
+                view[offset + f] = float(value)
+        self.num_ticks += 1
+
+    def _encode(self, name, value):
+        codes = self._category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+            self._write_header()
+        return code
+
+    def header(self) -> dict:
+        """JSON-serialisable description of the file layout."""
+        return {
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "dtype": ARCHIVE_DTYPE,
+            "layout": ["tick", "agent", "field"],
+            "shape": [self.num_ticks, self.num_agents, self.num_fields],
+            "fields": list(ARCHIVE_FIELDS),
+            "first_tick": self.first_tick,
+            "agent_ids": self.agent_ids,
+            "categories": self.categories,
+        }
+
+    def _write_header(self):
+        tmp_path = f"{self.header_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.header(), f)
+        os.replace(tmp_path, self.header_path)
+
+    # ------------------------------------------------------------------
+    # Reading (same interface as ColumnarHistory)
+    # ------------------------------------------------------------------
+    def decode(self, name, code):
+        """Map a category code back to its string value."""
+        return self.categories[name][int(code)]
+
+    def _tick_index_range(self, tick_from=None, tick_to=None) -> Tuple[int, int]:
+        if self.first_tick is None:
+            return 0, 0
+        first = 0 if tick_from is None else tick_from - self.first_tick
+        last = self.num_ticks if tick_to is None else tick_to - self.first_tick + 1
+        first = min(max(first, 0), self.num_ticks)
+        last = min(max(last, first), self.num_ticks)
+        return first, last
+
+    def row_range(self, tick_from=None, tick_to=None) -> Tuple[int, int]:
+        """Return the (start, stop) row slice covering ticks in [tick_from, tick_to]."""
+        first, last = self._tick_index_range(tick_from, tick_to)
+        return first * self.num_agents, last * self.num_agents
+
+    def tick_chunks(self, chunk_ticks, tick_from=None, tick_to=None) -> Iterator[Tuple[int, int]]:
+        """Yield (start, stop) row slices of at most `chunk_ticks` ticks each."""
+        chunk_ticks = max(1, int(chunk_ticks))
+        first, last = self._tick_index_range(tick_from, tick_to)
+        for i in range(first, last, chunk_ticks):
+            yield i * self.num_agents, min(i + chunk_ticks, last) * self.num_agents
+
+    def column(self, name, start=0, stop=None):
+        """View over rows [start, stop) of a column.
+
+        Stored fields are returned as strided memoryviews over the mapping
+        (no copy); the positional agent_id/tick columns are materialised.
+        """
+        stop = len(self) if stop is None else stop
+        if name == "tick":
+            return [self.first_tick + r // self.num_agents for r in range(start, stop)]
+        if name == "agent_id":
+            return [self.agent_ids[r % self.num_agents] for r in range(start, stop)]
+        f = self.field_index[name]
+        if self._view is None or start >= stop:
+            return memoryview(b"").cast("d")
+        return self._view[start * self.num_fields + f:stop * self.num_fields:self.num_fields]
+
+    def agent_series(self, agent_id, name, last=None):
+        """Strided, zero-copy view of one agent's field over the recorded ticks."""
+        a = self._agent_index.get(agent_id)
+        if self._view is None or a is None:
+            return memoryview(b"").cast("d")
+        stride = self._tick_stride
+        first = 0 if last is None else max(0, self.num_ticks - last)
+        offset = a * self.num_fields + self.field_index[name]
+        return self._view[first * stride + offset:self.num_ticks * stride:stride]
+
+    def iter_rows(
+        self,
+        tick_from=None,
+        tick_to=None,
+        agent_ids: Optional[Iterable] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[list]:
+        """Yield decoded rows (lists ordered like `columns`) lazily."""
+        columns = list(columns or COLUMN_NAMES)
+        # Capture the current mapping and layout so a concurrent clear() can't swap them mid-stream
+        view, ids, first_tick, categories = self._view, self.agent_ids, self.first_tick, self.categories
+        num_agents, num_fields = self.num_agents, self.num_fields
+        start, stop = self.row_range(tick_from, tick_to)
+        wanted = set(agent_ids) if agent_ids is not None else None
+        field_index = self.field_index
+
+        for r in range(start, stop):
+            agent_id = ids[r % num_agents]
+            if wanted is not None and agent_id not in wanted:
+                continue
+            base = r * num_fields
+            row = []
+            for name in columns:
+                if name == "agent_id":
+                    row.append(agent_id)
+                elif name == "tick":
+                    row.append(first_tick + r // num_agents)
+                elif name in categories:
+                    row.append(categories[name][int(view[base + field_index[name]])])
+                else:
+                    row.append(view[base + field_index[name]])
+            yield row
+
+    def agent_rows(
+        self,
+        agent_id,
+        tick_from=None,
+        tick_to=None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[list]:
+        """Yield one agent's decoded rows (lists ordered like `columns`), oldest first."""
+        columns = list(columns or COLUMN_NAMES)
+        view, first_tick, categories = self._view, self.first_tick, self.categories
+        a = self._agent_index.get(agent_id)
+        if view is None or a is None:
+            return
+        num_agents, num_fields = self.num_agents, self.num_fields
+        field_index = self.field_index
+        first, last = self._tick_index_range(tick_from, tick_to)
+        for k in range(first, last):
+            base = (k * num_agents + a) * num_fields
+            row = []
+            for name in columns:
+                if name == "agent_id":
+                    row.append(agent_id)
+                elif name == "tick":
+                    row.append(first_tick + k)
+                elif name in categories:
+                    row.append(categories[name][int(view[base + field_index[name]])])
+                else:
+                    row.append(view[base + field_index[name]])
+            yield row
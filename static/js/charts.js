@@ -197,6 +197,19 @@ function initWellbeingTrendsChart(canvasId, ticks, burnout, addiction, resilienc
     }, 100);
 }
 
+/**
+ * Gauge colour and label for a health score
+ * @param {number} healthScore - Health score (0-1)
+ */
+function systemHealthGaugeStyle(healthScore) {
+    if (healthScore >= 0.7) {
+        return { gaugeColor: 'rgb(34, 197, 94)', statusText: 'Healthy' };
+    } else if (healthScore >= 0.4) {
+        return { gaugeColor: 'rgb(234, 179, 8)', statusText: 'Warning' };
+    }
+    return { gaugeColor: 'rgb(239, 68, 68)', statusText: 'Critical' };
+}
+
 /**
  * Initialize a system health gauge (semi-circle doughnut chart)
  * @param {string} canvasId - Canvas element ID
@@ -217,34 +230,14 @@ function initSystemHealthGauge(canvasId, healthScore, previousScore) {
         // Convert to percentage
         const percentage = Math.round(healthScore * 100);
         const remaining = 100 - percentage;
+        const style = systemHealthGaugeStyle(healthScore);
         
-        // Determine color based on health score
-        let gaugeColor, statusText, statusColor;
-        if (healthScore >= 0.7) {
-            gaugeColor = 'rgb(34, 197, 94)';
-            statusText = 'Healthy';
-            statusColor = 'text-green-400';
-        } else if (healthScore >= 0.4) {
-            gaugeColor = 'rgb(234, 179, 8)';
-            statusText = 'Warning';
-            statusColor = 'text-yellow-400';
-        } else {
-            gaugeColor = 'rgb(239, 68, 68)';
-            statusText = 'Critical';
-            statusColor = 'text-red-400';
-        }
-        
-        // Calculate trend
-        const trend = previousScore !== null ? healthScore - previousScore : 0;
-        const trendIcon = trend > 0.01 ? '↑' : trend < -0.01 ? '↓' : '→';
-        const trendColor = trend > 0.01 ? 'rgb(34, 197, 94)' : trend < -0.01 ? 'rgb(239, 68, 68)' : 'rgb(156, 163, 175)';
-        
-        new Chart(ctx, {
+        const chart = new Chart(ctx, {
             type: 'doughnut',
             data: {
                 datasets: [{
                     data: [percentage, remaining],
-                    backgroundColor: [gaugeColor, 'rgba(55, 65, 81, 0.3)'],
+                    backgroundColor: [style.gaugeColor, 'rgba(55, 65, 81, 0.3)'],
                     borderColor: ['rgba(0, 0, 0, 0.1)', 'rgba(0, 0, 0, 0.1)'],
                     borderWidth: 2,
                     circumference: 180,
@@ -267,6 +260,16 @@ function initSystemHealthGauge(canvasId, healthScore, previousScore) {
             plugins: [{
                 id: 'gaugeText',
                 afterDraw: function(chart) {
+                    // Read the score from the chart so updateSystemHealthGauge() can redraw in place
+                    const score = chart.$health.score;
+                    const previous = chart.$health.previous;
+                    const style = systemHealthGaugeStyle(score);
+                    
+                    // Calculate trend
+                    const trend = previous !== null ? score - previous : 0;
+                    const trendIcon = trend > 0.01 ? '↑' : trend < -0.01 ? '↓' : '→';
+                    const trendColor = trend > 0.01 ? 'rgb(34, 197, 94)' : trend < -0.01 ? 'rgb(239, 68, 68)' : 'rgb(156, 163, 175)';
+                    
                     const ctx = chart.ctx;
                     const centerX = chart.chartArea.left + (chart.chartArea.right - chart.chartArea.left) / 2;
                     const centerY = chart.chartArea.top + (chart.chartArea.bottom - chart.chartArea.top) / 2 + 20;
@@ -274,18 +277,18 @@ function initSystemHealthGauge(canvasId, healthScore, previousScore) {
                     // Draw percentage
                     ctx.save();
                     ctx.font = 'bold 48px sans-serif';
-                    ctx.fillStyle = gaugeColor;
+                    ctx.fillStyle = style.gaugeColor;
                     ctx.textAlign = 'center';
                     ctx.textBaseline = 'middle';
-                    ctx.fillText(percentage, centerX, centerY - 10);
+                    ctx.fillText(Math.round(score * 100), centerX, centerY - 10);
                     
                     // Draw status text
                     ctx.font = '14px sans-serif';
                     ctx.fillStyle = 'rgb(156, 163, 175)';
-                    ctx.fillText(statusText, centerX, centerY + 30);
+                    ctx.fillText(style.statusText, centerX, centerY + 30);
                     
                     // Draw trend indicator
-                    if (previousScore !== null) {
+                    if (previous !== null) {
                         ctx.font = 'bold 20px sans-serif';
                         ctx.fillStyle = trendColor;
                         ctx.fillText(trendIcon, centerX + 40, centerY - 10);
@@ -295,14 +298,31 @@ function initSystemHealthGauge(canvasId, healthScore, previousScore) {
                 }
             }]
         });
+        chart.$health = { score: healthScore, previous: previousScore };
     }, 100);
 }
 
 /**
- * Initialize agent trait distribution chart with bars and individual points
+ * Move an existing system health gauge to a new score without re-creating it
+ * @param {string} canvasId - Canvas element ID
+ * @param {number} healthScore - New health score (0-1)
+ */
+function updateSystemHealthGauge(canvasId, healthScore) {
+    const chart = window.Chart && Chart.getChart(canvasId);
+    if (!chart || !chart.$health || healthScore === null) return;
+    
+    const percentage = Math.round(healthScore * 100);
+    chart.$health = { score: healthScore, previous: chart.$health.score };
+    chart.data.datasets[0].data = [percentage, 100 - percentage];
+    chart.data.datasets[0].backgroundColor[0] = systemHealthGaugeStyle(healthScore).gaugeColor;
+    chart.update('none');
+}
+
+/**
+ * Initialize agent trait distribution chart with mean bars, ±std error bars and quartile markers
  * @param {string} canvasId - Canvas element ID
- * @param {Object} traitData - Object with trait names as keys and arrays of values
- * Example: { Burnout: [0.2, 0.3, ...], Addiction: [...], Resilience: [...], Arousal: [...] }
+ * @param {Object} traitData - Object with trait names as keys and summary statistics as values
+ * Example: { Burnout: { count, min, q1, median, q3, max, mean, std, histogram }, Addiction: {...}, ... }
  */
 function initAgentTraitBoxPlots(canvasId, traitData) {
     setTimeout(function() {
@@ -315,28 +335,9 @@ function initAgentTraitBoxPlots(canvasId, traitData) {
             existingChart.destroy();
         }
         
-        // Calculate statistics
-        function calculateStats(values) {
-            const n = values.length;
-            const mean = values.reduce((a, b) => a + b, 0) / n;
-            const variance = values.reduce((a, b) => a + Math.pow(b - mean, 2), 0) / n;
-            const std = Math.sqrt(variance);
-            const sorted = [...values].sort((a, b) => a - b);
-            
-            return {
-                mean: mean,
-                std: std,
-                min: sorted[0],
-                max: sorted[n - 1],
-                median: sorted[Math.floor(n * 0.5)]
-            };
-        }
-        
-        const labels = Object.keys(traitData);
-        const stats = {};
-        labels.forEach(label => {
-            stats[label] = calculateStats(traitData[label]);
-        });
+        // Summaries (min, q1, median, q3, max, mean, std) are computed server-side
+        const stats = traitData;
+        const labels = Object.keys(stats);
         
         // Color mapping
         const colorMap = {
@@ -357,15 +358,16 @@ function initAgentTraitBoxPlots(canvasId, traitData) {
             order: 2
         };
         
-        // Individual agent points as scatter overlay
+        // Quartile markers (q1, median, q3) as scatter overlay
         const scatterDatasets = labels.map((label, idx) => ({
-            label: label + ' (agents)',
-            data: traitData[label].map(value => ({ x: idx, y: value })),
+            label: label + ' (quartiles)',
+            data: ['q1', 'median', 'q3'].map(key => ({ x: idx, y: stats[label][key] })),
             backgroundColor: colorMap[label].points,
             borderColor: colorMap[label].border,
             borderWidth: 1,
             pointRadius: 4,
             pointHoverRadius: 6,
+            pointStyle: 'rectRot',
             type: 'scatter',
             order: 1,
             showLine: false
@@ -417,10 +419,11 @@ function initAgentTraitBoxPlots(canvasId, traitData) {
                                         'Mean: ' + s.mean.toFixed(3),
                                         'Std Dev: ±' + s.std.toFixed(3),
                                         'Range: [' + s.min.toFixed(3) + ' - ' + s.max.toFixed(3) + ']',
-                                        'Median: ' + s.median.toFixed(3)
+                                        'Quartiles: ' + s.q1.toFixed(3) + ' / ' + s.median.toFixed(3) + ' / ' + s.q3.toFixed(3),
+                                        'Agents: ' + s.count
                                     ];
                                 } else {
-                                    return 'Agent value: ' + context.parsed.y.toFixed(3);
+                                    return 'Quartile: ' + context.parsed.y.toFixed(3);
                                 }
                             }
                         }
@@ -505,7 +508,7 @@ function initAgentTraitBoxPlots(canvasId, traitData) {
 /**
  * Initialize reward characteristics panel (histogram + stats)
  * @param {string} canvasId - Canvas element ID
- * @param {Array} rewards - Array of all reward values
+ * @param {Array|Object} rewards - Array of all reward values, or a precomputed { labels, counts } histogram
  * @param {number} avgReward - Average reward
  * @param {number} variance - Reward variance
  * @param {number} predictability - Reward predictability score
@@ -521,15 +524,16 @@ function initRewardCharacteristics(canvasId, rewards, avgReward, variance, predi
             existingChart.destroy();
         }
         
-        // Create histogram bins
+        // Create histogram bins (unless the server already binned them)
         const bins = 10;
-        const min = Math.min(...rewards);
-        const max = Math.max(...rewards);
+        const precomputed = !Array.isArray(rewards);
+        const min = precomputed ? 0 : Math.min(...rewards);
+        const max = precomputed ? 0 : Math.max(...rewards);
         const binSize = (max - min) / bins;
-        const histogram = new Array(bins).fill(0);
-        const binLabels = [];
+        const histogram = precomputed ? rewards.counts : new Array(bins).fill(0);
+        const binLabels = precomputed ? rewards.labels : [];
         
-        for (let i = 0; i < bins; i++) {
+        for (let i = 0; !precomputed && i < bins; i++) {
             const binStart = min + i * binSize;
             const binEnd = binStart + binSize;
             binLabels.push(binStart.toFixed(2));
@@ -951,3 +955,156 @@ function initRewardTimelineChart(canvasId, ticks, rewards, meanLine, lineColor)
         });
     }, 100);
 }
+
+/**
+ * Append one point to an existing line chart, dropping the oldest beyond maxPoints
+ * @param {string} canvasId - Canvas element ID
+ * @param {*} label - X-axis label for the new point (tick number)
+ * @param {Array} values - One value per dataset, in dataset order
+ * @param {number} maxPoints - Points to keep (matches the server-rendered window)
+ */
+function appendChartPoint(canvasId, label, values, maxPoints) {
+    const chart = window.Chart && Chart.getChart(canvasId);
+    if (!chart) return;
+    
+    chart.data.labels.push(label);
+    chart.data.datasets.forEach(function(dataset, i) {
+        if (i < values.length) dataset.data.push(values[i]);
+    });
+    if (maxPoints && chart.data.labels.length > maxPoints) {
+        chart.data.labels.shift();
+        chart.data.datasets.forEach(function(dataset) { dataset.data.shift(); });
+    }
+    chart.update('none');
+}
+
+/**
+ * Apply one per-tick delta from /api/stream to the charts already on the page
+ * @param {Object} delta - { tick, summary, states, agents, chart }
+ */
+function applyTickDelta(delta) {
+    const summary = delta.summary;
+    const formats = {
+        tick: function() { return 'Day ' + delta.tick; },
+        num_agents: function() { return '👥 ' + summary.num_agents; },
+        total_earnings: function() { return '💰 $' + summary.total_earnings.toFixed(2); },
+        avg_burnout: function() { return '🔥 ' + summary.avg_burnout.toFixed(2); },
+        avg_addiction: function() { return '🎮 ' + summary.avg_addiction.toFixed(2); },
+        avg_resilience: function() { return '🛡️ ' + summary.avg_resilience.toFixed(2); },
+        burnout_rate: function() { return '📈 ' + summary.burnout_rate.toFixed(2); }
+    };
+    document.querySelectorAll('#status-bar [data-metric]').forEach(function(el) {
+        const format = formats[el.getAttribute('data-metric')];
+        if (format) el.textContent = format();
+    });
+    
+    updateSystemHealthGauge('systemHealthGauge', delta.chart.health_score);
+    
+    const chart = delta.chart;
+    appendChartPoint('rewardTimelineChart', chart.tick, [chart.avg_reward], 20);
+    appendChartPoint('healthTrendChart', chart.tick,
+        [chart.health_score, chart.avg_burnout, chart.avg_addiction, chart.avg_resilience], 20);
+    
+    // Deltas only list agents that changed: every sparkline still gets a point
+    // per frame (unchanged agents repeat their last value) so they stay aligned
+    const changed = {};
+    delta.agents.forEach(function(agent) { changed[agent.id] = agent; });
+    document.querySelectorAll('canvas[data-chart="sparklines"]').forEach(function(canvas) {
+        const chart = window.Chart && Chart.getChart(canvas);
+        if (!chart) return;
+        const agent = changed[canvas.getAttribute('data-agent')];
+        const data = chart.data.datasets[0].data;
+        const value = agent ? agent[canvas.getAttribute('data-series')] : data[data.length - 1];
+        appendChartPoint(canvas.id, delta.tick, [value], 10);
+    });
+}
+
+/**
+ * Chart initializers for `<canvas data-chart="name">`, fed by /api/charts/<name>
+ */
+const CHART_LOADERS = {
+    'health-gauge': function(canvas, data) {
+        initSystemHealthGauge(canvas.id, data.current, data.previous);
+    },
+    'trait-distributions': function(canvas, data) {
+        initAgentTraitBoxPlots(canvas.id, data);
+    },
+    'reward-characteristics': function(canvas, data) {
+        initRewardCharacteristics(canvas.id, data.histogram, data.avg_reward, data.variance, data.predictability);
+    },
+    'state-transitions': function(canvas, data) {
+        initStateTransitionFlow(canvas.id, data);
+    },
+    'correlations': function(canvas, data) {
+        initCorrelationHeatmap(canvas.id, data);
+    },
+    'reward-timeline': function(canvas, data) {
+        const meanLine = data.ticks.map(function() { return data.mean; });
+        initRewardTimelineChart(canvas.id, data.ticks, data.rewards, meanLine, data.color);
+    },
+    'sparklines': function(canvas, data) {
+        const agentId = canvas.getAttribute('data-agent');
+        const series = data[agentId] && data[agentId][canvas.getAttribute('data-series')];
+        if (!series) return;
+        const ticks = series.map(function(_, i) { return i; });
+        if (canvas.getAttribute('data-series') === 'burnout') {
+            initBurnoutSparkline(agentId, ticks, series);
+        } else {
+            initRewardSparkline(agentId, ticks, series);
+        }
+    }
+};
+
+/**
+ * Fetch data for every chart canvas not yet loaded (one request per distinct URL)
+ * @param {Element} root - Element to search (defaults to the document)
+ */
+function loadCharts(root) {
+    const requests = {};
+    (root || document).querySelectorAll('canvas[data-chart]:not([data-chart-loaded])').forEach(function(canvas) {
+        const loader = CHART_LOADERS[canvas.getAttribute('data-chart')];
+        if (!loader) return;
+        canvas.setAttribute('data-chart-loaded', '');
+        const url = canvas.getAttribute('data-chart-url') || '/api/charts/' + canvas.getAttribute('data-chart');
+        if (!requests[url]) {
+            requests[url] = fetch(url, { credentials: 'same-origin' }).then(function(response) {
+                if (!response.ok) throw new Error(url + ': ' + response.status);
+                return response.json();
+            });
+        }
+        requests[url].then(function(data) { loader(canvas, data); })
+            .catch(function(error) { console.warn('Chart data failed to load', error); });
+    });
+}
+
+// Initial page load, and every fragment HTMX swaps in (including out-of-band swaps)
+document.addEventListener('DOMContentLoaded', function() { loadCharts(document); });
+document.addEventListener('htmx:afterSettle', function() { loadCharts(document); });
+
+// Tell dashboard requests which data the page shows, so unchanged fragments are not re-sent
+document.addEventListener('htmx:configRequest', function(e) {
+    const statusBar = document.getElementById('status-bar');
+    if (statusBar && statusBar.dataset.shown) {
+        e.detail.headers['X-Dashboard-Shown'] = statusBar.dataset.shown;
+    }
+});
+
+/**
+ * Subscribe to the per-tick SSE stream (once per page)
+ * @param {string} url - Stream endpoint (e.g. '/api/stream')
+ */
+function connectSimulationStream(url) {
+    if (!window.EventSource || window.simulationStream) return;
+    
+    const source = new EventSource(url);
+    source.addEventListener('tick', function(e) {
+        applyTickDelta(JSON.parse(e.data));
+    });
+    source.addEventListener('reset', function() {
+        // Charts restart from an empty run: re-render the status bar and let tabs reload
+        if (window.htmx) {
+            htmx.ajax('GET', '/fragments/status-bar', { target: '#status-bar', swap: 'outerHTML' });
+        }
+    });
+    window.simulationStream = source;
+}
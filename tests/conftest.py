@@ -0,0 +1,50 @@
+"""
+Shared pytest fixtures.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class Clock:
+    """Time source that only moves when a test advances `now`."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def make_env():
+    """Factory for seeded environments: make_env(num_agents=3, seed=0, ticks=0).
+
+    Agent traits are sampled from the environment's own RNG, so the seed
+    covers the whole run.
+    """
+    # Imported here: the project root is only on sys.path once this module has run
+    from simulation.agents.agent import Agent
+    from simulation.agents.profile import AgentProfile
+    from simulation.environment import Environment
+
+    def make(num_agents=3, seed=0, ticks=0):
+        env = Environment(seed=seed)
+        for i in range(num_agents):
+            env.add_agent(Agent(AgentProfile(id=i, rng=env.rng)))
+        if ticks:
+            env.run(ticks)
+        return env
+    return make
+
+
+@pytest.fixture
+def clock():
+    """A manually advanced Clock."""
+    return Clock()
@@ -0,0 +1,95 @@
+"""
+Tests for the single-writer environment actor and its snapshots.
+"""
+
+import threading
+
+import pytest
+from simulation.actor import EnvironmentActor, actor_for
+
+
+class TestEnvironmentActor:
+    """Test command serialization and snapshot publication."""
+
+    def test_concurrent_commands_are_serialized(self, make_env):
+        env = make_env()
+        actor = EnvironmentActor(env)
+        threads = [
+            threading.Thread(target=lambda: [actor.call(env.tick, False) for _ in range(5)])
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert env.tick_count == 20
+        assert actor.commands == 20
+        assert [entry["tick"] for entry in env.agents[0].history] == list(range(1, 21))
+
+    def test_snapshot_is_unaffected_by_later_commands(self, make_env):
+        env = make_env()
+        actor = EnvironmentActor(env)
+        actor.call(env.run, 3)
+        snapshot = actor.snapshot()
+        summary = snapshot.summary()
+
+        actor.call(env.run, 4)
+        actor.call(env.reset_full_state)
+
+        assert snapshot.tick_count == 3
+        assert all(len(agent.history) == 3 for agent in snapshot.agents)
+        assert len(snapshot.history["ticks"]) == 3
+        assert snapshot.summary() == summary
+        assert actor.snapshot().tick_count == 0
+
+    def test_snapshot_is_shared_until_the_next_command(self, make_env):
+        env = make_env()
+        actor = EnvironmentActor(env)
+
+        first = actor.snapshot()
+        assert actor.snapshot() is first
+
+        actor.call(env.tick, False)
+        second = actor.snapshot()
+        assert second is not first
+        assert second.data_version() != first.data_version()
+
+    def test_snapshot_shares_history_instead_of_copying(self, make_env):
+        env = make_env()
+        actor = EnvironmentActor(env)
+        actor.call(env.run, 3)
+        history = actor.snapshot().agents[0].history
+
+        actor.call(env.run, 2)
+
+        assert history._entries is env.agents[0].history
+        assert len(history) == 3 and len(list(history)) == 3
+        assert history[-1]["tick"] == 3 and [e["tick"] for e in history[-2:]] == [2, 3]
+
+    def test_readers_do_not_wait_for_queued_commands(self, make_env):
+        env = make_env()
+        actor = EnvironmentActor(env)
+        actor.call(env.tick, False)
+        release = threading.Event()
+        actor.submit(release.wait)
+        actor.submit(env.tick, False)
+
+        # Both commands are still queued or running; the last published snapshot is served
+        assert actor.snapshot().tick_count == 1
+        release.set()
+        actor.call(lambda: None)
+        assert actor.snapshot().tick_count == 2
+
+    def test_nested_command_runs_inline(self, make_env):
+        env = make_env()
+        actor = actor_for(env)
+
+        result = actor.call(lambda: actor.call(env.tick, False) or actor.snapshot().tick_count)
+
+        assert result == 1
+        assert actor_for(env) is actor
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
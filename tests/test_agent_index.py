@@ -0,0 +1,89 @@
+"""
+Tests for the agent browser index and its pages.
+"""
+
+import contextvars
+
+import pytest
+from simulation.actor import EnvironmentSnapshot
+from simulation.agent_index import AgentQuery, agent_index
+from simulation.environment import bind_environment
+
+
+class TestAgentIndex:
+    """Test server-side sorting, filtering and paging."""
+
+    def test_sorts_and_pages_stably(self, make_env):
+        index = agent_index(EnvironmentSnapshot(make_env(num_agents=30, ticks=5)))
+        query = AgentQuery(sort="earnings", descending=True)
+
+        first, total = index.page(query, 0, 12)
+        second, _ = index.page(query, 12, 12)
+        earnings = [row.earnings for row in index.select(query)]
+
+        assert total == 30 and len(first) == 12 and len(second) == 12
+        assert earnings == sorted(earnings, reverse=True)
+        assert not {a.profile.id for a in first} & {a.profile.id for a in second}
+        assert index.select(query) is index.select(query)  # Memoised per query
+
+    def test_filters_by_state_and_thresholds(self, make_env):
+        snapshot = EnvironmentSnapshot(make_env(num_agents=30, ticks=5))
+        index = agent_index(snapshot)
+        state = index.rows[0].state
+
+        by_state = index.select(AgentQuery(state=state))
+        burnt = index.select(AgentQuery(min_burnout=0.3, max_burnout=0.6))
+
+        assert by_state and all(row.state == state for row in by_state)
+        assert all(0.3 <= row.burnout <= 0.6 for row in burnt)
+        assert agent_index(snapshot) is index
+        with pytest.raises(ValueError):
+            AgentQuery(sort="name")
+
+    def test_page_renders_only_its_cards(self, make_env):
+        from ui.components.agent_browser import agent_page, agent_query
+        from fasthtml.common import to_xml
+
+        env = make_env(num_agents=40, ticks=2)
+        query = agent_query({"sort": "burnout", "min_earnings": "", "limit": "bogus"})
+
+        def render():
+            bind_environment(env)
+            return to_xml(agent_page(query, 0, 10))
+        html = contextvars.copy_context().run(render)
+
+        assert html.count('id="agent-card-') == 10
+        assert "40 creators" in html
+        assert 'hx-trigger="revealed"' in html and "offset=10" in html and "sort=burnout" in html
+
+
+    def test_stale_next_page_restarts_from_first_page(self, make_env):
+        import re
+        from types import SimpleNamespace
+        from fasthtml.common import to_xml
+        from routes.fragments import agent_page_fragment
+        from simulation.actor import actor_for
+        from ui.components.agent_browser import agent_page, agent_query
+
+        env = make_env(num_agents=40, ticks=2)
+
+        def run(fn):
+            def bound():
+                bind_environment(env)
+                return fn()
+            return contextvars.copy_context().run(bound)
+
+        html = run(lambda: to_xml(agent_page(agent_query({}), 0, 10)))
+        version = re.search(r"[?&]v=(\w+)", html).group(1)
+        req = SimpleNamespace(query_params={"offset": "10", "limit": "10", "v": version})
+        assert 'id="agent-card-10"' in str(run(lambda: agent_page_fragment(req, 10, 10, version)))
+
+        actor_for(env).call(env.tick, False)
+        response = run(lambda: agent_page_fragment(req, 10, 10, version))
+
+        assert response.headers["hx-retarget"] == "#agent-grid"
+        assert "40 creators" in response.body.decode() and 'id="agent-card-0"' in response.body.decode()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
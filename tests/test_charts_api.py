@@ -0,0 +1,144 @@
+"""
+Tests for the chart-data API payloads.
+"""
+
+import json
+import threading
+
+import pytest
+from simulation.actor import EnvironmentSnapshot
+from simulation.agents.agent import Agent
+from simulation.agents.profile import AgentProfile
+from simulation.environment import Environment
+
+
+def _snapshot(ticks=12):
+    env = Environment(agents=[Agent(AgentProfile(id=i)) for i in range(4)], seed=2)
+    env.run(ticks)
+    return EnvironmentSnapshot(env)
+
+
+class TestTraitSummaries:
+    """Test server-side trait distribution statistics."""
+
+    def test_summary_matches_reference_statistics(self):
+        import statistics
+        from simulation.trait_summary import summarize
+
+        values = [0.9, 0.1, 0.4, 0.3, 0.75, 1.0]
+        summary = summarize(values, bins=4)
+
+        assert summary["min"] == 0.1 and summary["max"] == 1.0
+        assert [summary["q1"], summary["median"], summary["q3"]] == pytest.approx(
+            statistics.quantiles(values, n=4, method="inclusive"))
+        assert summary["std"] == pytest.approx(statistics.pstdev(values))
+        assert summary["histogram"] == [1, 2, 0, 3]
+        assert summarize([])["count"] == 0
+
+    def test_payload_size_is_independent_of_population(self):
+        from simulation.trait_summary import trait_summaries
+
+        small = trait_summaries(_snapshot(ticks=1).agents, bins=10)
+        env = Environment(agents=[Agent(AgentProfile(id=i)) for i in range(200)], seed=2)
+        large = trait_summaries(EnvironmentSnapshot(env).agents, bins=10)
+
+        assert set(small) == set(large) == {"Burnout", "Addiction", "Resilience", "Arousal"}
+        assert len(json.dumps(large)) < 2 * len(json.dumps(small))
+        assert large["Burnout"]["count"] == 200
+
+
+class TestChartPayloads:
+    """Test compact chart series (requires fasthtml)."""
+
+    def test_histogram_matches_client_binning(self):
+        from routes.api_charts import _histogram
+
+        histogram = _histogram([0.0, 0.5, 1.0, 1.0, 0.95])
+
+        assert sum(histogram["counts"]) == 5
+        assert histogram["counts"][0] == 1 and histogram["counts"][5] == 1
+        assert histogram["counts"][-1] == 3  # Last bin includes the maximum
+        assert _histogram([2.0, 2.0])["counts"][-1] == 2
+
+    def test_every_chart_builds_compact_json(self):
+        from routes.api_charts import CHARTS, PRECISION
+
+        snapshot = _snapshot()
+        payloads = {name: build(snapshot) for name, build in CHARTS.items()}
+
+        assert len(payloads["reward-timeline"]["rewards"]) == 12
+        assert set(payloads["sparklines"]) == {"0", "1", "2", "3"}
+        assert len(payloads["sparklines"]["0"]["burnout"]) == 10
+        assert len(payloads["correlations"]) == 6
+        assert sum(payloads["reward-characteristics"]["histogram"]["counts"]) == 4 * 12
+        burnout = payloads["trait-distributions"]["Burnout"]
+        assert burnout["count"] == 4 and sum(burnout["histogram"]) == 4
+        for key in ("min", "q1", "median", "q3", "max", "mean", "std"):
+            assert round(burnout[key], PRECISION) == burnout[key]
+        json.dumps(payloads)
+
+    def test_chart_reads_do_not_block_concurrent_ticks(self):
+        from routes.api_charts import CHARTS
+        from simulation.actor import actor_for
+
+        env = Environment(agents=[Agent(AgentProfile(id=i)) for i in range(20)], seed=2)
+        actor = actor_for(env)
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                snapshot = actor.snapshot()
+                try:
+                    for name in ("reward-characteristics", "state-transitions"):
+                        CHARTS[name](snapshot)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for _ in range(80):
+                actor.call(env.run, 5)
+        finally:
+            done.set()
+            reader.join()
+
+        assert errors == []
+        store = env.history_columns
+        assert {len(column) for column in store.columns.values()} == {400 * 20}
+
+    def test_state_transitions_count_only_new_ticks(self):
+        from routes.api_charts import _state_transitions
+
+        env = Environment(agents=[Agent(AgentProfile(id=i)) for i in range(4)], seed=2)
+        env.run(6)
+        _state_transitions(EnvironmentSnapshot(env))
+        env.run(6)
+        incremental = _state_transitions(EnvironmentSnapshot(env))
+
+        expected = {}
+        last_state = {}
+        for agent_id, state in env.history_columns.iter_rows(columns=("agent_id", "state")):
+            if last_state.get(agent_id, state) != state:
+                key = f"{last_state[agent_id]}->{state}"
+                expected[key] = expected.get(key, 0) + 1
+            last_state[agent_id] = state
+        assert incremental == expected
+
+    def test_chart_urls_change_with_the_simulation_version(self):
+        from ui.render_cache import chart_url
+
+        env = Environment(agents=[Agent(AgentProfile(id=0))], seed=2)
+        env.run(3)
+        snapshot = EnvironmentSnapshot(env)
+        env.tick(generate_text_content=False)
+        later = EnvironmentSnapshot(env)
+
+        assert chart_url("correlations", snapshot).startswith("/api/charts/correlations?v=")
+        assert chart_url("correlations", snapshot) != chart_url("correlations", later)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+"""
+Tests for the circuit breaker, retries and connection reuse of the HF backend.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from simulation.agents.agent import Agent
+from simulation.agents.profile import AgentProfile
+from simulation.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, backoff_delays
+
+
+class TestCircuitBreaker:
+    """Test the closed -> open -> half-open cycle and backoff delays."""
+
+    def test_opens_after_consecutive_failures(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()  # Resets the count
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.stats()["trips"] == 1
+
+    def test_half_open_lets_one_probe_through(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()  # Only one probe at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        clock.now += 10
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow() and breaker.allow()
+
+    def test_backoff_is_jittered_and_capped(self):
+        delays = backoff_delays(6, base=0.1, cap=0.5, rng=random.Random(0))
+        assert len(delays) == 6
+        assert all(0 <= delay <= min(0.5, 0.1 * 2 ** i) for i, delay in enumerate(delays))
+        assert len(set(delays)) == 6
+
+
+class _FaultyTextGeneration(BaseHTTPRequestHandler):
+    """Local stand-in for a text-generation endpoint with scripted errors and latency.
+
+    Each request pops the next status from `server.script` (200 once empty) and
+    answers after `server.delay` seconds.
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is visible
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["content-length"]))
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.connections.add(self.client_address)
+            status = self.server.script.pop(0) if self.server.script else 200
+        time.sleep(self.server.delay)
+        if status == 200:
+            body = json.dumps([{"generated_text": "Stand-in post about the creator economy"}]).encode()
+        else:
+            body = json.dumps({"error": f"Injected {status}"}).encode()
+        try:
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # Client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FaultyServer(ThreadingHTTPServer):
+    request_queue_size = 64
+    daemon_threads = True
+
+
+@pytest.fixture
+def faulty_endpoint():
+    pytest.importorskip("huggingface_hub")
+    server = _FaultyServer(("127.0.0.1", 0), _FaultyTextGeneration)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.connections = set()
+    server.script = []
+    server.delay = 0.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _generator(server, breaker=None, retries=2):
+    from simulation.content_generator import ContentGenerator
+
+    return ContentGenerator(
+        api_key="test-token",
+        model=f"http://127.0.0.1:{server.server_port}",
+        breaker=breaker or CircuitBreaker(failure_threshold=3, reset_timeout=30),
+        retries=retries,
+    )
+
+
+def _generate(generator, i):
+    # Distinct prompts, so the response cache never answers
+    return generator.generate_content(prompt=f"Write post {i}")
+
+
+class TestResilientBackend:
+    """Test retries, the breaker and connection reuse against a faulty local endpoint."""
+
+    def test_transient_errors_are_retried(self, faulty_endpoint):
+        faulty_endpoint.script = [503, 502]
+        result = _generate(_generator(faulty_endpoint), 0)
+
+        assert result["method"] == "huggingface"
+        assert faulty_endpoint.requests == 3
+
+    def test_client_errors_are_not_retried(self, faulty_endpoint):
+        faulty_endpoint.script = [400]
+        result = _generate(_generator(faulty_endpoint), 0)
+
+        assert result["fallback_reason"] == "error"
+        assert faulty_endpoint.requests == 1
+
+    def test_open_circuit_falls_back_without_requests_until_probe(self, clock, faulty_endpoint):
+        generator = _generator(faulty_endpoint, CircuitBreaker(3, reset_timeout=30, clock=clock), retries=0)
+        faulty_endpoint.script = [500] * 3
+
+        results = [_generate(generator, i) for i in range(10)]
+
+        assert faulty_endpoint.requests == 3
+        assert [r["fallback_reason"] for r in results[3:]] == ["circuit_open"] * 7
+        clock.now += 30  # Endpoint has recovered; the probe closes the circuit
+        assert _generate(generator, 10)["method"] == "huggingface"
+        assert generator.breaker.state == CLOSED
+
+    def test_timeouts_trip_breaker_for_rest_of_batch(self, faulty_endpoint, monkeypatch):
+        from simulation import content_generator
+
+        faulty_endpoint.delay = 1.0
+        generator = _generator(faulty_endpoint, CircuitBreaker(failure_threshold=2, reset_timeout=30))
+        monkeypatch.setattr(content_generator, "_global_generator", generator)
+        agents = [Agent(AgentProfile(id=i)) for i in range(8)]
+
+        started = time.perf_counter()
+        results = content_generator.generate_agent_contents(agents, concurrency=1, timeout=0.2)
+
+        # Two requests wait out their timeout; the other six fall back at once
+        assert time.perf_counter() - started < 0.8
+        reasons = [r["fallback_reason"] for r in results]
+        assert reasons.count("timeout") == 2
+        assert reasons.count("circuit_open") == 6
+
+    def test_requests_reuse_pooled_connections(self, faulty_endpoint):
+        generator = _generator(faulty_endpoint)
+        for i in range(5):
+            assert _generate(generator, i)["method"] == "huggingface"
+
+        assert faulty_endpoint.requests == 5
+        assert len(faulty_endpoint.connections) == 1
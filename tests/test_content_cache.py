@@ -0,0 +1,75 @@
+"""
+Tests for the generated-content response cache.
+"""
+
+import pytest
+from simulation.content_cache import ContentCache, cache_key
+from simulation.content_generator import ContentGenerator
+
+
+class _CountingClient:
+    """Text-generation client answering locally and counting requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def text_generation(self, prompt, **kwargs):
+        self.calls += 1
+        return f"Post number {self.calls}"
+
+
+class TestContentCache:
+    """Test keys, variants, LRU/TTL bounds and persistence."""
+
+    def test_key_quantises_temperature_and_buckets_traits(self):
+        assert cache_key("p", "gpt2", 0.71, 0.81, 0.15) == cache_key("p", "gpt2", 0.68, 0.95, 0.05)
+        assert cache_key("p", "gpt2", 0.7, 0.5, 0.5) != cache_key("p", "gpt2", 0.9, 0.5, 0.5)
+
+    def test_serves_variants_once_enough_are_stored(self):
+        cache = ContentCache(variants=2, path=None)
+        key = cache_key("p", "gpt2", 0.7, 0.5, 0.5)
+
+        assert cache.get(key) is None
+        cache.put(key, {"content": "a"})
+        assert cache.get(key) is None  # Still collecting variants
+        cache.put(key, {"content": "b"})
+
+        served = {cache.get(key)["content"] for _ in range(50)}
+        assert served == {"a", "b"}
+        assert cache.stats()["hits"] == 50 and cache.stats()["misses"] == 2
+
+    def test_evicts_least_recently_used_and_expired_keys(self, clock):
+        cache = ContentCache(max_entries=2, ttl=60, variants=1, path=None, clock=clock)
+        cache.put("a", {"content": "a"})
+        cache.put("b", {"content": "b"})
+        cache.get("a")
+        cache.put("c", {"content": "c"})
+
+        assert cache.get("b") is None and cache.get("a") is not None
+        clock.now += 61
+        assert cache.get("a") is None
+        assert cache.stats()["evictions"] == 1 and cache.stats()["expirations"] == 1
+
+    def test_persists_across_restarts(self, tmp_path):
+        path = str(tmp_path / "content_cache.json")
+        key = cache_key("p", "gpt2", 0.7, 0.5, 0.5)
+        cache = ContentCache(variants=1, path=path)
+        cache.put(key, {"content": "kept"})
+        cache.save()
+
+        assert ContentCache(variants=1, path=path).get(key)["content"] == "kept"
+        assert ContentCache(variants=1, ttl=-1, path=path).get(key) is None
+
+    def test_generator_stops_calling_the_model_for_repeated_prompts(self):
+        generator = ContentGenerator(api_key=None, cache=ContentCache(variants=3, path=None))
+        generator.client = _CountingClient()
+
+        results = [generator.generate_content("Same prompt", temperature=0.7) for _ in range(20)]
+
+        assert generator.client.calls == 3
+        assert sum(bool(r.get("cached")) for r in results) == 17
+        assert all(r["method"] == "huggingface" for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,7 +2,11 @@
 Tests for content generation module.
 """
 
+import json
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 # Add project root to path
@@ -114,14 +118,108 @@ def test_agent_prompt_generation():
     assert config["diversity_target"] == 0.6
 
 
-def test_markov_corpus_stub():
-    """Test that Markov corpus method exists."""
+def test_fallback_batch_follows_targets():
+    """Test that batched fallback posts match their quality and diversity targets."""
+    import random
+    from simulation.content_generator import FALLBACK_ADDITIONS, FALLBACK_TEMPLATES, ContentGenerator
+    
+    generator = ContentGenerator(api_key=None, fallback="template")
+    results = generator.generate_fallback_batch([0.9] * 200 + [0.1] * 200, [0.1] * 200 + [0.9] * 200,
+                                                rng=random.Random(3))
+    
+    assert len(results) == 400
+    for result in results:
+        assert result["word_count"] == len(result["content"].split())
+        assert result["char_count"] == len(result["content"])
+    # High quality adds a detail sentence; low diversity keeps the first templates and emoji
+    assert all(r["content"].endswith(tuple(FALLBACK_ADDITIONS)) for r in results[:200])
+    low_diversity_prefixes = tuple(t.split("{")[0] for t in FALLBACK_TEMPLATES[:3])
+    assert all(r["content"].startswith(low_diversity_prefixes) and "✨" in r["content"] for r in results[:200])
+    # High diversity reaches every template
+    prefixes = {r["content"][:12] for r in results[200:]}
+    assert len(prefixes) == len(FALLBACK_TEMPLATES)
+
+
+def test_markov_corpus_empty_without_history():
+    """Test that a new agent has an empty Markov corpus."""
     profile = AgentProfile(id="test_agent")
     agent = Agent(profile)
     
-    # Call stub method
     corpus = agent._build_markov_corpus()
     
-    # Should return empty dict (stub implementation)
+    # No content generated yet
     assert isinstance(corpus, dict)
     assert len(corpus) == 0
+
+
+class _SlowTextGeneration(BaseHTTPRequestHandler):
+    """Local stand-in for a text-generation endpoint that answers after `server.delay` seconds."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["content-length"]))
+        time.sleep(self.server.delay)
+        body = json.dumps([{"generated_text": "Stand-in post about the creator economy"}]).encode()
+        try:
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # Client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StandInServer(ThreadingHTTPServer):
+    request_queue_size = 64  # Accept every concurrent connection without SYN retries
+    daemon_threads = True
+
+
+@pytest.fixture
+def stand_in_generator(monkeypatch):
+    """Point the global content generator at a local stand-in server."""
+    pytest.importorskip("huggingface_hub")
+    from simulation import content_generator
+
+    server = _StandInServer(("127.0.0.1", 0), _SlowTextGeneration)
+    server.delay = 0.3
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    generator = content_generator.ContentGenerator(
+        api_key="test-token", model=f"http://127.0.0.1:{server.server_port}"
+    )
+    monkeypatch.setattr(content_generator, "_global_generator", generator)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _agents(count):
+    return [Agent(AgentProfile(id=i)) for i in range(count)]
+
+
+def test_concurrent_generation_is_bounded_by_slowest_request(stand_in_generator):
+    """Requests for all agents overlap instead of running one after another."""
+    from simulation.content_generator import generate_agent_contents
+
+    started = time.perf_counter()
+    results = generate_agent_contents(_agents(8), concurrency=8, timeout=5)
+    elapsed = time.perf_counter() - started
+
+    assert [r["agent_id"] for r in results] == list(range(8))
+    assert all(r["method"] == "huggingface" for r in results)
+    assert elapsed < 8 * stand_in_generator.delay / 2
+
+
+def test_slow_requests_time_out_to_fallback(stand_in_generator):
+    """Requests slower than the timeout fall back to template content."""
+    from simulation.content_generator import generate_agent_contents
+
+    stand_in_generator.delay = 2.0
+    started = time.perf_counter()
+    results = generate_agent_contents(_agents(4), concurrency=2, timeout=0.2)
+
+    assert time.perf_counter() - started < 1.5
+    assert all(r["method"] == "template_fallback" for r in results)
+    assert all(r["fallback_reason"] == "timeout" for r in results)
@@ -0,0 +1,111 @@
+"""
+Tests for the bounded per-agent content store.
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+from simulation import content_store
+from simulation.agents.agent import Agent
+from simulation.agents.profile import AgentProfile
+from simulation.content_store import ContentStore
+from simulation.environment import Environment
+
+
+def _store(tmp_path, window=3, num_agents=2):
+    env = Environment(agents=[Agent(AgentProfile(id=i)) for i in range(num_agents)])
+    return env, ContentStore(env, window=window, spill_dir=str(tmp_path))
+
+
+def _post(tick, agent_id=0):
+    return {"tick": tick, "content": f"post {agent_id}/{tick}", "method": "template_fallback"}
+
+
+class TestContentStore:
+    """Test the memory window, spilling, retrieval and reset."""
+
+    def test_window_bounds_memory_and_spills_oldest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(content_store, "SPILL_CHUNK", 4)
+        env, store = _store(tmp_path)
+        agent = env.agents[0]
+        for tick in range(1, 11):
+            store.add(agent, _post(tick))
+
+        assert [post["tick"] for post in agent._current_tick_content] == [8, 9, 10]
+        assert store.stats()["spilled"] == 7
+        assert store.stats()["chunks"] == 1  # 4 posts written, 3 still buffered
+        # The spill log is a regular multi-member .jsonl.gz file
+        with gzip.open(store.path, "rt") as f:
+            assert [json.loads(line)[1]["tick"] for line in f] == [1, 2, 3, 4]
+
+    def test_get_reads_memory_buffer_and_disk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(content_store, "SPILL_CHUNK", 4)
+        env, store = _store(tmp_path)
+        for tick in range(1, 11):
+            for agent in env.agents:
+                store.add(agent, _post(tick, agent.profile.id))
+
+        assert store.get(1, 2)["content"] == "post 1/2"  # On disk
+        assert store.get(0, 7)["content"] == "post 0/7"  # Buffered
+        assert store.get(1, 10)["content"] == "post 1/10"  # In memory
+        assert store.get(0, 11) is None
+        assert store.get(5, 1) is None
+
+    def test_pending_posts_are_never_spilled(self, tmp_path):
+        env, store = _store(tmp_path, window=2)
+        agent = env.agents[0]
+        store.add(agent, {"tick": 1, "pending": True, "content": ""})
+        for tick in range(2, 5):
+            store.add(agent, _post(tick))
+
+        assert [post["tick"] for post in agent._current_tick_content] == [1, 2, 3, 4]
+        agent._current_tick_content[0] = _post(1)
+        store.trim(agent)
+        assert [post["tick"] for post in agent._current_tick_content] == [3, 4]
+
+    def test_posts_export_in_order_with_filters(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(content_store, "SPILL_CHUNK", 2)
+        env, store = _store(tmp_path)
+        for tick in range(1, 8):
+            for agent in env.agents:
+                store.add(agent, _post(tick, agent.profile.id))
+
+        posts = list(store.posts())
+        assert len(posts) == 14
+        assert [post["tick"] for post in posts if post["agent_id"] == 0] == list(range(1, 8))
+        selected = list(store.posts(agent_ids=[1], tick_from=3, tick_to=5))
+        assert [(post["agent_id"], post["tick"]) for post in selected] == [(1, 3), (1, 4), (1, 5)]
+
+    def test_reset_deletes_spill_log(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(content_store, "SPILL_CHUNK", 1)
+        env, store = _store(tmp_path)
+        env.tick_listeners.append(store._on_event)
+        for tick in range(1, 6):
+            store.add(env.agents[0], _post(tick))
+        path = store.path
+        reader = store.posts()  # Captured before the reset
+
+        env.reset_full_state()
+
+        assert not os.path.exists(path)
+        assert env.agents[0]._current_tick_content == []
+        assert store.get(0, 1) is None
+        assert len(list(reader)) == 5
+
+    def test_unread_export_does_not_leak_the_log(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(content_store, "SPILL_CHUNK", 1)
+        env, store = _store(tmp_path)
+        for tick in range(1, 6):
+            store.add(env.agents[0], _post(tick))
+        fd = store._log.fd
+        reader = store.posts()  # Never streamed
+
+        store.clear()
+        os.fstat(fd)  # Still open for the pending reader
+        del reader
+
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
@@ -0,0 +1,91 @@
+"""
+Tests for background post-text generation.
+"""
+
+import threading
+import time
+
+import pytest
+from simulation import content_worker
+from simulation.actor import actor_for
+from simulation.content_worker import ContentWorker
+
+
+@pytest.fixture
+def gated_generation(monkeypatch):
+    """Hold text generation until the returned event is set."""
+    release = threading.Event()
+    original = content_worker.generate_contents
+
+    def gated(prompt_configs, **kwargs):
+        release.wait(5)
+        return original(prompt_configs, **kwargs)
+
+    monkeypatch.setattr(content_worker, "generate_contents", gated)
+    yield release
+    release.set()
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _contents(env):
+    return [list(getattr(agent, "_current_tick_content", [])) for agent in env.agents]
+
+
+class TestContentWorker:
+    """Test queuing, placeholders and back-pressure."""
+
+    def test_tick_does_not_wait_for_text(self, make_env, gated_generation):
+        env = make_env()
+        worker = ContentWorker()
+        worker.watch(env)
+
+        actor_for(env).call(env.tick)
+
+        assert all(c[-1]["pending"] and c[-1]["tick"] == 1 for c in _contents(env))
+        gated_generation.set()
+        _wait_for(lambda: not any(c[-1].get("pending") for c in _contents(env)))
+        attached = _contents(env)[0][-1]
+        assert attached["tick"] == 1 and attached["agent_id"] == 0 and attached["content"]
+
+    def test_full_queue_drops_oldest_posts(self, make_env, gated_generation):
+        env = make_env(num_agents=5)
+        worker = ContentWorker(max_queued=3, batch_size=1)
+        worker.watch(env)
+
+        actor_for(env).call(env.tick)
+        _wait_for(lambda: worker.stats()["waiting"] <= 3 and worker.stats()["dropped"] >= 1)
+        stats = worker.stats()
+
+        assert stats["waiting"] <= 3
+        assert stats["dropped"] + stats["waiting"] + 1 >= 5  # One batch may be in flight
+        assert sum(len(c) for c in _contents(env)) == 5 - stats["dropped"]
+
+    def test_reset_discards_pending_posts(self, make_env, gated_generation):
+        env = make_env()
+        worker = ContentWorker()
+        worker.watch(env)
+
+        actor_for(env).call(env.tick)
+        actor_for(env).call(env.reset_full_state)
+
+        assert worker.stats()["waiting"] <= worker.batch_size
+        assert not any(c.get("pending") for contents in _contents(env) for c in contents)
+
+
+    def test_without_worker_text_is_generated_inline(self, make_env):
+        env = make_env()
+
+        env.tick()
+
+        posts = [c[-1] for c in _contents(env)]
+        assert all(post["tick"] == 1 and post["content"] and not post.get("pending") for post in posts)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
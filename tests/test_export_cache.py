@@ -0,0 +1,139 @@
+"""
+Tests for the on-disk export cache and its single-flight builds.
+"""
+
+import pytest
+
+
+class TestExportCache:
+    """Test the on-disk export cache (requires fasthtml)."""
+
+    class _Request:
+        def __init__(self, **headers):
+            self.headers = {k.replace("_", "-"): v for k, v in headers.items()}
+
+    @staticmethod
+    def _body(response):
+        import asyncio
+
+        async def collect():
+            return b"".join([chunk async for chunk in response.body_iterator])
+
+        return asyncio.run(collect())
+
+    def test_miss_streams_then_serves_from_disk(self, tmp_path):
+        pytest.importorskip("fasthtml")
+        from routes.export_cache import ExportCache
+
+        cache = ExportCache(directory=str(tmp_path))
+        builds = []
+
+        def produce():
+            builds.append(1)
+            yield b"a,b\n"
+            yield b"1,2\n"
+
+        key = cache.key("csv", ("run", 1, 1), None)
+        first = cache.respond(self._Request(), key, "data.csv", "text/csv", produce)
+        body = self._body(first)
+        second = cache.respond(self._Request(), key, "data.csv", "text/csv", produce)
+
+        assert body == b"a,b\n1,2\n"
+        assert builds == [1]
+        assert second.path == cache.path(key, "data.csv")
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_matching_etag_returns_304(self, tmp_path):
+        pytest.importorskip("fasthtml")
+        from routes.export_cache import ExportCache
+
+        cache = ExportCache(directory=str(tmp_path))
+        key = cache.key("json", ("run", 2, 1), None)
+
+        response = cache.respond(
+            self._Request(if_none_match=f'"{key}"'), key, "data.json", "application/json",
+            lambda: iter([b"[]"])
+        )
+
+        assert response.status_code == 304
+
+    def test_disconnect_before_body_releases_waiters(self, tmp_path):
+        pytest.importorskip("fasthtml")
+        import asyncio
+        from routes.export_cache import ExportCache
+
+        cache = ExportCache(directory=str(tmp_path))
+        key = cache.key("csv", ("run", 3, 1), None)
+        response = cache.respond(self._Request(), key, "data.csv", "text/csv", lambda: iter([b"a\n"]))
+        future = cache._in_flight[key]
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        with pytest.raises(Exception):
+            asyncio.run(response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send))
+
+        assert future.result(timeout=0) is None
+        assert key not in cache._in_flight
+
+    def test_builder_only_releases_its_own_entry(self, tmp_path):
+        pytest.importorskip("fasthtml")
+        from concurrent.futures import Future
+        from routes.export_cache import ExportCache
+
+        cache = ExportCache(directory=str(tmp_path))
+        key = cache.key("csv", ("run", 4, 1), None)
+        stale, current = Future(), Future()
+        cache._in_flight[key] = current
+
+        cache._settle(key, stale, None)
+
+        assert cache._in_flight[key] is current
+        assert stale.result(timeout=0) is None
+
+    def test_waiter_timeout_leaves_live_build_in_place(self, tmp_path, monkeypatch):
+        pytest.importorskip("fasthtml")
+        from routes import export_cache
+        from routes.export_cache import ExportCache
+
+        monkeypatch.setattr(export_cache, "BUILD_WAIT_TIMEOUT", 0.01)
+        cache = ExportCache(directory=str(tmp_path))
+        key = cache.key("csv", ("run", 5, 1), None)
+
+        def produce():
+            return iter([b"a\n"])
+
+        cache.respond(self._Request(), key, "data.csv", "text/csv", produce)  # Builder, never sent
+        build = cache._in_flight[key]
+
+        waiter = cache.respond(self._Request(), key, "data.csv", "text/csv", produce)
+
+        assert self._body(waiter) == b"a\n"
+        assert cache._in_flight[key] is build
+
+    def test_columnar_export_matches_its_snapshot(self, make_env):
+        pytest.importorskip("fasthtml")
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        import contextvars
+        from routes.data_export import export_parquet
+        from simulation.actor import actor_for
+        from simulation.environment import bind_environment
+
+        env = make_env()
+        actor = actor_for(env)
+        actor.call(env.run, 3)
+
+        def request():
+            bind_environment(env)
+            return export_parquet(self._Request())
+
+        response = contextvars.copy_context().run(request)
+        actor.call(env.run, 2)  # Ticks land before the body is built
+        table = pq.read_table(pa.BufferReader(self._body(response)))
+
+        assert set(table.column("tick").to_pylist()) == {1, 2, 3}
+        assert table.schema.metadata[b"platform_capitalism.tick_count"] == b"3"
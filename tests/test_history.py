@@ -0,0 +1,316 @@
+"""
+Tests for columnar history buffers and data exports.
+"""
+
+import pytest
+from simulation.agents.agent import Agent
+from simulation.agents.profile import AgentProfile
+from simulation import environment
+from simulation.environment import Environment
+
+
+def _run(num_agents=3, ticks=5, seed=1234):
+    # Sample traits from the run's RNG so they are covered by the seed too
+    env = Environment(seed=seed)
+    for i in range(num_agents):
+        env.add_agent(Agent(AgentProfile(id=i, rng=env.rng)))
+    for _ in range(ticks):
+        env.tick(generate_text_content=False)
+    return env
+
+
+class TestColumnarHistory:
+    """Test the typed, tick-major history columns."""
+
+    def test_records_one_row_per_agent_per_tick(self):
+        env = _run(num_agents=3, ticks=5)
+        store = env.history_columns
+
+        assert len(store) == 15
+        assert list(store.ticks) == [1, 2, 3, 4, 5]
+        assert list(store.column("agent_id", 0, 3)) == [0, 1, 2]
+
+    def test_row_range_maps_ticks_to_rows(self):
+        env = _run(num_agents=3, ticks=5)
+        store = env.history_columns
+
+        assert store.row_range(2, 3) == (3, 9)
+        assert store.row_range(tick_from=5) == (12, 15)
+        assert store.row_range(tick_to=0) == (0, 0)
+
+    def test_tick_chunks_cover_all_rows(self):
+        env = _run(num_agents=2, ticks=5)
+
+        chunks = list(env.history_columns.tick_chunks(2))
+
+        assert chunks == [(0, 4), (4, 8), (8, 10)]
+
+    def test_categories_round_trip(self):
+        env = _run()
+        store = env.history_columns
+
+        code = store.column("state", 0, 1)[0]
+        assert store.decode("state", code) == env.agents[0].history[0]["state"]
+
+    def test_iter_rows_filters(self):
+        env = _run(num_agents=3, ticks=5)
+
+        rows = list(env.history_columns.iter_rows(
+            tick_from=2, tick_to=3, agent_ids=[1], columns=["tick", "agent_id", "state"]
+        ))
+
+        assert [r[:2] for r in rows] == [[2, 1], [3, 1]]
+        assert rows[0][2] == env.agents[1].history[1]["state"]
+
+    def test_reset_clears_columns(self):
+        env = _run()
+
+        env.reset_full_state()
+
+        assert len(env.history_columns) == 0
+        assert len(env.history_columns.ticks) == 0
+
+    def test_seed_reproduces_run(self):
+        first = _run(seed=42)
+        second = _run(seed=42)
+
+        assert list(first.history_columns.column("final_reward")) == list(
+            second.history_columns.column("final_reward")
+        )
+
+    def test_reset_replays_the_seeded_run(self):
+        env = _run(seed=42)
+        env.reset_full_state()
+        env.run(5)
+        fresh = _run(seed=42)
+
+        for name in ("final_reward", "burnout"):
+            assert list(env.history_columns.column(name)) == list(fresh.history_columns.column(name))
+
+    def test_environments_do_not_share_the_global_rng(self):
+        import random
+
+        random.seed(0)
+        expected = random.random()
+        random.seed(0)
+        _run(seed=42)
+
+        assert random.random() == expected
+
+
+class TestArrowExport:
+    """Test Parquet / Arrow IPC export (requires pyarrow)."""
+
+    def test_parquet_row_groups_and_metadata(self):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        from simulation import arrow_export
+
+        env = _run(num_agents=3, ticks=5, seed=7)
+        data = arrow_export.to_bytes(arrow_export.write_parquet, env, chunk_ticks=2)
+        parquet = pq.ParquetFile(pa.BufferReader(data))
+        meta = parquet.schema_arrow.metadata
+
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.metadata.num_rows == 15
+        assert meta[b"platform_capitalism.seed"] == b"7"
+        assert b"burnout_penalty" in meta[b"platform_capitalism.policy_config"]
+
+    def test_metadata_seed_reproduces_a_session_run(self):
+        import json
+
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        from simulation import arrow_export
+        from simulation.policy_engine import PolicyConfig
+        from simulation.scenarios import load_scenario
+        from simulation.session_pool import EnvironmentPool
+
+        def template():
+            env = _run(ticks=3)  # Warm-up ticks, replayed by each session
+            load_scenario(env, "Algorithmic Slot Machine")
+            return env
+
+        session = EnvironmentPool(template, snapshot_dir=None).get("s")
+        session.run(4)
+        table = pq.read_table(pa.BufferReader(arrow_export.to_bytes(arrow_export.write_parquet, session)))
+        meta = {k.decode().split(".", 1)[1]: v.decode() for k, v in table.schema.metadata.items()}
+
+        replay = Environment(seed=int(meta["seed"]))
+        for i in range(int(meta["num_agents"])):
+            replay.add_agent(Agent(AgentProfile(id=i, rng=replay.rng)))
+        load_scenario(replay, meta["scenario"])
+        replay.policy_engine.config = PolicyConfig(**json.loads(meta["policy_config"]))
+        replay.run(int(meta["tick_count"]))
+
+        assert int(meta["tick_count"]) == 7
+        for name in ("burnout", "final_reward", "state"):
+            expected = [row[0] for row in replay.history_columns.iter_rows(columns=(name,))]
+            assert table.column(name).to_pylist() == expected
+
+    def test_arrow_stream_round_trip(self):
+        pa = pytest.importorskip("pyarrow")
+        from simulation import arrow_export
+
+        env = _run(num_agents=2, ticks=3)
+        data = arrow_export.to_bytes(arrow_export.write_arrow_stream, env, chunk_ticks=1)
+        table = pa.ipc.open_stream(data).read_all()
+
+        assert table.num_rows == 6
+        assert table.column("tick").to_pylist() == [1, 1, 2, 2, 3, 3]
+        assert table.column("state").to_pylist()[0] == env.agents[0].history[0]["state"]
+
+
+class TestExportValidation:
+    """Test that export routes reject unknown columns and codecs (requires fasthtml)."""
+
+    def test_unknown_json_columns_are_rejected(self):
+        pytest.importorskip("fasthtml")
+        from routes.data_export import export_json
+
+        response = export_json(None, columns="tick,bogus")
+
+        assert response.status_code == 400
+        assert b"bogus" in response.body
+
+    def test_unsupported_compression_is_rejected(self):
+        pytest.importorskip("fasthtml")
+        pytest.importorskip("pyarrow")
+        from routes.data_export import export_arrow, export_parquet
+
+        assert export_parquet(None, compression="zip").status_code == 400
+        assert export_arrow(None, compression="snappy").status_code == 400
+
+
+class TestTrajectoryArchive:
+    """Test the memory-mapped (tick, agent, field) archive."""
+
+    def _archived_run(self, tmp_path, num_agents=3, ticks=5, capacity_ticks=2):
+        from simulation.trajectory_archive import TrajectoryArchive
+
+        archive = TrajectoryArchive(str(tmp_path / "run.traj"), capacity_ticks=capacity_ticks)
+        env = Environment(seed=99, history_store=archive)
+        for i in range(num_agents):
+            env.add_agent(Agent(AgentProfile(id=i)))
+        for _ in range(ticks):
+            env.tick(generate_text_content=False)
+        return env, archive
+
+    def test_header_describes_layout(self, tmp_path):
+        import json
+        from simulation.trajectory_archive import ARCHIVE_FIELDS, ITEM_SIZE
+
+        env, archive = self._archived_run(tmp_path)
+        archive.close()
+        header = json.loads((tmp_path / "run.traj.json").read_text())
+
+        assert header["shape"] == [5, 3, len(ARCHIVE_FIELDS)]
+        assert header["layout"] == ["tick", "agent", "field"]
+        assert header["first_tick"] == 1
+        # File grew past the initial capacity and holds at least every recorded tick
+        assert (tmp_path / "run.traj").stat().st_size >= 5 * 3 * len(ARCHIVE_FIELDS) * ITEM_SIZE
+
+    def test_file_matches_agent_history(self, tmp_path):
+        import json
+        import struct
+
+        env, archive = self._archived_run(tmp_path)
+        archive.close()
+        header = json.loads((tmp_path / "run.traj.json").read_text())
+        ticks, agents, fields = header["shape"]
+        raw = (tmp_path / "run.traj").read_bytes()
+        values = struct.unpack_from(f"<{ticks * agents * fields}d", raw)
+
+        f = header["fields"].index("final_reward")
+        cell = values[(4 * agents + 2) * fields + f]  # last tick, agent 2
+        assert cell == env.agents[2].history[-1]["final_reward"]
+
+    def test_header_is_rewritten_only_when_layout_changes(self, tmp_path, monkeypatch):
+        from simulation.trajectory_archive import TrajectoryArchive
+
+        writes = []
+        original = TrajectoryArchive._write_header
+        monkeypatch.setattr(TrajectoryArchive, "_write_header", lambda self: writes.append(1) or original(self))
+        env, archive = self._archived_run(tmp_path, ticks=40, capacity_ticks=64)
+        category_values = sum(len(values) for values in archive.categories.values())
+
+        # First mapping + one per new state/strategy value; not one per tick
+        assert len(writes) == 1 + category_values
+
+    def test_existing_archive_is_left_alone_until_the_first_tick(self, tmp_path):
+        from simulation.trajectory_archive import TrajectoryArchive
+
+        env, archive = self._archived_run(tmp_path)
+        archive.close()
+        previous = (tmp_path / "run.traj.json").read_text()
+
+        restarted = TrajectoryArchive(str(tmp_path / "run.traj"))  # e.g. the app restarting
+
+        assert (tmp_path / "run.traj.json").read_text() == previous
+        assert (tmp_path / "run.traj").exists()
+        restarted.clear()
+        assert (tmp_path / "run.traj").exists()
+
+    def test_close_flushes_the_current_shape(self, tmp_path):
+        import json
+
+        env, archive = self._archived_run(tmp_path, ticks=7, capacity_ticks=64)
+        header = json.loads((tmp_path / "run.traj.json").read_text())
+        assert header["shape"][0] < 7  # Lags until closed
+
+        environment.close_history(env)
+
+        header = json.loads((tmp_path / "run.traj.json").read_text())
+        assert header["shape"][0] == 7
+
+    def test_archive_keeps_agent_history_bounded(self, tmp_path, monkeypatch):
+        from simulation import environment
+
+        monkeypatch.setattr(environment, "AGENT_HISTORY_WINDOW", 4)
+        env, archive = self._archived_run(tmp_path, ticks=20)
+        agent = env.agents[0]
+
+        assert len(agent.history) < 8
+        assert agent.history[-1]["tick"] == 20
+        assert agent.ticks_recorded == 20
+        assert len(list(archive.agent_rows(0))) == 20
+        assert [row[0] for row in archive.agent_rows(1, 3, 5, ["tick"])] == [3, 4, 5]
+
+    def test_agent_series_reads_from_mapping(self, tmp_path):
+        env, archive = self._archived_run(tmp_path)
+        agent = env.agents[1]
+
+        series = env.agent_series(agent, "final_reward", last=3)
+
+        assert isinstance(series, memoryview)
+        assert list(series) == [h["final_reward"] for h in agent.history[-3:]]
+
+    def test_iter_rows_matches_columnar_history(self, tmp_path):
+        env, archive = self._archived_run(tmp_path)
+
+        rows = list(archive.iter_rows(tick_from=2, tick_to=2, columns=["tick", "agent_id", "state"]))
+
+        assert rows == [[2, i, env.agents[i].history[1]["state"]] for i in range(3)]
+
+    def test_reset_starts_fresh_archive(self, tmp_path):
+        env, archive = self._archived_run(tmp_path)
+
+        env.reset_full_state()
+
+        assert len(archive) == 0
+        assert list(archive.iter_rows()) == []
+        assert not (tmp_path / "run.traj").exists()
+        env.tick(generate_text_content=False)
+        assert len(archive) == 3 and (tmp_path / "run.traj").exists()
+
+    def test_evicted_session_archive_is_deleted(self, tmp_path, monkeypatch):
+        from simulation.session_pool import EnvironmentPool
+
+        monkeypatch.setenv("TRAJECTORY_ARCHIVE_PATH", str(tmp_path / "session.traj"))
+        pool = EnvironmentPool(lambda: _run(ticks=0), max_environments=1, snapshot_dir=None)
+        pool.get("a").run(3)
+        assert len(list(tmp_path.glob("session.traj.*"))) == 2  # Data file and header
+
+        pool.get("b")
+
+        assert list(tmp_path.glob("session.traj.*")) == []
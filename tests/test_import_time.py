@@ -0,0 +1,60 @@
+"""
+Tests for import-time budgets of the pure-simulation package.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+
+# Generous for slow CI machines; the package imports in ~25ms locally
+SIMULATION_IMPORT_BUDGET_US = 250_000
+
+SIMULATION_MODULES = (
+    "simulation",
+    "simulation.arrow_export",
+    "simulation.content_generator",
+    "simulation.actor",
+    "simulation.session_pool",
+)
+WEB_AND_HEAVY_MODULES = ("fasthtml", "monsterui", "starlette", "huggingface_hub", "pyarrow")
+
+
+def _python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    )
+
+
+def _cumulative_us(importtime_output, module):
+    """Cumulative import time of `module` from `-X importtime` output."""
+    for line in importtime_output.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1].strip() == module:
+            return int(line.split("|")[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+class TestImportTime:
+    """Test that the simulation stays cheap to import (no web or optional deps)."""
+
+    def test_simulation_imports_within_budget(self):
+        result = _python("import simulation", "-X", "importtime")
+
+        assert _cumulative_us(result.stderr, "simulation") < SIMULATION_IMPORT_BUDGET_US
+
+    def test_simulation_does_not_load_web_or_heavy_modules(self):
+        code = (
+            f"import sys\n"
+            f"for name in {SIMULATION_MODULES!r}: __import__(name)\n"
+            f"print(' '.join(m for m in {WEB_AND_HEAVY_MODULES!r} if m in sys.modules))"
+        )
+
+        assert _python(code).stdout.strip() == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
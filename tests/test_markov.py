@@ -0,0 +1,71 @@
+"""
+Tests for the compiled Markov text engine and the Markov fallback.
+"""
+
+import random
+
+from simulation.agents.agent import Agent
+from simulation.agents.profile import AgentProfile
+from simulation.content_generator import ContentGenerator, generate_markov_posts
+from simulation.markov import MarkovChain, build_corpus
+
+
+class TestMarkovChain:
+    """Test corpus building, sampling and generation."""
+
+    def test_build_corpus_counts_transitions(self):
+        corpus = build_corpus(["a b a c", "a b"])
+        assert corpus == {"a": {"b": 2, "c": 1}, "b": {"a": 1}, "c": {}}
+
+    def test_sampling_follows_weights(self):
+        chain = MarkovChain.compile({"a": {"b": 2, "c": 1}})
+        rng = random.Random(7)
+        counts = {"b": 0, "c": 0}
+        for _ in range(3000):
+            counts[chain.generate(length=3, seed_word="a", rng=rng).split()[1]] += 1
+        assert 1.7 < counts["b"] / counts["c"] < 2.3
+
+    def test_generation_stops_at_length_or_dead_end(self):
+        loop = MarkovChain.compile({"go": {"go": 1}})
+        text = loop.generate(length=1000)
+        assert 1000 <= len(text) < 1003
+        assert MarkovChain.compile({"end": {}, "the": {"end": 1}}).generate(seed_word="the") == "the end"
+        assert MarkovChain.compile({}).generate() == ""
+
+    def test_generate_markov_content_accepts_dict_or_chain(self):
+        generator = ContentGenerator(api_key=None)
+        corpus = {"hello": {"world": 1.0}}
+        assert generator.generate_markov_content(corpus, seed_word="hello") == "hello world"
+        assert generator.generate_markov_content(MarkovChain.compile(corpus), seed_word="hello") == "hello world"
+        assert generator.generate_markov_content({})  # Template fallback
+
+
+class TestMarkovFallback:
+    """Test offline posts from the base and per-agent chains."""
+
+    def test_markov_fallback_method(self):
+        generator = ContentGenerator(api_key=None, fallback="markov")
+        result = generator.generate_content("Write a post", quality_target=0.9)
+        assert result["method"] == "markov"
+        assert result["content"]
+
+    def test_corpus_from_agent_history(self):
+        agent = Agent(AgentProfile(id="writer"))
+        agent._current_tick_content = [
+            {"content": "my garden grows tomatoes", "method": "template"},
+            {"tick": 3, "pending": True, "content": None},
+        ]
+        assert agent._build_markov_corpus() == {
+            "my": {"garden": 1}, "garden": {"grows": 1}, "grows": {"tomatoes": 1}, "tomatoes": {}
+        }
+
+    def test_batch_uses_agent_voice_when_history_is_large_enough(self):
+        veteran = Agent(AgentProfile(id="veteran"))
+        words = [f"w{i}" for i in range(30)]
+        veteran._current_tick_content = [{"content": " ".join(words)}]
+        newcomer = Agent(AgentProfile(id="newcomer"))
+        posts = generate_markov_posts([veteran, newcomer], rng=random.Random(1))
+        assert [post["agent_id"] for post in posts] == ["veteran", "newcomer"]
+        assert set(posts[0]["content"].split()) <= set(words)
+        assert not set(posts[1]["content"].split()) & set(words)
+        assert all(post["method"] == "markov" for post in posts)
@@ -0,0 +1,81 @@
+"""
+Tests for the per-snapshot render cache.
+"""
+
+import contextvars
+from dataclasses import replace
+
+import pytest
+from simulation.actor import actor_for
+from simulation.environment import bind_environment
+
+
+def _render(env, page):
+    """Render `page()` with `env` bound as the request's environment."""
+    def bound():
+        bind_environment(env)
+        return str(page())
+    return contextvars.copy_context().run(bound)
+
+
+class TestRenderCache:
+    """Test page caching and invalidation (requires fasthtml)."""
+
+    def test_repeat_renders_are_cache_hits(self, make_env):
+        from ui.pages.governance_lab import GovernanceLabPage
+        from ui.render_cache import RENDER_STATS
+
+        env = make_env()
+        first = _render(env, GovernanceLabPage)
+        hits = RENDER_STATS["hits"]
+
+        assert _render(env, GovernanceLabPage) == first
+        assert RENDER_STATS["hits"] == hits + 1
+
+    def test_tick_and_policy_changes_invalidate(self, make_env):
+        from ui.pages.dashboard import status_bar
+        from ui.pages.governance_lab import GovernanceLabPage
+
+        env = make_env()
+        actor = actor_for(env)
+        bar, page = _render(env, status_bar), _render(env, GovernanceLabPage)
+
+        actor.call(env.tick, False)
+        assert "Day 1" in _render(env, status_bar) and "Day 1" not in bar
+
+        new_config = replace(env.policy_engine.config, burnout_penalty=0.77)
+        actor.call(setattr, env.policy_engine, "config", new_config)
+        assert _render(env, GovernanceLabPage) != page
+
+    def test_sessions_do_not_share_renders(self, make_env):
+        from ui.pages.dashboard import status_bar
+
+        a, b = make_env(), make_env()
+        actor_for(a).call(a.run, 3)
+
+        assert "Day 3" in _render(a, status_bar)
+        assert "Day 0" in _render(b, status_bar)
+
+
+    def test_fragments_skip_what_the_page_already_shows(self, make_env):
+        import re
+        from ui.pages.dashboard import DashboardFragments, status_bar
+
+        env = make_env()
+        actor = actor_for(env)
+        shown = re.search(r'data-shown="([^"]+)"', _render(env, status_bar)).group(1)
+        new_config = replace(env.policy_engine.config, burnout_penalty=0.77)
+        actor.call(setattr, env.policy_engine, "config", new_config)
+
+        unchanged = _render(env, lambda: DashboardFragments(shown=shown))
+        assert 'id="status-bar"' in unchanged
+        assert "activity-feed" not in unchanged and "health-tab" not in unchanged
+
+        actor.call(env.tick, False)
+        ticked = _render(env, lambda: DashboardFragments(shown=shown))
+        assert "activity-feed" in ticked and "health-tab" in ticked
+        assert "activity-feed" in _render(env, DashboardFragments)  # No header: send everything
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
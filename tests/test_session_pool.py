@@ -0,0 +1,206 @@
+"""
+Tests for the session-scoped environment pool.
+"""
+
+import threading
+import time
+
+import pytest
+from simulation.environment import bind_environment, current_environment, GLOBAL_ENVIRONMENT
+from simulation.scenarios import load_scenario
+from simulation.session_pool import EnvironmentPool, estimate_environment_bytes
+
+
+@pytest.fixture
+def template(make_env):
+    """Factory for the pool's template: three agents under a loaded scenario."""
+    def build():
+        env = make_env()
+        load_scenario(env, "Creator-First Platform")
+        return env
+    return build
+
+
+class TestEnvironmentPool:
+    """Test per-session isolation, LRU eviction and snapshots."""
+
+    def test_sessions_get_isolated_copies_of_the_template(self, template):
+        builds = []
+
+        def factory():
+            builds.append(1)
+            return template()
+
+        pool = EnvironmentPool(factory, snapshot_dir=None)
+        a, b = pool.get("a"), pool.get("b")
+        a.tick(generate_text_content=False)
+        load_scenario(b, "Algorithmic Slot Machine")
+
+        assert builds == [1]
+        assert a is not b and pool.get("a") is a
+        assert (a.tick_count, b.tick_count) == (1, 0)
+        assert a.policy_engine.config.mode == "differential"
+        assert a.run_id != b.run_id
+        assert a.seed != b.seed and a.rng is not b.rng
+
+    def test_warm_builds_template_before_first_session(self, template):
+        pool = EnvironmentPool(template, snapshot_dir=None)
+        assert not pool.ready
+
+        pool.warm()
+
+        assert pool.ready and len(pool) == 0
+
+    def test_sessions_open_after_the_warm_up(self, template):
+        def warmed():
+            env = template()
+            env.run(5)
+            return env
+
+        pool = EnvironmentPool(warmed, snapshot_dir=None)
+        a, b = pool.get("a"), pool.get("b")
+        a.tick(generate_text_content=False)
+
+        assert b.tick_count == 5
+        assert len(b.history_columns) == 5 * 3
+        assert len(a.history_columns) == 6 * 3
+        assert a.seed != b.seed
+
+    def test_evicts_least_recently_used(self, template):
+        pool = EnvironmentPool(template, max_environments=2, snapshot_dir=None)
+        pool.get("a")
+        pool.get("b")
+        pool.get("a")
+        pool.get("c")
+
+        assert "a" in pool and "c" in pool
+        assert "b" not in pool
+        assert pool.stats()["evicted"] == 1
+
+    def test_memory_budget_bounds_the_pool(self, template):
+        pool = EnvironmentPool(template, memory_budget_mb=0.5, snapshot_dir=None)
+        for session in "abc":
+            pool.get(session).run(100)
+            pool.get("trigger-" + session)
+
+        assert pool.memory_estimate() <= pool.memory_budget
+        assert "a" not in pool and "b" not in pool
+        assert "c" in pool
+
+    def test_evicted_environment_is_restored_from_snapshot(self, template, tmp_path):
+        pool = EnvironmentPool(template, max_environments=1, snapshot_dir=str(tmp_path))
+        env = pool.get("a")
+        env.run(7)
+        run_id = env.run_id
+        pool.get("b")  # evicts and spills "a"
+
+        restored = pool.get("a")
+
+        assert restored is not env
+        assert restored.tick_count == 7
+        assert restored.run_id == run_id
+        assert len(restored.history_columns) == 7 * 3
+        assert pool.stats()["spilled"] >= 1 and pool.stats()["restored"] == 1
+        restored.tick(generate_text_content=False)
+        assert restored.tick_count == 8
+
+    def test_spilling_an_evicted_environment_does_not_block_other_sessions(self, template, tmp_path):
+        pool = EnvironmentPool(template, max_environments=1, snapshot_dir=str(tmp_path))
+        a = pool.get("a")
+        a.run(3)
+        running, release = threading.Event(), threading.Event()
+
+        def long_run():
+            with a.lock:  # e.g. an /api/run batch on session "a"
+                running.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=long_run)
+        writer.start()
+        running.wait(5)
+        evicting = threading.Thread(target=pool.get, args=("b",))  # Evicts "a"; its spill waits
+        evicting.start()
+        try:
+            while "b" not in pool:
+                time.sleep(0.01)
+            started = time.perf_counter()
+            assert pool.get("b") is not None
+            assert time.perf_counter() - started < 0.5
+        finally:
+            release.set()
+            writer.join()
+            evicting.join()
+
+        assert pool.get("a").tick_count == 3  # Restored once the spill finished
+
+    def test_concurrent_first_requests_share_one_build(self, template):
+        pool = EnvironmentPool(template, snapshot_dir=None)
+        pool.warm()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.get("a"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(env) for env in results}) == 1
+        assert pool.stats()["created"] == 1
+
+    def test_size_estimate_grows_with_ticks(self, template):
+        env = template()
+        before = estimate_environment_bytes(env)
+        env.run(10)
+
+        assert estimate_environment_bytes(env) > before
+
+
+class TestHealth:
+    """Test /health readiness around a failed warm start (requires fasthtml)."""
+
+    def test_lazy_template_build_reports_ready_but_degraded(self, template, monkeypatch):
+        pytest.importorskip("fasthtml")
+        import json
+        import main
+
+        attempts = []
+
+        def flaky_factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("hub unavailable")
+            return template()
+
+        monkeypatch.setattr(main, "SESSION_POOL", EnvironmentPool(flaky_factory, snapshot_dir=None))
+        monkeypatch.setattr(main, "STARTUP", {**main.STARTUP, "ready_seconds": None, "error": None})
+
+        main.warm_start()
+        response = main.health()
+        assert response.status_code == 503
+        assert json.loads(response.body)["error"] == "hub unavailable"
+
+        main.SESSION_POOL.get("a")  # The first session retries the build
+        response = main.health()
+        body = json.loads(response.body)
+
+        assert response.status_code == 200
+        assert body["ready"] and body["status"] == "degraded"
+
+
+class TestCurrentEnvironment:
+    """Test the per-request environment binding."""
+
+    def test_defaults_to_global_environment(self):
+        import contextvars
+
+        assert contextvars.Context().run(current_environment) is GLOBAL_ENVIRONMENT
+
+    def test_bound_environment_is_current(self, template):
+        import contextvars
+
+        env = template()
+
+        def bound():
+            bind_environment(env)
+            return current_environment()
+
+        assert contextvars.copy_context().run(bound) is env
@@ -108,7 +108,18 @@ class TestEnvironment:
         
         assert env.tick_count == 0
         assert len(env.history["ticks"]) == 0
-    
+
+    def test_run_multiple_ticks(self):
+        """run(n) should advance n ticks and keep the chart window bounded."""
+        agent = Agent(AgentProfile(id=1))
+        env = Environment(agents=[agent])
+
+        env.run(30)
+
+        assert env.tick_count == 30
+        assert len(agent.history) == 30
+        assert len(env.history["ticks"]) == env.max_history_length
+
     def test_tracks_current_scenario(self):
         """Environment should track current_scenario."""
         env = Environment()
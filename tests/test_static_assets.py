@@ -0,0 +1,121 @@
+"""
+Tests for response compression and fingerprinted static assets.
+"""
+
+import gzip
+
+import pytest
+
+
+def _client(app):
+    from starlette.testclient import TestClient
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """Test content negotiation and exclusions (requires starlette)."""
+
+    def _app(self):
+        from starlette.applications import Starlette
+        from starlette.responses import Response
+        from starlette.routing import Route
+        from routes.compression import CompressionMiddleware
+
+        def page(request):
+            return Response("<div>tick</div>" * 200, media_type="text/html")
+
+        def parquet(request):
+            return Response(b"PAR1" * 500, media_type="application/vnd.apache.parquet")
+
+        app = Starlette(routes=[Route("/page", page), Route("/parquet", parquet)])
+        return CompressionMiddleware(app)
+
+    def test_compresses_html_for_accepting_clients(self):
+        client = _client(self._app())
+
+        response = client.get("/page", headers={"accept-encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < 3000 / 5
+        assert response.text == "<div>tick</div>" * 200
+
+    def test_skips_refused_and_precompressed_content(self):
+        client = _client(self._app())
+
+        assert "content-encoding" not in client.get("/page", headers={"accept-encoding": "gzip;q=0"}).headers
+        assert "content-encoding" not in client.get("/parquet", headers={"accept-encoding": "gzip"}).headers
+
+    def test_parses_accept_encoding(self):
+        from routes.compression import accepted_encodings
+
+        assert accepted_encodings("gzip, deflate, br;q=0.5") == {"gzip", "deflate", "br"}
+        assert accepted_encodings("br;q=0, gzip;q=1.0") == {"gzip"}
+        assert accepted_encodings(None) == set()
+
+
+class TestStaticAssets:
+    """Test fingerprinting and precompressed variants."""
+
+    def test_url_changes_with_content(self, tmp_path):
+        from routes.static_assets import StaticAssets
+
+        (tmp_path / "app.js").write_text("console.log(1);")
+        first = StaticAssets(tmp_path).url("app.js")
+        (tmp_path / "app.js").write_text("console.log(2);")
+        second = StaticAssets(tmp_path).url("app.js")
+
+        assert first.startswith("/assets/app.") and first.endswith(".js")
+        assert first != second
+        assert StaticAssets(tmp_path).url("missing.js", fallback="https://cdn") == "https://cdn"
+
+    def test_missing_file_is_picked_up_once_added(self, tmp_path):
+        from routes.static_assets import StaticAssets
+
+        assets = StaticAssets(tmp_path)
+        assert assets.url("vendor/lib.js", fallback="https://cdn") == "https://cdn"
+
+        (tmp_path / "vendor").mkdir()
+        (tmp_path / "vendor" / "lib.js").write_text("window.lib = 1;")
+
+        assert assets.url("vendor/lib.js", fallback="https://cdn").startswith("/assets/vendor/lib.")
+
+    def test_vendored_chart_js_is_fingerprinted(self):
+        import hashlib
+        from routes.static_assets import (
+            CHART_JS_CDN_URL, CHART_JS_VENDOR_PATH, HASH_LENGTH, STATIC_DIR, StaticAssets,
+        )
+
+        path = STATIC_DIR / CHART_JS_VENDOR_PATH
+        if not path.exists():
+            pytest.skip("Chart.js is not vendored (run `make vendor`)")
+        data = path.read_bytes()
+        version = CHART_JS_CDN_URL.split("@", 1)[1].split("/", 1)[0]
+
+        url = StaticAssets().url(CHART_JS_VENDOR_PATH, fallback=CHART_JS_CDN_URL)
+
+        assert f"v{version}".encode() in data[:200]  # Same release as the CDN fallback
+        assert url == f"/assets/vendor/chart.umd.min.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}.js"
+
+    def test_serves_precompressed_variant_with_immutable_caching(self, tmp_path):
+        from starlette.applications import Starlette
+        from starlette.routing import Mount
+        from routes.static_assets import ASSET_PREFIX, StaticAssets
+
+        source = "function f() { return 1; }\n" * 100
+        (tmp_path / "app.js").write_text(source)
+        assets = StaticAssets(tmp_path)
+        url = assets.url("app.js")
+        client = _client(Starlette(routes=[Mount(ASSET_PREFIX, app=assets)]))
+
+        response = client.get(url, headers={"accept-encoding": "gzip"})
+        raw = assets.asset("app.js").variants["gzip"]
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "immutable" in response.headers["cache-control"]
+        assert gzip.decompress(raw).decode() == source
+        assert client.get(url, headers={"if-none-match": response.headers["etag"]}).status_code == 304
+        assert client.get(ASSET_PREFIX + "/app.0000000000.js").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
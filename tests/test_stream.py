@@ -0,0 +1,213 @@
+"""
+Tests for live updates: the per-tick SSE stream and the auto-run loop.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+
+class _Request:
+    async def is_disconnected(self):
+        return False
+
+
+def _parse(frame):
+    lines = dict(line.split(": ", 1) for line in frame.strip().splitlines() if not line.startswith("retry"))
+    return lines["event"], json.loads(lines["data"])
+
+
+class TestTickBroadcaster:
+    """Test delta building and fan-out (requires fasthtml)."""
+
+    def test_tick_delta_reaches_observer(self, make_env):
+        pytest.importorskip("fasthtml")
+        from routes.stream import TickBroadcaster
+
+        env = make_env()
+        broadcaster = TickBroadcaster(env)
+
+        async def observe():
+            events = broadcaster.events(_Request())
+            hello = await anext(events)
+            await asyncio.to_thread(env.tick, False)
+            frame = await anext(events)
+            await events.aclose()
+            return hello, frame
+
+        hello, frame = asyncio.run(observe())
+        event, delta = _parse(frame)
+
+        assert _parse(hello)[0] == "hello"
+        assert event == "tick"
+        assert delta["tick"] == 1
+        assert sum(delta["states"].values()) == 3
+        assert {a["id"] for a in delta["agents"]} == {0, 1, 2}
+        assert delta["chart"]["tick"] == 1
+        assert broadcaster.observers == 0
+
+    def test_no_work_without_observers(self, make_env):
+        pytest.importorskip("fasthtml")
+        from routes.stream import TickBroadcaster
+
+        env = make_env()
+        broadcaster = TickBroadcaster(env)
+        env.tick(generate_text_content=False)
+
+        assert broadcaster._agent_snapshot == {}
+
+    def test_slow_observer_drops_oldest_frames(self, make_env):
+        pytest.importorskip("fasthtml")
+        from routes.stream import TickBroadcaster
+
+        env = make_env()
+        broadcaster = TickBroadcaster(env, queue_size=2, max_fps=None)
+
+        async def observe():
+            events = broadcaster.events(_Request())
+            await anext(events)
+            for _ in range(5):
+                await asyncio.to_thread(env.tick, False)
+            await asyncio.sleep(0)
+            frames = [await anext(events), await anext(events)]
+            await events.aclose()
+            return frames
+
+        frames = asyncio.run(observe())
+
+        assert [_parse(f)[1]["tick"] for f in frames] == [4, 5]
+
+    def test_one_frame_per_tick_with_a_content_worker(self, make_env):
+        pytest.importorskip("fasthtml")
+        from routes.stream import TickBroadcaster
+        from simulation.content_worker import ContentWorker
+
+        env = make_env()
+        ContentWorker().watch(env)  # Sends "posts" mid-tick
+        broadcaster = TickBroadcaster(env, max_fps=None)
+
+        async def observe():
+            events = broadcaster.events(_Request())
+            await anext(events)
+            for _ in range(2):
+                await asyncio.to_thread(env.tick)
+            frames = [await anext(events), await anext(events)]
+            await events.aclose()
+            return frames
+
+        frames = asyncio.run(observe())
+
+        assert [_parse(f)[1]["tick"] for f in frames] == [1, 2]
+        assert broadcaster.frames_sent == 2
+
+
+class TestAutoRunner:
+    """Test the background tick loop."""
+
+    def test_step_runs_ticks_off_the_event_loop(self, make_env):
+        from simulation.runner import AutoRunner
+
+        env = make_env()
+        runner = AutoRunner(env)
+        asyncio.run(runner.step(3))
+
+        assert env.tick_count == 3
+        assert runner.status()["ticks_run"] == 3
+        assert not runner.running
+
+    def test_start_and_pause(self, make_env):
+        from simulation.runner import AutoRunner
+
+        env = make_env()
+        runner = AutoRunner(env, ticks_per_second=0)
+
+        async def run_briefly():
+            runner.start()
+            await asyncio.sleep(0.2)
+            status = runner.status()
+            runner.pause()
+            await asyncio.sleep(0.05)
+            return status
+
+        status = asyncio.run(run_briefly())
+        ticks_after_pause = env.tick_count
+
+        assert status["running"]
+        assert status["achieved_ticks_per_second"] > 0
+        assert ticks_after_pause > 0
+        assert not runner.running
+
+    def test_rejects_negative_speed(self, make_env):
+        from simulation.runner import AutoRunner
+
+        with pytest.raises(ValueError):
+            AutoRunner(make_env(), ticks_per_second=-1)
+
+    def test_speed_route_rejects_non_finite_rates(self):
+        pytest.importorskip("fasthtml")
+        from routes.api_autorun import autorun_speed
+
+        for rate in (float("nan"), float("inf")):
+            assert asyncio.run(autorun_speed(None, ticks_per_second=rate)).status_code == 400
+
+    def test_writes_post_text_through_an_attached_content_worker(self, make_env, monkeypatch):
+        from simulation.content_worker import ContentWorker
+        from simulation.environment import Environment
+        from simulation.runner import AutoRunner
+
+        env = make_env()
+        inline = []
+        monkeypatch.setattr(Environment, "_generate_content_inline", lambda self: inline.append(self))
+        runner = AutoRunner(env)
+        asyncio.run(runner.step(1))
+        assert inline == []  # No worker: the loop never waits on text
+
+        worker = ContentWorker()
+        posted = []
+        monkeypatch.setattr(worker, "_enqueue", posted.append)
+        worker.watch(env)
+        asyncio.run(runner.step(2))
+
+        assert posted == [env, env]
+        assert inline == []
+
+    def test_accessors_do_not_wait_for_a_running_tick(self, make_env):
+        from routes.stream import broadcaster_for
+        from simulation.runner import runner_for
+
+        env = make_env()
+        holding, release = threading.Event(), threading.Event()
+
+        def long_tick():
+            with env.lock:  # Held by the writer for a whole tick or /api/run batch
+                holding.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=long_tick)
+        writer.start()
+        holding.wait(5)
+        try:
+            results = []
+            readers = [
+                threading.Thread(target=lambda accessor=accessor: results.append(accessor(env)))
+                for accessor in (runner_for, broadcaster_for, runner_for)
+            ]
+            for reader in readers:
+                reader.start()
+                reader.join(1)
+
+            assert len(results) == 3
+            assert results[0] is results[2]
+        finally:
+            release.set()
+            writer.join()
+
+    def test_step_route_bounds_ticks(self):
+        pytest.importorskip("fasthtml")
+        from routes.api_autorun import autorun_step
+        from routes.api_update_policy import MAX_RUN_TICKS
+
+        for ticks in (0, MAX_RUN_TICKS + 1):
+            assert asyncio.run(autorun_step(None, ticks=ticks)).status_code == 400
@@ -0,0 +1,59 @@
+"""
+Tests for tick request coalescing and back-pressure.
+"""
+
+import threading
+
+import pytest
+from simulation.actor import actor_for
+from simulation.tick_queue import TickQueue, TickQueueFull, tick_queue_for
+
+
+def _block_writer(env):
+    """Occupy the environment's writer thread until the returned event is set."""
+    release, started = threading.Event(), threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+
+    actor_for(env).submit(wait)
+    started.wait(5)
+    return release
+
+
+class TestTickQueue:
+    """Test batching of concurrent tick requests."""
+
+    def test_requests_during_a_busy_writer_share_one_batch(self, make_env):
+        env = make_env()
+        queue = tick_queue_for(env)
+        commands = actor_for(env).commands
+        release = _block_writer(env)
+
+        batches = [queue.request() for _ in range(7)]
+        release.set()
+
+        assert [batch.result(5) for batch in batches] == [7] * 7
+        assert env.tick_count == 7
+        assert actor_for(env).commands == commands + 2  # The blocker and one batch
+        assert queue.stats()["batches"] == 1
+
+    def test_excess_requests_are_refused_with_a_retry_hint(self, make_env):
+        env = make_env()
+        queue = TickQueue(env, max_pending=3)
+        release = _block_writer(env)
+
+        batches = [queue.request() for _ in range(3)]
+        with pytest.raises(TickQueueFull) as refused:
+            queue.request()
+        release.set()
+
+        assert refused.value.retry_after >= 1
+        assert batches[0].result(5) == 3
+        assert queue.request().result(5) == 1  # Accepted again once drained
+        assert queue.stats()["rejected"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -8,11 +8,15 @@ from .reward_timeline import reward_timeline
 
 # Agent display
 from .agent_card import agent_card
+from .agent_browser import agent_browser, agent_grid_stub, agent_page, agent_query
 from .decision_tree import decision_tree
 
 # Activity feed
 from .activity_feed import activity_feed
 
+# Simulation controls
+from .autorun_controls import autorun_controls, fast_forward_controls
+
 # Policy & transparency
 from .policy_controls import policy_controls, scenario_selector, preset_selector
 from .transparency_panel import transparency_panel
@@ -28,12 +32,18 @@ __all__ = [
     "agent_state_distribution",
     "reward_timeline",
     "agent_card",
+    "agent_browser",
+    "agent_grid_stub",
+    "agent_page",
+    "agent_query",
     "decision_tree",
     
     # Activity feed
     "activity_feed",
     
     # Controls
+    "autorun_controls",
+    "fast_forward_controls",
     "policy_controls",
     "scenario_selector",
     "preset_selector",
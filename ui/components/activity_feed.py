@@ -1,11 +1,12 @@
 from fasthtml.common import Div, H2, H3, P, Span, Br
 from monsterui.all import Card, CardBody
-from simulation.environment import GLOBAL_ENVIRONMENT
+from simulation.actor import current_snapshot
 
 def activity_feed():
     """Display recent creator activity and state transitions."""
-    agents = GLOBAL_ENVIRONMENT.agents
-    tick_count = GLOBAL_ENVIRONMENT.tick_count
+    env = current_snapshot()
+    agents = env.agents
+    tick_count = env.tick_count
     
     # Collect recent activities from all agents
     activities = []
@@ -28,11 +29,8 @@ def activity_feed():
             action = _generate_activity_description(state, burnout, reward)
             time_ago = _format_time_ago(tick_count, tick)
             
-            # Check if agent has generated content for this tick
-            generated_content = None
-            if hasattr(agent, '_current_tick_content') and agent._current_tick_content:
-                # Get the most recent content
-                generated_content = agent._current_tick_content[-1] if agent._current_tick_content else None
+            # Content generated (or still being written) for this tick, if any
+            generated_content = _content_for_tick(agent, tick)
             
             activities.append({
                 "agent_id": agent.profile.id,
@@ -57,9 +55,14 @@ def activity_feed():
                 H2("📋 Recent Activity", cls="text-lg sm:text-2xl font-bold text-gray-100 mb-3 sm:mb-4"),
                 P("No activity yet. Run a tick to see creator behavior.", cls="text-xs sm:text-sm text-gray-400 text-center py-6 sm:py-8")
             ),
-            cls="bg-gray-800 border-gray-700"
+            cls="bg-gray-800 border-gray-700",
+            id="activity-feed"
         )
     
+    # Poll until the background worker has written every pending post
+    pending = any(a["content"] and a["content"].get("pending") for a in activities)
+    refresh = {"hx_get": "/fragments/activity-feed", "hx_trigger": "load delay:1s", "hx_swap": "outerHTML"} if pending else {}
+    
     return Card(
         CardBody(
             H2("� Content Timeline", cls="text-lg sm:text-2xl font-bold text-gray-100 mb-3 sm:mb-4"),
@@ -70,9 +73,18 @@ def activity_feed():
                 style="max-height: 600px;"
             )
         ),
-        cls="bg-gray-800 border-gray-700"
+        cls="bg-gray-800 border-gray-700",
+        id="activity-feed",
+        **refresh
     )
 
+def _content_for_tick(agent, tick):
+    """Latest generated content (or pending placeholder) for `tick`."""
+    for content in reversed(getattr(agent, '_current_tick_content', ())):
+        if content.get("tick") == tick:
+            return content
+    return None
+
 def _activity_item(activity):
     """Render a single activity item as a timeline post."""
     state = activity["state"]
@@ -110,7 +122,15 @@ def _activity_item(activity):
     ]
     
     # Add generated content if available
-    if content and isinstance(content, dict):
+    if content and content.get("pending"):
+        # Text is still being written in the background
+        card_content.append(
+            Div(
+                P("✍️ Writing post...", cls="text-sm text-gray-500 italic animate-pulse"),
+                cls="pl-11"
+            )
+        )
+    elif content and isinstance(content, dict):
         content_text = content.get("content", "")
         method = content.get("method", "unknown")
         word_count = content.get("word_count", 0)
@@ -0,0 +1,126 @@
+from urllib.parse import urlencode
+
+from fasthtml.common import Div, H2, P, Form, Label, Input, Select, Option
+from simulation.actor import current_snapshot
+from simulation.agent_index import DEFAULT_PAGE_SIZE, SORT_KEYS, AgentQuery, agent_index
+from ui.components.agent_card import agent_card
+from ui.render_cache import version_tag
+
+PAGE_URL = "/fragments/agents/page"
+GRID_CLS = "grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-4"
+FIELD_CLS = "px-2 py-1 border border-gray-600 bg-gray-700 text-gray-100 rounded text-sm focus:border-blue-500 focus:outline-none"
+
+SORT_LABELS = {"id": "Agent ID", "burnout": "Burnout", "earnings": "Earnings", "state": "State"}
+
+
+def agent_query(params) -> AgentQuery:
+    """Build an AgentQuery from request parameters, ignoring blank or invalid values."""
+    def number(name):
+        try:
+            return float(params.get(name))
+        except (TypeError, ValueError):
+            return None
+
+    sort = params.get("sort")
+    return AgentQuery(
+        sort=sort if sort in SORT_KEYS else "id",
+        descending=params.get("descending") in ("true", "on", "1"),
+        state=params.get("state") or None,
+        min_burnout=number("min_burnout"),
+        max_burnout=number("max_burnout"),
+        min_earnings=number("min_earnings"),
+    )
+
+
+def agent_browser(query=AgentQuery()):
+    """Paginated agent browser: filter bar plus the first page of cards.
+
+    Further pages load as the user scrolls (see `agent_page`), so the size
+    of the response does not grow with the number of agents.
+    """
+    index = agent_index(current_snapshot())
+    return Div(
+        H2("👥 Individual Creators", cls="text-xl sm:text-2xl font-bold mb-4 text-gray-100"),
+        _filters(query, index.states),
+        Div(*agent_page(query), id="agent-grid", cls=GRID_CLS)
+        if index.rows else P("No agents. Load a scenario to begin.", cls="text-gray-400 text-center py-8"),
+        id="agents-panel"
+    )
+
+
+def agent_grid_stub():
+    """Placeholder grid that reloads the current filter's first page once visible."""
+    return Div(
+        P("Loading creators...", cls="text-gray-400 text-center py-8 col-span-full"),
+        id="agent-grid",
+        cls=GRID_CLS,
+        hx_get=PAGE_URL,
+        hx_include="#agent-filters",
+        hx_trigger="intersect once",
+        hx_swap="innerHTML"
+    )
+
+
+def agent_page(query, offset=0, limit=DEFAULT_PAGE_SIZE):
+    """One page of agent cards, followed by a sentinel that loads the next page when revealed.
+
+    The sentinel's URL carries the snapshot version (`v`) the page was built
+    from, so a next page requested after the state changed can restart the
+    grid instead of continuing a different ordering.
+    """
+    snapshot = current_snapshot()
+    agents, total = agent_index(snapshot).page(query, offset, limit)
+    items = []
+    if offset == 0:
+        items.append(P(f"{total} creator{'s' if total != 1 else ''}", cls="text-xs text-gray-400 col-span-full"))
+    items.extend(agent_card(agent) for agent in agents)
+    if offset + len(agents) < total:
+        params = urlencode({
+            **query.params(), "offset": offset + len(agents), "limit": limit, "v": version_tag(snapshot)
+        })
+        items.append(Div(
+            P("Loading more creators...", cls="text-gray-400 text-center py-4"),
+            cls="col-span-full",
+            hx_get=f"{PAGE_URL}?{params}",
+            hx_trigger="revealed",
+            hx_swap="outerHTML"
+        ))
+    return tuple(items)
+
+
+def _filters(query, states):
+    """Sort and filter controls; any change reloads the grid from its first page."""
+    return Form(
+        _field("Sort by", Select(
+            *[Option(SORT_LABELS[key], value=key, selected=(key == query.sort)) for key in SORT_KEYS],
+            name="sort", cls=FIELD_CLS
+        )),
+        _field("Order", Select(
+            Option("Ascending", value="false", selected=not query.descending),
+            Option("Descending", value="true", selected=query.descending),
+            name="descending", cls=FIELD_CLS
+        )),
+        _field("State", Select(
+            Option("All states", value=""),
+            *[Option(state.title(), value=state, selected=(state == query.state)) for state in states],
+            name="state", cls=FIELD_CLS
+        )),
+        _field("Min burnout", _number_input("min_burnout", query.min_burnout, "0.1")),
+        _field("Max burnout", _number_input("max_burnout", query.max_burnout, "0.1")),
+        _field("Min earnings ($)", _number_input("min_earnings", query.min_earnings, "1")),
+        id="agent-filters",
+        hx_get=PAGE_URL,
+        hx_target="#agent-grid",
+        hx_swap="innerHTML",
+        hx_trigger="change, submit",
+        cls="flex flex-wrap gap-3 items-end mb-4"
+    )
+
+
+def _field(label, control):
+    return Div(Label(label, cls="block text-xs font-medium text-gray-300 mb-1"), control)
+
+
+def _number_input(name, value, step):
+    return Input(name=name, type="number", step=step, min="0", value="" if value is None else value,
+                 cls=f"w-24 {FIELD_CLS}")
@@ -1,8 +1,8 @@
 from fasthtml.common import Div, H2, H3, P, Span, Canvas, Script, Ul, Li, A
 from monsterui.all import Card, CardBody
 from ui.components.decision_tree import decision_tree
-from simulation.environment import GLOBAL_ENVIRONMENT
-import json
+from simulation.actor import current_snapshot
+from ui.render_cache import chart_url
 
 def agent_card(agent):
     """Display agent with research-relevant metrics."""
@@ -35,12 +35,12 @@ def agent_card(agent):
             Div(
                 P(f"🎭 State: {p.current_state.name}", cls="font-medium text-gray-200 text-sm sm:text-base"),
                 P(f"📋 Strategy: {p.strategy}", cls="text-xs sm:text-sm text-gray-400"),
-                P(f"⏱️ Ticks Active: {len(agent.history)} | 📊 Total Posts: {sum(h.get('posts_generated', 0) for h in agent.history):.1f}", 
+                P(f"⏱️ Ticks Active: {agent.ticks_recorded} | 📊 Total Posts: {agent.total_posts:.1f}", 
                   cls="text-xs text-gray-400 mt-1"),
                 P(
-                    Span(f"💵 Earnings: ${sum(h.get('cpm_earnings', 0) for h in agent.history):.2f}", cls="text-green-400 text-xs sm:text-sm"),
+                    Span(f"💵 Earnings: ${agent.total_earnings:.2f}", cls="text-green-400 text-xs sm:text-sm"),
                     Span(" | ", cls="text-gray-600"),
-                    Span(f"👁️ Views: {sum(h.get('posts_generated', 0) for h in agent.history) * GLOBAL_ENVIRONMENT.policy_engine.config.avg_views_per_post:,.0f}", cls="text-blue-400 text-xs sm:text-sm"),
+                    Span(f"👁️ Views: {agent.total_posts * current_snapshot().policy_engine.config.avg_views_per_post:,.0f}", cls="text-blue-400 text-xs sm:text-sm"),
                     cls="text-xs font-semibold mt-1"
                 ),
                 cls="mb-2 sm:mb-3 pb-2 sm:pb-3 border-b border-gray-700"
@@ -77,7 +77,7 @@ def agent_card(agent):
                 ),
                 
                 # Sparklines (if history available)
-                _agent_sparklines(agent) if len(agent.history) > 1 else None,
+                _agent_sparklines(agent) if agent.ticks_recorded > 1 else None,
                 
                 # Content Traits
                 H3("Content Traits", cls="text-xs sm:text-sm font-semibold text-gray-300 mb-2 mt-3"),
@@ -110,7 +110,8 @@ def agent_card(agent):
             """)
         ),
         cls="bg-gray-800 border-gray-700",
-        style="height: auto; max-height: 600px; flex-shrink: 0;"
+        style="height: auto; max-height: 600px; flex-shrink: 0;",
+        id=f"agent-card-{p.id}"
     )
 
 def _metric_row(label, value, emoji, danger_threshold=0.7, inverse=False):
@@ -205,22 +206,12 @@ def _metric_row(label, value, emoji, danger_threshold=0.7, inverse=False):
 
 def _agent_sparklines(agent):
     """Render sparkline charts for agent's burnout and reward history."""
-    if not agent.history or len(agent.history) < 2:
+    if agent.ticks_recorded < 2:
         return None
     
     agent_id = agent.profile.id
-    
-    # Extract history data (last 10 ticks)
-    history_slice = agent.history[-10:]
-    burnout_history = []
-    reward_history = []
-    
-    for entry in history_slice:
-        # Get burnout from state or profile snapshot
-        burnout_history.append(entry.get("burnout", 0))
-        reward_history.append(entry.get("final_reward", 0))
-    
-    ticks = list(range(len(history_slice)))
+    # Series (last 10 ticks for every agent) are fetched by charts.js
+    data_url = chart_url("sparklines")
     
     return Div(
         H3("Recent Trends", cls="text-sm font-semibold text-gray-300 mb-2 mt-3 pt-3 border-t border-gray-700"),
@@ -231,7 +222,8 @@ def _agent_sparklines(agent):
             Div(
                 P("🔥 Burnout", cls="text-xs font-semibold text-gray-300 mb-1"),
                 Div(
-                    Canvas(id=f"burnout-{agent_id}", width="150", height="60", style="max-height: 60px; width: 100%;"),
+                    Canvas(id=f"burnout-{agent_id}", width="150", height="60", style="max-height: 60px; width: 100%;",
+                           data_chart="sparklines", data_chart_url=data_url, data_agent=agent_id, data_series="burnout"),
                     cls="bg-gray-750 rounded p-2 border border-gray-700"
                 ),
                 cls="flex-1"
@@ -241,7 +233,8 @@ def _agent_sparklines(agent):
             Div(
                 P("🎯 Rewards", cls="text-xs font-semibold text-gray-300 mb-1"),
                 Div(
-                    Canvas(id=f"reward-{agent_id}", width="150", height="60", style="max-height: 60px; width: 100%;"),
+                    Canvas(id=f"reward-{agent_id}", width="150", height="60", style="max-height: 60px; width: 100%;",
+                           data_chart="sparklines", data_chart_url=data_url, data_agent=agent_id, data_series="reward"),
                     cls="bg-gray-750 rounded p-2 border border-gray-700"
                 ),
                 cls="flex-1"
@@ -250,14 +243,11 @@ def _agent_sparklines(agent):
             cls="grid grid-cols-2 gap-3"
         ),
         
-        # Initialize sparkline charts using external JS
-        Script(f"""
-            initBurnoutSparkline('{agent_id}', {json.dumps(ticks)}, {json.dumps(burnout_history)});
-            initRewardSparkline('{agent_id}', {json.dumps(ticks)}, {json.dumps(reward_history)});
-            // Re-initialize tabs after charts load
-            if (typeof initAgentTabs === 'function') {{
+        # Re-initialize tabs after charts load
+        Script("""
+            if (typeof initAgentTabs === 'function') {
                 setTimeout(initAgentTabs, 200);
-            }}
+            }
         """),
         
         cls="mt-2"
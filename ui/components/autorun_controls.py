@@ -0,0 +1,67 @@
+from fasthtml.common import Div, Span, Button, Form, Input
+
+def autorun_controls(status):
+    """Start/pause/step controls and throughput readout for the background auto-run loop.
+
+    Args:
+        status: Dict from `AutoRunner.status()` (plus stream stats)
+    """
+    running = status["running"]
+    target = status["target_ticks_per_second"]
+    rate = f"{target:g}/s" if target else "max"
+    button_cls = "px-3 py-1 rounded-lg text-white text-xs sm:text-sm font-semibold"
+
+    return Div(
+        Button("⏸ Pause" if running else "⏩ Auto-run",
+               hx_post="/api/autorun/pause" if running else "/api/autorun/start",
+               hx_target="#autorun-controls",
+               hx_swap="outerHTML",
+               cls=f"{button_cls} {'bg-yellow-600 hover:bg-yellow-700' if running else 'bg-blue-600 hover:bg-blue-700'}"),
+        Button("⏭ Step",
+               hx_post="/api/autorun/step",
+               hx_target="#autorun-controls",
+               hx_swap="outerHTML",
+               cls=f"{button_cls} bg-gray-600 hover:bg-gray-700"),
+        Form(
+            Input(type="number", name="ticks_per_second", value=f"{target:g}", min="0", step="any",
+                  title="Ticks per second (0 = as fast as possible)",
+                  cls="w-20 px-2 py-1 bg-gray-700 text-gray-100 rounded text-xs sm:text-sm"),
+            hx_post="/api/autorun/speed",
+            hx_trigger="change",
+            hx_target="#autorun-controls",
+            hx_swap="outerHTML"
+        ),
+        Span(
+            f"{status['achieved_ticks_per_second']:g} ticks/s (target {rate}) · lag {status['lag_seconds'] * 1000:.0f} ms",
+            cls="text-xs text-gray-400"
+        ),
+        id="autorun-controls",
+        cls="flex flex-wrap items-center gap-2 mt-2",
+        # Refresh the readout while the loop runs
+        **({"hx_get": "/api/autorun/status", "hx_trigger": "every 2s", "hx_swap": "outerHTML"} if running else {})
+    )
+
+def fast_forward_controls(ticks=100, timing=None):
+    """Run N ticks in one request, rendering only the final state.
+
+    Args:
+        ticks: Default number of ticks in the input
+        timing: Optional dict from the last run (ticks, simulate_ms, render_ms)
+    """
+    readout = ""
+    if timing:
+        readout = (f"{timing['ticks']} ticks in {timing['simulate_ms']:.0f} ms "
+                   f"({timing['ticks_per_second']:.0f}/s) · render {timing['render_ms']:.0f} ms")
+    return Form(
+        Input(type="number", name="ticks", value=str(ticks), min="1", step="1",
+              title="Ticks to run",
+              cls="w-20 px-2 py-1 bg-gray-700 text-gray-100 rounded text-xs sm:text-sm"),
+        Button("⏩ Run Ticks", type="submit",
+               cls="px-3 py-1 rounded-lg text-white text-xs sm:text-sm font-semibold bg-green-700 hover:bg-green-800"),
+        Span(readout, cls="text-xs text-gray-400"),
+        id="fast-forward",
+        hx_post="/api/run",
+        hx_target="#status-bar",
+        hx_swap="outerHTML",
+        cls="flex flex-wrap items-center gap-2 mt-2"
+    )
@@ -1,4 +1,8 @@
 from fasthtml.common import Div, A, Nav, Script, Button
+from routes.static_assets import asset_url, CHART_JS_CDN_URL, CHART_JS_VENDOR_PATH
+
+# Scripts every page loads (under static/), in load order after Chart.js
+LAYOUT_ASSETS = ("js/charts.js", "js/agent-sparklines.js", "js/tabs.js")
 
 def nav_bar(current_path="/"):
     """Navigation bar for the application."""
@@ -79,11 +83,9 @@ def page_layout(content, current_path="/"):
     return Div(
         nav_bar(current_path),
         content,
-        # Chart.js for visualizations
-        Script(src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"),
-        # Custom chart utilities
-        Script(src="/static/js/charts.js"),
-        Script(src="/static/js/agent-sparklines.js"),
-        Script(src="/static/js/tabs.js"),
+        # Chart.js for visualizations (vendored copy when present, else the CDN)
+        Script(src=asset_url(CHART_JS_VENDOR_PATH, fallback=CHART_JS_CDN_URL)),
+        # Custom chart utilities (content-hashed URLs, cached forever)
+        *[Script(src=asset_url(path)) for path in LAYOUT_ASSETS],
         cls="min-h-screen bg-gray-950"
     )
\ No newline at end of file
@@ -70,6 +70,10 @@ def scenario_selector(current_scenario="Creator-First Platform", source="dashboa
     sustainable = ["Creator-First Platform", "Cooperative Commons"]
     hybrid = ["Platform in Transition", "Mostly Differential"]
     
+    # Dashboard swaps fragments in place (status bar + out-of-band updates);
+    # the governance lab re-renders its page content
+    target = "#status-bar" if source == "dashboard" else "#main-content"
+    
     # Get current scenario description
     current_desc = ALL_SCENARIOS.get(current_scenario, ALL_SCENARIOS["Creator-First Platform"]).description if current_scenario else ""
     
@@ -102,7 +106,7 @@ def scenario_selector(current_scenario="Creator-First Platform", source="dashboa
                         placeholder="Choose a scenario...",
                         cls_custom="button: uk-input-fake justify-between w-full bg-gray-700 text-gray-100 border-gray-600; dropdown: w-full",
                         hx_post="/scenarios/load",
-                        hx_target="#main-content",
+                        hx_target=target,
                         hx_swap="outerHTML",
                         hx_trigger="change",
                         hx_include="[name='source']"
@@ -118,7 +122,8 @@ def scenario_selector(current_scenario="Creator-First Platform", source="dashboa
                 ) if current_scenario else None
             )
         ),
-        cls="bg-gray-800 border-gray-700"
+        cls="bg-gray-800 border-gray-700",
+        id="scenario-selector"
     )
 
 def policy_controls(mode, cfg):
@@ -1,6 +1,6 @@
-from fasthtml.common import Div, H2, H3, P, Span, Canvas, Script
+from fasthtml.common import Div, H2, H3, P, Span, Canvas
 from monsterui.all import Card, CardBody
-import json
+from ui.render_cache import chart_url
 import statistics
 
 def reward_timeline(history, summary):
@@ -22,7 +22,6 @@ def reward_timeline(history, summary):
             cls="bg-gray-800 border-gray-700"
         )
     
-    ticks = history.get("ticks", [])
     avg_rewards = history.get("avg_reward", [])
     regime = summary.get("current_regime", "unknown")
     
@@ -67,7 +66,7 @@ def reward_timeline(history, summary):
             ),
             
             # Reward Timeline Chart
-            _reward_chart(ticks, avg_rewards, mean_reward, regime),
+            _reward_chart(),
             
             # Interpretation
             _interpretation_box(coefficient_of_variation, regime)
@@ -85,25 +84,12 @@ def _stat_box(label, value, emoji, subtitle=None):
         cls="p-3 bg-gray-700 rounded-lg text-center"
     )
 
-def _reward_chart(ticks, rewards, mean_reward, regime):
-    """Render reward timeline chart with mean line."""
-    # Color based on regime
-    color_map = {
-        "differential": "rgb(34, 197, 94)",
-        "intermittent": "rgb(239, 68, 68)",
-        "hybrid": "rgb(59, 130, 246)",
-    }
-    line_color = color_map.get(regime, "rgb(107, 114, 128)")
-    
-    # Mean line data
-    mean_line = [mean_reward] * len(ticks)
-    
+def _reward_chart():
+    """Render reward timeline chart with mean line (series and regime color come from /api/charts)."""
     return Div(
         H3("Reward Distribution Over Time", cls="text-sm font-semibold text-gray-300 mb-2"),
-        Canvas(id="rewardTimelineChart", style="height: 250px;"),
-        Script(f"""
-            initRewardTimelineChart('rewardTimelineChart', {json.dumps(ticks)}, {json.dumps(rewards)}, {json.dumps(mean_line)}, '{line_color}');
-        """),
+        Canvas(id="rewardTimelineChart", style="height: 250px;",
+               data_chart="reward-timeline", data_chart_url=chart_url("reward-timeline")),
         cls="mb-4"
     )
 
@@ -1,12 +1,18 @@
-import json
 from fasthtml.common import Div, H1, H2, H3, P, Button, Span, Progress, Li, A, Ul, Canvas, Script
-from monsterui.all import Slider, Container, TabContainer, Card, CardBody
+from monsterui.all import Container, TabContainer, Card, CardBody
 from ui.components import (
     activity_feed,
     scenario_selector,
-    agent_card
+    agent_browser,
+    agent_grid_stub,
+    autorun_controls,
+    fast_forward_controls
 )
-from simulation.environment import GLOBAL_ENVIRONMENT
+from simulation.actor import current_snapshot
+from simulation.agent_index import AgentQuery, agent_index
+from simulation.environment import current_environment
+from simulation.runner import runner_for
+from ui.render_cache import cached_render, chart_url, tag
 
 
 def DashboardPage():
@@ -17,14 +23,9 @@ def DashboardPage():
     - Status bar (full width - always visible)
     - Tabbed content:
       - Tab 1: Simulation (selector + reward timeline)
-      - Tab 2: Agents (carousel only)
+      - Tab 2: Agents (paginated browser)
       - Tab 3: System Health (pie chart + arousal trend)
     """
-    summary = GLOBAL_ENVIRONMENT.summary()
-    history = GLOBAL_ENVIRONMENT.history
-    agents = GLOBAL_ENVIRONMENT.agents
-    tick_count = GLOBAL_ENVIRONMENT.tick_count
-    
     content = Div(
         # Hero Section
         Div(
@@ -36,17 +37,19 @@ def DashboardPage():
                   cls="text-xs sm:text-sm text-gray-400"),
                 P("3. Compare differential (predictable) vs intermittent (exploitative) reinforcement patterns",
                   cls="text-xs sm:text-sm text-gray-400"),
+                autorun_controls(runner_for(current_environment()).status()),
+                fast_forward_controls(),
                 cls="flex-1 mb-4 sm:mb-0"
             ),
             Div(
                 Button("▶️ Run Tick",
                        hx_post="/api/tick",
-                       hx_target="#main-content",
+                       hx_target="#status-bar",
                        hx_swap="outerHTML",
                        cls="px-3 sm:px-4 py-2 bg-green-600 text-white rounded-lg hover:bg-green-700 font-semibold text-sm sm:text-base w-full sm:w-auto mb-2 sm:mb-0 sm:mr-2"),
                 Button("🔄 Reset",
                        hx_post="/api/reset",
-                       hx_target="#main-content",
+                       hx_target="#status-bar",
                        hx_swap="outerHTML",
                        cls="px-3 sm:px-4 py-2 bg-gray-600 text-white rounded-lg hover:bg-gray-700 font-semibold text-sm sm:text-base w-full sm:w-auto"),
                 cls="flex flex-col sm:flex-row gap-2"
@@ -55,7 +58,7 @@ def DashboardPage():
         ),
         
         # Status Bar (full width)
-        _status_bar(tick_count, summary, agents),
+        status_bar(),
         
         # Tabbed Content Container
         Container(
@@ -69,58 +72,163 @@ def DashboardPage():
             Ul(id="dashboard-tabs", cls="uk-switcher")(
                 # Tab 1: Simulation (Selector + Activity Feed in responsive grid)
                 Li(
-                    Div(
-                        scenario_selector(GLOBAL_ENVIRONMENT.current_scenario or "Creator-First Platform", source="dashboard"),
-                        activity_feed(),
-                        cls="grid grid-cols-1 lg:grid-cols-3 gap-4 sm:gap-6",
-                        style="grid-template-columns: 1fr; lg:grid-template-columns: 1fr 2fr;"
-                    )
+                    cached_render("simulation-tab", _simulation_tab)
                 ),
                 
-                # Tab 2: Agents (Just carousel, full width)
+                # Tab 2: Agents (paginated browser, full width)
                 Li(
-                    Div(
-                        H2("👥 Individual Creators", cls="text-xl sm:text-2xl font-bold mb-4 text-gray-100"),
-                        Slider(
-                            *[agent_card(a) for a in agents] if agents else [P("No agents. Load a scenario to begin.", cls="text-gray-400 text-center py-8")],
-                            items_cls='gap-4',
-                            uk_slider='autoplay: true; autoplay-interval: 3000; finite: true'
-                        ) if agents else P("No agents. Load a scenario to begin.", cls="text-gray-400 text-center py-8")
-                    )
+                    agents_panel()
                 ),
                 
                 # Tab 3: System Health
                 Li(
-                    _health_trend_only(history)
+                    health_panel()
                 )
             ),
             cls="mt-6"
         ),
         
+        # Live updates: append each tick's delta to the existing charts
+        Script("connectSimulationStream('/api/stream');"),
+        
         cls="max-w-7xl mx-auto p-3 sm:p-6",
         id="main-content"
     )
     
     return content
 
-def _status_bar(tick_count, summary, agents):
-    """Status bar showing simulation progress and key metrics."""
-    num_agents = len(agents)
+def _simulation_tab():
+    return Div(
+        scenario_selector(current_snapshot().current_scenario or "Creator-First Platform", source="dashboard"),
+        activity_feed(),
+        cls="grid grid-cols-1 lg:grid-cols-3 gap-4 sm:gap-6",
+        style="grid-template-columns: 1fr; lg:grid-template-columns: 1fr 2fr;"
+    )
+
+# ---------------------------------------------------------
+# Fragments (swapped in place by HTMX)
+# ---------------------------------------------------------
+def DashboardFragments(include_selector=False, shown=None):
+    """In-place dashboard update after a tick, reset or scenario change.
+    
+    The status bar is the primary swap target and is always sent. The other
+    fragments go out-of-band, and only if the data they show differs from
+    what the page shows (`shown`, the status bar's data-shown tags, which
+    charts.js sends as the X-Dashboard-Shown header). The agent grid and
+    health tab are expensive to render, so they are replaced by lazy stubs
+    that fetch their content only once the tab is actually shown (the agent
+    grid keeps its current filters). The hero and (unless it changed) the
+    scenario selector are not re-sent at all. Each fragment is rendered once
+    per simulation state and served from the render cache after that.
+    
+    Args:
+        include_selector: Also swap the scenario selector (after a scenario load)
+        shown: X-Dashboard-Shown header of the request (None = send every fragment)
+    """
+    changed = _changed_fragments(current_snapshot(), shown)
+    fragments = [status_bar()]
+    if "activity-feed" in changed:
+        fragments.append(cached_render("activity-feed-oob", _activity_feed_oob))
+    if "agents-panel" in changed:
+        fragments.append(agent_grid_stub()(hx_swap_oob="true"))
+    if "health-tab" in changed:
+        fragments.append(health_panel(lazy=True)(hx_swap_oob="true"))
+    if include_selector:
+        current = current_snapshot().current_scenario or "Creator-First Platform"
+        fragments.append(scenario_selector(current, source="dashboard")(hx_swap_oob="true"))
+    return tuple(fragments)
+
+def _fragment_tags(snapshot):
+    """Tag of the data each out-of-band fragment shows, in a fixed order.
+
+    The activity feed and health tab follow the run's ticks; the agent grid
+    also changes when a scenario overrides agent traits.
+    """
+    ticks = tag(snapshot.run_id, snapshot.tick_count)
+    return {
+        "activity-feed": ticks,
+        "agents-panel": tag(snapshot.run_id, snapshot.tick_count, snapshot.current_scenario),
+        "health-tab": ticks,
+    }
+
+def _changed_fragments(snapshot, shown):
+    """Names of the fragments whose data differs from the page's `shown` tags."""
+    tags = _fragment_tags(snapshot)
+    shown_tags = (shown or "").split(".")
+    if len(shown_tags) != len(tags):
+        return set(tags)
+    return {name for name, shown_tag in zip(tags, shown_tags) if tags[name] != shown_tag}
+
+def _activity_feed_oob():
+    return activity_feed()(hx_swap_oob="true")
+
+def status_bar():
+    """Status bar fragment (id="status-bar")."""
+    return cached_render("status-bar", _render_status_bar)
+
+def _render_status_bar():
+    snapshot = current_snapshot()
+    return _status_bar(
+        snapshot.tick_count,
+        snapshot.summary(),
+        agent_index(snapshot),
+        snapshot.policy_engine.config.mode,
+        ".".join(_fragment_tags(snapshot).values()),
+    )
+
+def agents_panel(query=None, lazy=False):
+    """Agent browser fragment (id="agents-panel").
+    
+    Args:
+        query: AgentQuery with the sort order and filters (default: by id, unfiltered)
+        lazy: Render a stub that loads the browser when it scrolls into view
+    """
+    if lazy:
+        return _lazy_stub("agents-panel", "/fragments/agents", "Loading creators...")
+    return cached_render("agents-panel", agent_browser, query or AgentQuery())
+
+def health_panel(lazy=False):
+    """System health tab fragment (id="health-tab").
+    
+    Args:
+        lazy: Render a stub that loads the charts when it scrolls into view
+    """
+    if lazy:
+        return _lazy_stub("health-tab", "/fragments/health", "Loading system health...")
+    return cached_render("health-panel", _health_panel)
+
+def _health_panel():
+    return Div(_health_trend_only(current_snapshot().history), id="health-tab")
+
+def _lazy_stub(element_id, url, message):
+    """Placeholder that swaps itself for `url` the first time it becomes visible."""
+    return Div(
+        P(message, cls="text-gray-400 text-center py-8"),
+        id=element_id,
+        hx_get=url,
+        hx_trigger="intersect once",
+        hx_swap="outerHTML"
+    )
+
+def _status_bar(tick_count, summary, index, mode, shown):
+    """Status bar showing simulation progress and key metrics.
+
+    Args:
+        tick_count: Current tick
+        summary: Environment summary of the same state
+        index: AgentIndex of the same state (agent count and earnings total)
+        mode: Reward policy mode
+        shown: Fragment tags of the state shown (see `_fragment_tags`)
+    """
+    num_agents = len(index.rows)
     avg_burnout = summary.get("avg_burnout", 0)
     avg_addiction = summary.get("avg_addiction", 0)
     avg_resilience = summary.get("avg_resilience", 0)
     burnout_rate = summary.get("burnout_rate", 0)
     
-    # Calculate total platform earnings
-    total_earnings = sum(
-        sum(h.get('cpm_earnings', 0) for h in agent.history)
-        for agent in agents
-    )
-    
-    mode = GLOBAL_ENVIRONMENT.policy_engine.config.mode
+    total_earnings = index.total_earnings
     
-    # Get system health score (0-1 scale, calculated in environment.py)
-    summary = GLOBAL_ENVIRONMENT.summary()
+    # System health score (0-1 scale, calculated in environment.py)
     system_health = summary.get("system_health_score", 0.5)
     
     # Determine status based on system health score (considers burnout, addiction, resilience)
@@ -143,143 +251,72 @@ def _status_bar(tick_count, summary, agents):
             # Top: Status indicator and day
             Div(
                 Span(status_text, cls=f"px-2 sm:px-3 py-1 rounded-full text-xs sm:text-sm font-semibold text-white {status_color}"),
-                Span(f"Day {tick_count}", cls="text-xs sm:text-sm font-semibold text-gray-300 ml-2 sm:ml-4"),
+                Span(f"Day {tick_count}", data_metric="tick", cls="text-xs sm:text-sm font-semibold text-gray-300 ml-2 sm:ml-4"),
                 cls="flex items-center mb-3 sm:mb-0"
             ),
             
             # Bottom: All metrics (wrap on mobile)
             Div(
-                Span(f"👥 {num_agents}", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
-                Span(f"💰 ${total_earnings:.2f}", cls="text-xs sm:text-sm font-semibold text-green-400 mr-2 sm:mr-4"),
-                Span(f"🔥 {avg_burnout:.2f}", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
-                Span(f"🎮 {avg_addiction:.2f}", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
-                Span(f"🛡️ {avg_resilience:.2f}", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
-                Span(f"📈 {burnout_rate:.2f}", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4 hidden sm:inline"),
+                Span(f"👥 {num_agents}", data_metric="num_agents", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
+                Span(f"💰 ${total_earnings:.2f}", data_metric="total_earnings", cls="text-xs sm:text-sm font-semibold text-green-400 mr-2 sm:mr-4"),
+                Span(f"🔥 {avg_burnout:.2f}", data_metric="avg_burnout", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
+                Span(f"🎮 {avg_addiction:.2f}", data_metric="avg_addiction", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
+                Span(f"🛡️ {avg_resilience:.2f}", data_metric="avg_resilience", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4"),
+                Span(f"📈 {burnout_rate:.2f}", data_metric="burnout_rate", cls="text-xs sm:text-sm text-gray-400 mr-2 sm:mr-4 hidden sm:inline"),
                 Span(f"{mode.capitalize()}", cls="text-xs sm:text-sm text-gray-400 hidden sm:inline"),
                 cls="flex items-center flex-wrap gap-y-2"
             ),
             
             cls="flex flex-col sm:flex-row sm:justify-between sm:items-center"
         ),
-        cls="bg-gray-800 border border-gray-700 rounded-lg p-3 sm:p-4 mb-4 sm:mb-6"
+        cls="bg-gray-800 border border-gray-700 rounded-lg p-3 sm:p-4 mb-4 sm:mb-6",
+        id="status-bar",
+        data_shown=shown
+    )
+
+def _chart_canvas(name, height, canvas_id=None):
+    """Canvas whose data `charts.js` fetches from `/api/charts/<name>`."""
+    return Canvas(
+        id=canvas_id or name,
+        data_chart=name,
+        data_chart_url=chart_url(name),
+        style=f"height: {height}px; max-height: {height}px;"
     )
 
 def _health_trend_only(history):
     """Display system health gauge, agent trait distributions, and wellbeing trends."""
-    agents = GLOBAL_ENVIRONMENT.agents
-    
-    # Get current and previous health scores
-    health_scores = history.get("health_score", [])
-    current_health = health_scores[-1] if health_scores else 0.5
-    previous_health = health_scores[-2] if len(health_scores) > 1 else None
-    
-    # Collect agent trait distributions (initialization values)
-    trait_data = {
-        "Burnout": [agent.profile.burnout for agent in agents],
-        "Addiction": [agent.profile.addiction_drive for agent in agents],
-        "Resilience": [agent.profile.emotional_resilience for agent in agents],
-        "Arousal": [agent.profile.arousal_level for agent in agents]
-    }
+    health_card = Card(
+        CardBody(
+            H2("💚 System Health Score", cls="text-xl sm:text-2xl font-bold text-gray-100 mb-4"),
+            P("Overall creator wellbeing metric (0-100)", cls="text-xs sm:text-sm text-gray-400 mb-4"),
+            _chart_canvas("health-gauge", 200, canvas_id="systemHealthGauge")
+        ),
+        cls="bg-gray-800 border-gray-700 mb-6"
+    )
     
     if not history.get("ticks"):
         return Div(
-            # System Health Gauge
-            Card(
-                CardBody(
-                    H2("💚 System Health Score", cls="text-xl sm:text-2xl font-bold text-gray-100 mb-4"),
-                    P("Overall creator wellbeing metric (0-100)", cls="text-xs sm:text-sm text-gray-400 mb-4"),
-                    Canvas(id="systemHealthGauge", style="height: 200px; max-height: 200px;"),
-                    Script(f"""
-                        initSystemHealthGauge('systemHealthGauge', {current_health}, {previous_health if previous_health else 'null'});
-                    """)
-                ),
-                cls="bg-gray-800 border-gray-700 mb-6"
-            ),
+            health_card,
             # Agent Trait Distributions
             Card(
                 CardBody(
                     H2("📊 Agent Trait Distributions", cls="text-xl sm:text-2xl font-bold text-gray-100 mb-4"),
                     P("Distribution of randomized initialization values across agents", cls="text-xs sm:text-sm text-gray-400 mb-4"),
-                    Canvas(id="agentTraitBoxPlots", style="height: 300px; max-height: 300px;"),
-                    Script(f"""
-                        initAgentTraitBoxPlots('agentTraitBoxPlots', {json.dumps(trait_data)});
-                    """)
+                    _chart_canvas("trait-distributions", 300, canvas_id="agentTraitBoxPlots")
                 ),
                 cls="bg-gray-800 border-gray-700"
             )
         )
     
-    # Calculate reward characteristics
-    all_rewards = []
-    for agent in agents:
-        if agent.history:
-            all_rewards.extend([h.get("final_reward", 0) for h in agent.history])
-    
-    avg_reward = sum(all_rewards) / len(all_rewards) if all_rewards else 0
-    variance = sum((r - avg_reward) ** 2 for r in all_rewards) / len(all_rewards) if all_rewards else 0
-    predictability = 1 - min(variance, 1)  # Simple predictability metric
-    
-    # Calculate state transitions
-    state_transitions = {}
-    for agent in agents:
-        if len(agent.history) > 1:
-            for i in range(len(agent.history) - 1):
-                from_state = agent.history[i].get("state", "UNKNOWN")
-                to_state = agent.history[i + 1].get("state", "UNKNOWN")
-                if from_state != to_state:
-                    key = f"{from_state}->{to_state}"
-                    state_transitions[key] = state_transitions.get(key, 0) + 1
-    
-    # Calculate correlations between metrics
-    burnout_vals = history.get("avg_burnout", [])
-    addiction_vals = history.get("avg_addiction", [])
-    resilience_vals = history.get("avg_resilience", [])
-    arousal_vals = history.get("avg_arousal", [])
-    
-    def calculate_correlation(x, y):
-        if len(x) < 2 or len(y) < 2:
-            return 0
-        n = min(len(x), len(y))
-        x, y = x[:n], y[:n]
-        mean_x = sum(x) / n
-        mean_y = sum(y) / n
-        numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(n))
-        denom_x = sum((x[i] - mean_x) ** 2 for i in range(n)) ** 0.5
-        denom_y = sum((y[i] - mean_y) ** 2 for i in range(n)) ** 0.5
-        return numerator / (denom_x * denom_y) if denom_x and denom_y else 0
-    
-    correlations = {
-        "Burnout_Addiction": calculate_correlation(burnout_vals, addiction_vals),
-        "Burnout_Resilience": calculate_correlation(burnout_vals, resilience_vals),
-        "Burnout_Arousal": calculate_correlation(burnout_vals, arousal_vals),
-        "Addiction_Resilience": calculate_correlation(addiction_vals, resilience_vals),
-        "Addiction_Arousal": calculate_correlation(addiction_vals, arousal_vals),
-        "Resilience_Arousal": calculate_correlation(resilience_vals, arousal_vals)
-    }
-    
     return Div(
-        # System Health Gauge
-        Card(
-            CardBody(
-                H2("💚 System Health Score", cls="text-xl sm:text-2xl font-bold text-gray-100 mb-4"),
-                P("Overall creator wellbeing metric (0-100)", cls="text-xs sm:text-sm text-gray-400 mb-4"),
-                Canvas(id="systemHealthGauge", style="height: 200px; max-height: 200px;"),
-                Script(f"""
-                    initSystemHealthGauge('systemHealthGauge', {current_health}, {previous_health if previous_health else 'null'});
-                """)
-            ),
-            cls="bg-gray-800 border-gray-700 mb-6"
-        ),
+        health_card,
         
         # Agent Trait Distributions (Box Plots)
         Card(
             CardBody(
                 H2("📊 Agent Trait Distributions", cls="text-xl sm:text-2xl font-bold text-gray-100 mb-4"),
                 P("Distribution of current trait values across agents (mean ± std)", cls="text-xs sm:text-sm text-gray-400 mb-4"),
-                Canvas(id="agentTraitBoxPlots", style="height: 300px; max-height: 300px;"),
-                Script(f"""
-                    initAgentTraitBoxPlots('agentTraitBoxPlots', {json.dumps(trait_data)});
-                """)
+                _chart_canvas("trait-distributions", 300, canvas_id="agentTraitBoxPlots")
             ),
             cls="bg-gray-800 border-gray-700 mb-6"
         ),
@@ -291,10 +328,7 @@ def _health_trend_only(history):
                 CardBody(
                     H3("🎁 Reward Distribution", cls="text-lg font-bold text-gray-100 mb-2"),
                     P("Histogram of reward values", cls="text-xs text-gray-400 mb-3"),
-                    Canvas(id="rewardCharacteristics", style="height: 250px; max-height: 250px;"),
-                    Script(f"""
-                        initRewardCharacteristics('rewardCharacteristics', {json.dumps(all_rewards)}, {avg_reward}, {variance}, {predictability});
-                    """)
+                    _chart_canvas("reward-characteristics", 250, canvas_id="rewardCharacteristics")
                 ),
                 cls="bg-gray-800 border-gray-700"
             ),
@@ -304,10 +338,7 @@ def _health_trend_only(history):
                 CardBody(
                     H3("🔄 State Transitions", cls="text-lg font-bold text-gray-100 mb-2"),
                     P("Most common state changes", cls="text-xs text-gray-400 mb-3"),
-                    Canvas(id="stateTransitions", style="height: 250px; max-height: 250px;"),
-                    Script(f"""
-                        initStateTransitionFlow('stateTransitions', {json.dumps(state_transitions)});
-                    """)
+                    _chart_canvas("state-transitions", 250, canvas_id="stateTransitions")
                 ),
                 cls="bg-gray-800 border-gray-700"
             ),
@@ -317,14 +348,11 @@ def _health_trend_only(history):
                 CardBody(
                     H3("🔗 Metric Correlations", cls="text-lg font-bold text-gray-100 mb-2"),
                     P("Relationships between traits", cls="text-xs text-gray-400 mb-3"),
-                    Canvas(id="correlationHeatmap", style="height: 250px; max-height: 250px;"),
-                    Script(f"""
-                        initCorrelationHeatmap('correlationHeatmap', {json.dumps(correlations)});
-                    """)
+                    _chart_canvas("correlations", 250, canvas_id="correlationHeatmap")
                 ),
                 cls="bg-gray-800 border-gray-700"
             ),
             
             cls="grid grid-cols-1 lg:grid-cols-3 gap-6"
         )
-    )
\ No newline at end of file
+    )
@@ -1,6 +1,7 @@
 from fasthtml.common import Div, H1, P
 from ui.components import policy_controls, scenario_selector, transparency_panel, preset_selector
-from simulation.environment import GLOBAL_ENVIRONMENT
+from simulation.actor import current_snapshot
+from ui.render_cache import cached_render
 
 
 def GovernanceLabPage():
@@ -8,12 +9,17 @@ def GovernanceLabPage():
     
     Combines scenario selection and fine-grained policy controls.
     UX: Like 'counting calories' - see how each policy parameter affects system dynamics.
+    Rendered once per simulation state (tick, scenario, policy version).
     """
-    cfg = GLOBAL_ENVIRONMENT.policy_engine.config
-    events = GLOBAL_ENVIRONMENT.last_tick_explanations
+    return cached_render("governance-lab", _governance_lab)
+
+def _governance_lab():
+    env = current_snapshot()
+    cfg = env.policy_engine.config
+    events = env.last_tick_explanations
     
     # Get current scenario name from environment (or default)
-    current_scenario = GLOBAL_ENVIRONMENT.current_scenario or "Creator-First Platform"
+    current_scenario = env.current_scenario or "Creator-First Platform"
     
     content = Div(
         # Header
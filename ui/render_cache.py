@@ -0,0 +1,75 @@
+"""
+Render cache for pages and fragments.
+
+Rendered HTML is a pure function of the simulation state, so each page or
+fragment is rendered once per environment snapshot and re-served from the
+snapshot's memo until the state changes. The version identifying a render is
+(session run, tick, scenario, policy config version): every tick, reset,
+policy or scenario change is an actor command that publishes a new snapshot,
+which drops all renders of the old one at once.
+"""
+
+import hashlib
+import threading
+from collections import Counter
+
+from fasthtml.common import NotStr, to_xml
+
+from simulation.actor import current_snapshot
+
+RENDER_STATS = Counter()  # hits / misses across all sessions
+_stats_lock = threading.Lock()
+
+
+def render_version(snapshot):
+    """Cache version of a snapshot: (run, tick, scenario, policy config version)."""
+    return (
+        snapshot.run_id,
+        snapshot.tick_count,
+        snapshot.current_scenario,
+        snapshot.policy_engine.config_version,
+    )
+
+
+def tag(*parts) -> str:
+    """Short stable digest of `parts` (reprs of plain values)."""
+    raw = repr(parts).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:12]
+
+
+def version_tag(snapshot) -> str:
+    """Short stable digest of `render_version`, for URLs and ETags."""
+    return tag(*render_version(snapshot))
+
+
+def chart_url(name, snapshot=None) -> str:
+    """Versioned `/api/charts/<name>` URL for the current state (see routes.api_charts)."""
+    snapshot = snapshot or current_snapshot()
+    return f"/api/charts/{name}?v={version_tag(snapshot)}"
+
+
+def cached_render(name, render, *args):
+    """Return `render(*args)` as HTML, rendering at most once per snapshot.
+
+    Args:
+        name: Fragment name; with `args` it identifies the render
+        render: Callable returning FT components
+        args: Hashable arguments passed to `render` (part of the key)
+    """
+    snapshot = current_snapshot()
+    key = (render_version(snapshot), name, args)
+    html = snapshot.renders.get(key)
+    with _stats_lock:
+        RENDER_STATS["hits" if html is not None else "misses"] += 1
+    if html is None:
+        # Concurrent misses may both render; the results are identical
+        html = snapshot.renders[key] = to_xml(render(*args))
+    return NotStr(html)
+
+
+def render_stats() -> dict:
+    """Hit/miss counters and hit rate."""
+    with _stats_lock:
+        hits, misses = RENDER_STATS["hits"], RENDER_STATS["misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else 0.0}